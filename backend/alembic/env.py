@@ -1,11 +1,13 @@
 from logging.config import fileConfig
+import asyncio
 import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
-from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 
@@ -20,19 +22,18 @@ load_dotenv(dotenv_path)
 # access to the values within the .ini file in use.
 config = context.config
 
+from app.database import async_database_url
+
 # Récupérer l'URL de la base de données depuis .env
-database_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./cashstuffing.db")
-# Pour Alembic, on doit utiliser le driver synchrone (pysqlite) et un chemin absolu
-if "sqlite+aiosqlite://" in database_url:
-    # Extraire le chemin relatif
-    rel_path = database_url.replace("sqlite+aiosqlite:///", "")
-    # Créer le chemin absolu
-    if rel_path.startswith("./"):
-        db_path = Path(__file__).parent.parent / rel_path.lstrip("./")
-    else:
-        db_path = Path(rel_path)
-    database_url = f"sqlite:///{db_path}"
-config.set_main_option("sqlalchemy.url", database_url)
+# Les migrations utilisent le même driver asynchrone que l'application
+# (aiosqlite ou asyncpg)
+database_url = async_database_url(os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./cashstuffing.db"))
+# Pour SQLite, un chemin relatif est résolu depuis le dossier backend
+if database_url.startswith("sqlite+aiosqlite:///./"):
+    rel_path = database_url.replace("sqlite+aiosqlite:///./", "")
+    database_url = f"sqlite+aiosqlite:///{Path(__file__).parent.parent / rel_path}"
+# ConfigParser interprète les % (mots de passe encodés dans l'URL)
+config.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -43,7 +44,11 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # Import de la Base et de tous les modèles
 from app.database import Base
-from app.models import User, Category, BankAccount, Envelope, Transaction, WishList, WishListItem
+from app.models import (
+    User, Category, CategoryClosure, BankAccount, Envelope, EnvelopeRolloverRun, Transaction,
+    RecurringSchedule, BalanceMovement, BalanceSnapshot, TransactionMonthlyRollup, ResourceVersion, WishList,
+    WishListItem
+)
 
 target_metadata = Base.metadata
 
@@ -77,26 +82,37 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
-def run_migrations_online() -> None:
-    """Run migrations in 'online' mode.
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(
+        connection=connection, target_metadata=target_metadata
+    )
 
-    In this scenario we need to create an Engine
-    and associate a connection with the context.
+    with context.begin_transaction():
+        context.run_migrations()
 
-    """
-    connectable = engine_from_config(
+
+async def run_async_migrations() -> None:
+    """Create an async Engine and run the migrations on one of its connections."""
+    connectable = async_engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode.
+
+    In this scenario we need to create an Engine
+    and associate a connection with the context.
 
-        with context.begin_transaction():
-            context.run_migrations()
+    """
+    asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
@@ -0,0 +1,27 @@
+"""Add composite index for transaction keyset pagination
+
+Revision ID: 3f1c9a7d2b48
+Revises: 56ce580bbb76
+Create Date: 2026-10-18 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b48'
+down_revision: Union[str, Sequence[str], None] = '56ce580bbb76'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transactions_user_date_id', 'transactions', ['user_id', 'date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_user_date_id', table_name='transactions')
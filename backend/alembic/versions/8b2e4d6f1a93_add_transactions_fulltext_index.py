@@ -0,0 +1,70 @@
+"""Add full-text search index on transaction description/payee
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f1c9a7d2b48
+Create Date: 2026-10-18 10:04:57.118340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d6f1a93'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2b48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description, payee,
+        content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description, payee)
+        VALUES (new.id, new.description, new.payee);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, payee)
+        VALUES ('delete', old.id, old.description, old.payee);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description, payee ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, payee)
+        VALUES ('delete', old.id, old.description, old.payee);
+        INSERT INTO transactions_fts(rowid, description, payee)
+        VALUES (new.id, new.description, new.payee);
+    END
+    """,
+    # Indexer les transactions existantes
+    "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # L'index FTS5 n'existe que sous SQLite (repli sur ILIKE ailleurs)
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in SQLITE_STATEMENTS:
+        op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(sa.text("DROP TRIGGER IF EXISTS transactions_fts_au"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS transactions_fts_ad"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS transactions_fts_ai"))
+    op.execute(sa.text("DROP TABLE IF EXISTS transactions_fts"))
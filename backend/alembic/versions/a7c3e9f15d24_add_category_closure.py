@@ -0,0 +1,54 @@
+"""Add category closure table
+
+Revision ID: a7c3e9f15d24
+Revises: e4a9c1f7b235
+Create Date: 2026-10-18 16:37:12.540198
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f15d24'
+down_revision: Union[str, Sequence[str], None] = 'e4a9c1f7b235'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    closure = op.create_table('category_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index('ix_category_closure_descendant_depth', 'category_closure', ['descendant_id', 'depth'], unique=False)
+    op.create_index(op.f('ix_category_closure_user_id'), 'category_closure', ['user_id'], unique=False)
+
+    # Remplir depuis categories.parent_id (un éventuel cycle est coupé)
+    categories = op.get_bind().execute(sa.text("SELECT id, parent_id, user_id FROM categories")).fetchall()
+    parents = {row.id: row.parent_id for row in categories}
+    rows = []
+    for row in categories:
+        ancestor_id, depth, seen = row.id, 0, set()
+        while ancestor_id is not None and ancestor_id in parents and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            rows.append({'ancestor_id': ancestor_id, 'descendant_id': row.id, 'depth': depth, 'user_id': row.user_id})
+            ancestor_id, depth = parents[ancestor_id], depth + 1
+    if rows:
+        op.bulk_insert(closure, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_category_closure_user_id'), table_name='category_closure')
+    op.drop_index('ix_category_closure_descendant_depth', table_name='category_closure')
+    op.drop_table('category_closure')
@@ -0,0 +1,39 @@
+"""Add envelope rollover policy and runs table
+
+Revision ID: b3d8f2a6c941
+Revises: a7c3e9f15d24
+Create Date: 2026-10-18 18:11:45.903127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d8f2a6c941'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e9f15d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('envelopes', sa.Column('rollover_policy', sa.String(length=20), server_default='carry_over', nullable=False))
+    op.create_table('envelope_rollover_runs',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('year_month', sa.String(length=7), nullable=False),
+    sa.Column('envelope_count', sa.Integer(), nullable=False),
+    sa.Column('total_budget', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'year_month')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('envelope_rollover_runs')
+    with op.batch_alter_table('envelopes') as batch_op:
+        batch_op.drop_column('rollover_policy')
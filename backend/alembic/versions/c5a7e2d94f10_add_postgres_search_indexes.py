@@ -0,0 +1,43 @@
+"""Add trigram indexes for transaction search on PostgreSQL
+
+Revision ID: c5a7e2d94f10
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-18 11:26:40.508113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a7e2d94f10'
+down_revision: Union[str, Sequence[str], None] = '8b2e4d6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sous PostgreSQL, la recherche utilise ILIKE '%...%' : des index trigrammes
+    # évitent le parcours complet de la table (SQLite utilise l'index FTS5)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    op.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS ix_transactions_description_trgm "
+        "ON transactions USING gin (description gin_trgm_ops)"
+    ))
+    op.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS ix_transactions_payee_trgm "
+        "ON transactions USING gin (payee gin_trgm_ops)"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(sa.text("DROP INDEX IF EXISTS ix_transactions_payee_trgm"))
+    op.execute(sa.text("DROP INDEX IF EXISTS ix_transactions_description_trgm"))
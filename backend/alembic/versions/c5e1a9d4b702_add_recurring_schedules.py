@@ -0,0 +1,83 @@
+"""Add recurring schedules
+
+Revision ID: c5e1a9d4b702
+Revises: b3d8f2a6c941
+Create Date: 2026-10-18 19:02:37.284615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e1a9d4b702'
+down_revision: Union[str, Sequence[str], None] = 'b3d8f2a6c941'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('recurring_schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('bank_account_id', sa.Integer(), nullable=False),
+    sa.Column('envelope_id', sa.Integer(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('transaction_type', sa.String(length=20), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('payee', sa.String(length=100), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=True),
+    sa.Column('rrule', sa.String(length=255), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('next_occurrence', sa.Date(), nullable=True),
+    sa.Column('last_occurrence', sa.Date(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['bank_account_id'], ['bank_accounts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['envelope_id'], ['envelopes.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recurring_schedules_id'), 'recurring_schedules', ['id'], unique=False)
+    op.create_index(op.f('ix_recurring_schedules_user_id'), 'recurring_schedules', ['user_id'], unique=False)
+    op.create_index(op.f('ix_recurring_schedules_bank_account_id'), 'recurring_schedules', ['bank_account_id'], unique=False)
+    op.create_index('ix_recurring_schedules_due', 'recurring_schedules', ['is_active', 'next_occurrence'], unique=False)
+
+    # Pas de batch_alter_table sur transactions : la recopie de la table
+    # supprimerait les triggers de la recherche plein texte (SQLite)
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute(
+            'ALTER TABLE transactions ADD COLUMN recurring_schedule_id INTEGER '
+            'REFERENCES recurring_schedules (id) ON DELETE SET NULL'
+        )
+    else:
+        op.add_column('transactions', sa.Column('recurring_schedule_id', sa.Integer(), nullable=True))
+        op.create_foreign_key(
+            'fk_transactions_recurring_schedule_id', 'transactions', 'recurring_schedules',
+            ['recurring_schedule_id'], ['id'], ondelete='SET NULL'
+        )
+    op.create_index('ix_transactions_schedule_date', 'transactions', ['recurring_schedule_id', 'date'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_schedule_date', table_name='transactions')
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        # SQLite >= 3.35 ; la contrainte de clé étrangère est portée par la colonne
+        op.execute('ALTER TABLE transactions DROP COLUMN recurring_schedule_id')
+    else:
+        op.drop_constraint('fk_transactions_recurring_schedule_id', 'transactions', type_='foreignkey')
+        op.drop_column('transactions', 'recurring_schedule_id')
+    op.drop_index('ix_recurring_schedules_due', table_name='recurring_schedules')
+    op.drop_index(op.f('ix_recurring_schedules_bank_account_id'), table_name='recurring_schedules')
+    op.drop_index(op.f('ix_recurring_schedules_user_id'), table_name='recurring_schedules')
+    op.drop_index(op.f('ix_recurring_schedules_id'), table_name='recurring_schedules')
+    op.drop_table('recurring_schedules')
@@ -0,0 +1,49 @@
+"""Add balance movements ledger
+
+Revision ID: d2f7b4c8e613
+Revises: c5e1a9d4b702
+Create Date: 2026-10-18 20:14:09.571830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f7b4c8e613'
+down_revision: Union[str, Sequence[str], None] = 'c5e1a9d4b702'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('balance_movements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('balance', sa.Numeric(precision=14, scale=2), nullable=True),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_balance_movements_entity', 'balance_movements', ['user_id', 'entity_type', 'entity_id', 'created_at', 'id'], unique=False)
+
+    # Point de départ du journal : un point de contrôle par compte et enveloppe existants
+    for entity_type, table in (('bank_account', 'bank_accounts'), ('envelope', 'envelopes')):
+        op.execute(
+            "INSERT INTO balance_movements (user_id, entity_type, entity_id, kind, amount, balance) "
+            f"SELECT user_id, '{entity_type}', id, 'checkpoint', 0, current_balance FROM {table}"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_balance_movements_entity', table_name='balance_movements')
+    op.drop_table('balance_movements')
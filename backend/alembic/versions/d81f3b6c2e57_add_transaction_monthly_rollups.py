@@ -0,0 +1,55 @@
+"""Add transaction monthly rollups table
+
+Revision ID: d81f3b6c2e57
+Revises: c5a7e2d94f10
+Create Date: 2026-10-18 12:14:09.377652
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f3b6c2e57'
+down_revision: Union[str, Sequence[str], None] = 'c5a7e2d94f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transaction_monthly_rollups',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('year_month', sa.String(length=7), nullable=False),
+    sa.Column('bank_account_id', sa.Integer(), nullable=False),
+    sa.Column('envelope_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('transaction_type', sa.String(length=20), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'year_month', 'bank_account_id', 'envelope_id', 'category_id', 'transaction_type')
+    )
+
+    # Agréger les transactions existantes
+    if op.get_bind().dialect.name == 'postgresql':
+        month = "to_char(date, 'YYYY-MM')"
+    else:
+        month = "strftime('%Y-%m', date)"
+    op.execute(sa.text(f"""
+        INSERT INTO transaction_monthly_rollups (
+            user_id, year_month, bank_account_id, envelope_id, category_id,
+            transaction_type, total_amount, transaction_count
+        )
+        SELECT user_id, {month}, bank_account_id, COALESCE(envelope_id, 0), category_id,
+               transaction_type, SUM(amount), COUNT(id)
+        FROM transactions
+        GROUP BY user_id, {month}, bank_account_id, COALESCE(envelope_id, 0), category_id, transaction_type
+    """))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('transaction_monthly_rollups')
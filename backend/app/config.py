@@ -12,6 +12,44 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./cashstuffing.db"
+    DB_ECHO: bool = False  # Log de chaque requête SQL (indépendant de DEBUG)
+    
+    # Pool de connexions (bases serveur uniquement)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # secondes
+    DB_POOL_TIMEOUT: int = 30  # secondes
+    DB_POOL_PRE_PING: bool = True
+    
+    # Réplicas en lecture (JSON, ex: ["postgresql://.../replica1"])
+    DATABASE_REPLICA_URLS: list = []
+    REPLICA_STICKY_SECONDS: float = 5.0  # lecture sur le primaire après une écriture
+    REPLICA_HEALTH_CHECK_SECONDS: float = 30.0
+    
+    # PRAGMAs SQLite appliqués à chaque connexion
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 Mo
+    SQLITE_CACHE_SIZE: int = -65536  # valeur négative = Kio (64 Mo)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    
+    # Import en masse des transactions
+    BULK_INSERT_CHUNK_SIZE: int = 1000
+    
+    # Export des transactions (lignes lues par aller-retour du curseur)
+    EXPORT_BATCH_SIZE: int = 5000
+    
+    # Tâches planifiées (APScheduler, dans le processus de l'application)
+    SCHEDULER_ENABLED: bool = False  # un seul processus doit l'activer
+    SCHEDULER_CATCH_UP: bool = False  # lance aussi chaque tâche au démarrage
+    ENVELOPE_ROLLOVER_CRON: str = "5 0 1 * *"  # crontab : le 1er du mois à 00:05
+    ROLLOVER_BATCH_SIZE: int = 1000  # utilisateurs par transaction
+    RECURRING_TRANSACTIONS_CRON: str = "15 0 * * *"  # crontab : chaque jour à 00:15
+    RECURRING_BATCH_SIZE: int = 1000  # échéanciers par transaction
+    BALANCE_CHECKPOINT_CRON: str = "30 0 * * 1"  # crontab : chaque lundi à 00:30
+    CHECKPOINT_BATCH_SIZE: int = 1000  # utilisateurs par transaction
+    BALANCE_SNAPSHOT_CRON: str = "45 0 * * *"  # crontab : chaque jour à 00:45
+    SNAPSHOT_BATCH_SIZE: int = 1000  # utilisateurs par transaction
     
     # Security
     SECRET_KEY: str
@@ -19,6 +57,21 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Hash des mots de passe (bcrypt)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    
+    # Cache des utilisateurs authentifiés (0 pour désactiver)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 1024
+    
+    # Cache des réponses GET par utilisateur (memory ou redis ; 0 pour désactiver)
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_MAX_SIZE: int = 2048  # entrées (backend memory)
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    
     # CORS
     CORS_ORIGINS: list = ["http://localhost:8000", "http://localhost:3000"]
     
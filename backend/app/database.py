@@ -1,14 +1,120 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from app.config import get_settings
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, declarative_base
+from app.config import Settings, get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+# Drivers asynchrones utilisés quand l'URL n'en précise pas
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Ajoute le driver asynchrone à une URL qui n'en précise pas
+
+    sqlite:///./cash.db -> sqlite+aiosqlite:///./cash.db
+    postgresql://u:p@host/db -> postgresql+asyncpg://u:p@host/db
+    """
+    scheme, separator, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+
+def is_memory_database(url: str) -> bool:
+    """Indique si l'URL désigne une base SQLite en mémoire"""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str, config: Settings) -> Dict[str, Any]:
+    """
+    Options de create_async_engine selon le type de base
+
+    Les paramètres de pool ne s'appliquent qu'aux bases serveur (PostgreSQL...),
+    SQLite gardant le pool choisi par son dialecte.
+    """
+    options: Dict[str, Any] = {"echo": config.DB_ECHO, "future": True}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_recycle=config.DB_POOL_RECYCLE,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_pre_ping=config.DB_POOL_PRE_PING,
+        )
+    return options
+
+
+def sqlite_pragmas(url: str, config: Settings) -> Dict[str, Any]:
+    """PRAGMAs appliqués à chaque nouvelle connexion SQLite"""
+    pragmas: Dict[str, Any] = {
+        "journal_mode": config.SQLITE_JOURNAL_MODE,
+        "synchronous": config.SQLITE_SYNCHRONOUS,
+        "mmap_size": config.SQLITE_MMAP_SIZE,
+        "cache_size": config.SQLITE_CACHE_SIZE,
+        "busy_timeout": config.SQLITE_BUSY_TIMEOUT_MS,
+    }
+    # Le WAL n'a pas de sens pour une base en mémoire
+    if is_memory_database(url):
+        del pragmas["journal_mode"]
+    return pragmas
+
+
+def configure_engine(async_engine: AsyncEngine, config: Settings) -> AsyncEngine:
+    """Enregistre l'application des PRAGMAs à la connexion (SQLite uniquement)"""
+    if async_engine.dialect.name != "sqlite":
+        return async_engine
+
+    pragmas = sqlite_pragmas(str(async_engine.url), config)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return async_engine
+
+
+async def describe_engine(async_engine: AsyncEngine) -> str:
+    """Résume la configuration effective de l'engine (ligne de log au démarrage)"""
+    url = async_engine.url.render_as_string(hide_password=True)
+    if async_engine.dialect.name != "sqlite":
+        pool = async_engine.pool
+        return (
+            f"{url} pool={type(pool).__name__} size={pool.size()} "
+            f"overflow={settings.DB_MAX_OVERFLOW} recycle={settings.DB_POOL_RECYCLE}s "
+            f"echo={async_engine.echo}"
+        )
+
+    effective = []
+    async with async_engine.connect() as conn:
+        for name in ("journal_mode", "synchronous", "mmap_size", "cache_size", "busy_timeout"):
+            value = (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+            effective.append(f"{name}={value}")
+    return f"{url} {' '.join(effective)} echo={async_engine.echo}"
+
 
 # Création de l'engine asynchrone
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True
+database_url = async_database_url(settings.DATABASE_URL)
+engine = configure_engine(
+    create_async_engine(database_url, **engine_options(database_url, settings)),
+    settings
 )
 
 # Session factory
@@ -21,6 +127,133 @@ AsyncSessionLocal = async_sessionmaker(
 # Base pour les modèles
 Base = declarative_base()
 
+
+# === Réplicas en lecture ===
+
+class Replica:
+    """Réplica en lecture et son état de santé"""
+
+    def __init__(self, url: str, config: Settings):
+        self.url = async_database_url(url)
+        self.engine = configure_engine(
+            create_async_engine(self.url, **engine_options(self.url, config)),
+            config
+        )
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+        self.healthy = True
+        self._next_check = 0.0
+
+    async def is_healthy(self, check_interval: float, timeout: float = 2.0) -> bool:
+        """Vérifie la connexion (SELECT 1) au plus une fois par intervalle."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return self.healthy
+        self._next_check = now + check_interval
+        try:
+            async with self.engine.connect() as conn:
+                await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout)
+            if not self.healthy:
+                logger.info("Replica %s is back online", self.engine.url.render_as_string())
+            self.healthy = True
+        except Exception as e:
+            logger.warning("Replica %s is unavailable: %s", self.engine.url.render_as_string(), e)
+            self.healthy = False
+        return self.healthy
+
+
+class ReplicaRouter:
+    """
+    Choix de la base utilisée pour les lectures
+
+    Les lectures sont réparties à tour de rôle entre les réplicas en bonne
+    santé. Après une écriture d'un utilisateur, ses lectures restent sur le
+    primaire pendant sticky_seconds (lecture de ses propres écritures malgré
+    le retard de réplication). Sans réplica disponible, le primaire est utilisé.
+    L'état est local au processus.
+    """
+
+    def __init__(self, sticky_seconds: float = 5.0, health_check_seconds: float = 30.0):
+        self.sticky_seconds = sticky_seconds
+        self.health_check_seconds = health_check_seconds
+        self.replicas: List[Replica] = []
+        self._next = 0
+        self._last_writes: Dict[int, float] = {}
+
+    def configure(self, urls: List[str], config: Settings) -> None:
+        """Remplace la liste des réplicas."""
+        self.replicas = [Replica(url, config) for url in urls]
+        self._next = 0
+
+    def record_write(self, user_id: int) -> None:
+        """Ouvre la fenêtre de lecture sur le primaire pour cet utilisateur."""
+        now = time.monotonic()
+        self._last_writes[user_id] = now
+        if len(self._last_writes) > 1024:
+            self._last_writes = {
+                key: written_at for key, written_at in self._last_writes.items()
+                if now - written_at < self.sticky_seconds
+            }
+
+    def is_sticky(self, user_id: Optional[int]) -> bool:
+        """Indique si l'utilisateur a écrit récemment."""
+        written_at = self._last_writes.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < self.sticky_seconds
+
+    async def pick(self, user_id: Optional[int] = None) -> Optional[async_sessionmaker]:
+        """
+        Retourne la fabrique de sessions du prochain réplica disponible
+
+        Returns:
+            None si la lecture doit se faire sur le primaire
+        """
+        if not self.replicas or self.is_sticky(user_id):
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+            if await replica.is_healthy(self.health_check_seconds):
+                return replica.session_factory
+        return None
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter(settings.REPLICA_STICKY_SECONDS, settings.REPLICA_HEALTH_CHECK_SECONDS)
+replica_router.configure(settings.DATABASE_REPLICA_URLS, settings)
+
+
+# Suivi des écritures : une session qui commite des modifications pour un
+# utilisateur (session.info["user_id"], renseigné par get_current_user) ouvre
+# sa fenêtre de lecture sur le primaire.
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush_writes(session: Session, flush_context) -> None:
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_user_write(session: Session) -> None:
+    if session.info.pop("has_writes", False) and session.info.get("user_id") is not None:
+        replica_router.record_write(session.info["user_id"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_writes(session: Session) -> None:
+    session.info.pop("has_writes", None)
+
+
 async def get_db():
     """Dependency pour obtenir une session de base de données"""
     async with AsyncSessionLocal() as session:
@@ -33,6 +266,10 @@ async def get_db():
         finally:
             await session.close()
 
+def get_session_factory() -> async_sessionmaker:
+    """Dependency pour obtenir la fabrique de sessions (traitements hors requête)"""
+    return AsyncSessionLocal
+
 async def init_db():
     """Initialise la base de données"""
     async with engine.begin() as conn:
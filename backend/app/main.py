@@ -6,6 +6,10 @@ from contextlib import asynccontextmanager
 import os
 from pathlib import Path
 
+from app.config import get_settings
+from app.database import engine, describe_engine, replica_router
+from app.scheduler import create_scheduler
+
 # Import des routes
 from app.routes import (
     auth_router, 
@@ -13,9 +17,17 @@ from app.routes import (
     bank_accounts_router, 
     envelopes_router, 
     transactions_router, 
-    wish_lists_router
+    recurring_schedules_router,
+    wish_lists_router,
+    reports_router,
+    dashboard_router
 )
 from app.routes.frontend import router as frontend_router
+from app.utils.auth import shutdown_password_executor
+from app.utils.response_cache import response_cache
+from app.utils.user_cache import user_cache
+
+settings = get_settings()
 
 # Configuration des chemins
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -26,13 +38,27 @@ async def lifespan(app: FastAPI):
     """Gestion du cycle de vie de l'application"""
     # Startup
     print("🚀 Démarrage de l'application Cash Stuffing")
+    print(f"🗄️  Base de données: {await describe_engine(engine)}")
+    for replica in replica_router.replicas:
+        try:
+            print(f"📖 Réplica en lecture: {await describe_engine(replica.engine)}")
+        except Exception as e:
+            print(f"⚠️  Réplica indisponible ({replica.engine.url.render_as_string()}): {e}")
     # Ici: initialisation de la base de données, connexions, etc.
+    scheduler = create_scheduler(settings) if settings.SCHEDULER_ENABLED else None
+    if scheduler is not None:
+        scheduler.start()
+        print(f"⏰ Tâches planifiées: {', '.join(job.id for job in scheduler.get_jobs())}")
     
     yield
     
     # Shutdown
     print("👋 Arrêt de l'application")
-    # Ici: fermeture des connexions, nettoyage, etc.
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
+    shutdown_password_executor()
+    await replica_router.dispose()
+    await engine.dispose()
 
 # Création de l'application FastAPI
 app = FastAPI(
@@ -49,6 +75,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Montage des fichiers statiques
@@ -74,7 +101,10 @@ app.include_router(categories_router, prefix="/api")
 app.include_router(bank_accounts_router, prefix="/api")
 app.include_router(envelopes_router, prefix="/api")
 app.include_router(transactions_router, prefix="/api")
+app.include_router(recurring_schedules_router, prefix="/api")
 app.include_router(wish_lists_router, prefix="/api")
+app.include_router(reports_router, prefix="/api")
+app.include_router(dashboard_router, prefix="/api")
 
 # === Routes du frontend ===
 app.include_router(frontend_router)
@@ -85,6 +115,11 @@ async def health():
     """Endpoint de health check"""
     return {"status": "healthy"}
 
+@app.get("/health/cache")
+async def health_cache():
+    """Compteurs des caches en mémoire (hits, misses, évictions)"""
+    return {"user_cache": user_cache.stats(), "response_cache": response_cache.stats()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -3,18 +3,32 @@ Models package - Import de tous les modèles SQLAlchemy
 """
 from app.models.user import User
 from app.models.category import Category
+from app.models.category_closure import CategoryClosure
 from app.models.bank_account import BankAccount
 from app.models.envelope import Envelope
+from app.models.envelope_rollover_run import EnvelopeRolloverRun
 from app.models.transaction import Transaction
+from app.models.recurring_schedule import RecurringSchedule
+from app.models.balance_movement import BalanceMovement
+from app.models.balance_snapshot import BalanceSnapshot
+from app.models.transaction_monthly_rollup import TransactionMonthlyRollup
+from app.models.resource_version import ResourceVersion
 from app.models.wish_list import WishList
 from app.models.wish_list_item import WishListItem
 
 __all__ = [
     "User",
     "Category",
+    "CategoryClosure",
     "BankAccount",
     "Envelope",
+    "EnvelopeRolloverRun",
     "Transaction",
+    "RecurringSchedule",
+    "BalanceMovement",
+    "BalanceSnapshot",
+    "TransactionMonthlyRollup",
+    "ResourceVersion",
     "WishList",
     "WishListItem",
 ]
@@ -0,0 +1,53 @@
+"""
+Modèle BalanceMovement - Journal des mouvements de solde
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Index, event
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class BalanceMovement(Base):
+    """
+    Mouvement du solde d'un compte bancaire ou d'une enveloppe (journal en ajout seul)
+
+    Chaque écriture de solde (transactions, réallocations, ajustements,
+    réconciliations, report mensuel) ajoute un delta signé. Les points de
+    contrôle (kind = "checkpoint") enregistrent périodiquement le solde
+    courant : le solde à un instant donné se calcule depuis le point de
+    contrôle précédent, sans relire tout l'historique.
+    Écrit par app/services/balance_ledger.py.
+    """
+    __tablename__ = "balance_movements"
+    __table_args__ = (
+        # Historique d'une entité, du plus récent au plus ancien (pagination par clé)
+        Index("ix_balance_movements_entity", "user_id", "entity_type", "entity_id", "created_at", "id"),
+    )
+    
+    # Identifiant
+    id = Column(Integer, primary_key=True)
+    
+    # Propriétaire et entité (sans clé étrangère : l'historique survit à la suppression)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    entity_type = Column(String(20), nullable=False)  # bank_account, envelope
+    entity_id = Column(Integer, nullable=False)
+    
+    # Mouvement
+    kind = Column(String(20), nullable=False)  # transaction, reallocation, adjustment, checkpoint...
+    amount = Column(Numeric(14, 2), nullable=False)  # Delta signé (0 pour un point de contrôle)
+    balance = Column(Numeric(14, 2), nullable=True)  # Solde après le mouvement, quand il est connu
+    description = Column(String(255), nullable=True)
+    
+    # Timestamp
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return (
+            f"<BalanceMovement(id={self.id}, {self.entity_type}={self.entity_id}, "
+            f"kind='{self.kind}', amount={self.amount})>"
+        )
+
+
+@event.listens_for(BalanceMovement, "before_update")
+@event.listens_for(BalanceMovement, "before_delete")
+def _append_only(mapper, connection, target):
+    raise ValueError("balance_movements is append-only")
@@ -0,0 +1,37 @@
+"""
+Modèle BalanceSnapshot - Solde d'un compte ou d'une enveloppe en fin de mois
+"""
+from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey
+from app.database import Base
+
+
+class BalanceSnapshot(Base):
+    """
+    Solde d'une entité à la fin d'une période (dernier jour du mois)
+
+    Le solde inclut les transactions datées jusqu'à snapshot_date et les
+    autres mouvements du journal (réallocations, ajustements, report...)
+    enregistrés jusqu'à cette date. Le solde à une date quelconque se
+    calcule depuis le snapshot le plus proche : au plus une période de
+    transactions est relue.
+
+    Table dérivée : compactée par app/services/balance_snapshots.py. Une
+    transaction écrite à une date déjà couverte supprime les snapshots
+    devenus faux, recalculés au passage suivant.
+    """
+    __tablename__ = "balance_snapshots"
+
+    # Clé
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    entity_type = Column(String(20), primary_key=True)  # bank_account, envelope
+    entity_id = Column(Integer, primary_key=True)
+    snapshot_date = Column(Date, primary_key=True)
+
+    # Solde en fin de journée
+    balance = Column(Numeric(14, 2), nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<BalanceSnapshot({self.entity_type}={self.entity_id}, "
+            f"date={self.snapshot_date}, balance={self.balance})>"
+        )
@@ -0,0 +1,33 @@
+"""
+Modèle CategoryClosure - Table de fermeture de la hiérarchie des catégories
+"""
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from app.database import Base
+
+
+class CategoryClosure(Base):
+    """
+    Lien ancêtre -> descendant entre deux catégories, à toute profondeur
+
+    Chaque catégorie a une ligne vers elle-même (depth = 0), puis une par
+    ancêtre (depth = 1 pour le parent, 2 pour le grand-parent...). Sous-arbre,
+    fil d'Ariane et détection de cycle deviennent des jointures indexées.
+    Maintenu par app/services/category_closure.py.
+    """
+    __tablename__ = "category_closure"
+
+    ancestor_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    __table_args__ = (
+        # Ancêtres d'une catégorie (fil d'Ariane), du plus proche au plus lointain
+        Index("ix_category_closure_descendant_depth", "descendant_id", "depth"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<CategoryClosure(ancestor_id={self.ancestor_id}, "
+            f"descendant_id={self.descendant_id}, depth={self.depth})>"
+        )
@@ -25,6 +25,8 @@ class Envelope(Base):
     # Budget
     monthly_budget = Column(Numeric(10, 2), default=0.00, nullable=False)
     current_balance = Column(Numeric(10, 2), default=0.00, nullable=False)
+    # Report mensuel : carry_over (le budget s'ajoute au solde) ou reset (le solde repart du budget)
+    rollover_policy = Column(String(20), default="carry_over", server_default="carry_over", nullable=False)
     
     # Personnalisation
     color = Column(String(7), nullable=True)
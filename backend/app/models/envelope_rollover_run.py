@@ -0,0 +1,27 @@
+"""
+Modèle EnvelopeRolloverRun - Report mensuel effectué pour un utilisateur
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class EnvelopeRolloverRun(Base):
+    """
+    Trace du financement mensuel des enveloppes d'un utilisateur
+
+    La ligne est insérée dans la même transaction que la mise à jour des
+    soldes : sa clé primaire (user_id, year_month) garantit qu'un mois n'est
+    financé qu'une fois, même après un redémarrage ou avec plusieurs workers.
+    Écrite par app/services/envelope_rollover.py.
+    """
+    __tablename__ = "envelope_rollover_runs"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    year_month = Column(String(7), primary_key=True)  # YYYY-MM
+    envelope_count = Column(Integer, nullable=False)
+    total_budget = Column(Numeric(14, 2), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<EnvelopeRolloverRun(user_id={self.user_id}, year_month='{self.year_month}')>"
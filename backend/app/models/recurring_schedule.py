@@ -0,0 +1,56 @@
+"""
+Modèle RecurringSchedule - Échéancier d'une transaction récurrente
+"""
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Numeric, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class RecurringSchedule(Base):
+    """
+    Modèle de transaction et règle de récurrence (sous-ensemble de RRULE)
+
+    next_occurrence sert de marque de progression : le générateur ne lit que
+    les échéanciers actifs dont la prochaine occurrence est passée, puis
+    l'avance après avoir créé les transactions dues. NULL quand la règle est
+    terminée (COUNT ou UNTIL atteint).
+    """
+    __tablename__ = "recurring_schedules"
+    __table_args__ = (
+        # Échéanciers dus (WHERE is_active AND next_occurrence <= :today)
+        Index("ix_recurring_schedules_due", "is_active", "next_occurrence"),
+    )
+    
+    # Identifiant
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Clés étrangères
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    bank_account_id = Column(Integer, ForeignKey("bank_accounts.id", ondelete="CASCADE"), nullable=False, index=True)
+    envelope_id = Column(Integer, ForeignKey("envelopes.id", ondelete="SET NULL"), nullable=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    
+    # Modèle des transactions générées
+    amount = Column(Numeric(10, 2), nullable=False)
+    transaction_type = Column(String(20), nullable=False)
+    description = Column(String(255), nullable=True)
+    payee = Column(String(100), nullable=True)
+    priority = Column(String(20), nullable=True)
+    
+    # Récurrence
+    rrule = Column(String(255), nullable=False)  # ex: FREQ=MONTHLY;BYMONTHDAY=1
+    start_date = Column(Date, nullable=False)
+    next_occurrence = Column(Date, nullable=True)
+    last_occurrence = Column(Date, nullable=True)
+    is_active = Column(Boolean, default=True, nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Relations
+    transactions = relationship("Transaction", back_populates="recurring_schedule", passive_deletes=True)
+    
+    def __repr__(self):
+        return f"<RecurringSchedule(id={self.id}, rrule='{self.rrule}', next={self.next_occurrence})>"
@@ -0,0 +1,23 @@
+"""
+Modèle ResourceVersion - Version des ressources d'un utilisateur
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.database import Base
+
+
+class ResourceVersion(Base):
+    """
+    Compteur incrémenté à chaque écriture sur une ressource d'un utilisateur
+
+    Sert d'ETag aux listes (catégories, comptes, enveloppes, listes de
+    souhaits) : tant que la version ne change pas, la liste non plus.
+    Maintenu par app/services/resource_versions.py.
+    """
+    __tablename__ = "resource_versions"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    resource = Column(String(50), primary_key=True)  # Nom de la table (categories, envelopes...)
+    version = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<ResourceVersion(user_id={self.user_id}, resource='{self.resource}', version={self.version})>"
@@ -1,7 +1,7 @@
 """
 Modèle Transaction - Dépense ou revenu
 """
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Numeric, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -10,6 +10,12 @@ from app.database import Base
 class Transaction(Base):
     """Modèle représentant une transaction (dépense ou revenu)"""
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Index couvrant le tri (date DESC, id DESC) de la pagination par curseur
+        Index("ix_transactions_user_date_id", "user_id", "date", "id"),
+        # Une seule transaction par occurrence d'un échéancier (génération idempotente)
+        Index("ix_transactions_schedule_date", "recurring_schedule_id", "date", unique=True),
+    )
     
     # Identifiant
     id = Column(Integer, primary_key=True, index=True)
@@ -19,6 +25,7 @@ class Transaction(Base):
     bank_account_id = Column(Integer, ForeignKey("bank_accounts.id", ondelete="CASCADE"), nullable=False, index=True)
     envelope_id = Column(Integer, ForeignKey("envelopes.id", ondelete="SET NULL"), nullable=True, index=True)
     category_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=False, index=True)
+    recurring_schedule_id = Column(Integer, ForeignKey("recurring_schedules.id", ondelete="SET NULL"), nullable=True)
     
     # Informations financières
     amount = Column(Numeric(10, 2), nullable=False)
@@ -43,6 +50,54 @@ class Transaction(Base):
     envelope = relationship("Envelope", back_populates="transactions")
     category = relationship("Category", back_populates="transactions")
     wish_list_items = relationship("WishListItem", back_populates="transaction")
+    recurring_schedule = relationship("RecurringSchedule", back_populates="transactions")
     
     def __repr__(self):
         return f"<Transaction(id={self.id}, type='{self.transaction_type}', amount={self.amount}, date={self.date})>"
+
+
+# === Index plein texte (SQLite FTS5) sur description/payee ===
+# Table FTS5 à contenu externe : seul l'index est stocké, les triggers le
+# maintiennent synchronisé avec la table transactions.
+TRANSACTIONS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description, payee,
+        content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description, payee)
+        VALUES (new.id, new.description, new.payee);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, payee)
+        VALUES ('delete', old.id, old.description, old.payee);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description, payee ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, payee)
+        VALUES ('delete', old.id, old.description, old.payee);
+        INSERT INTO transactions_fts(rowid, description, payee)
+        VALUES (new.id, new.description, new.payee);
+    END
+    """,
+]
+
+for _statement in TRANSACTIONS_FTS_DDL:
+    event.listen(
+        Transaction.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite")
+    )
+
+event.listen(
+    Transaction.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS transactions_fts").execute_if(dialect="sqlite")
+)
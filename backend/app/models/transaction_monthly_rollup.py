@@ -0,0 +1,40 @@
+"""
+Modèle TransactionMonthlyRollup - Agrégats mensuels des transactions
+"""
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey
+from app.database import Base
+
+
+# Valeur de envelope_id pour les transactions sans enveloppe (une valeur NULL
+# ne pourrait pas faire partie de la clé primaire)
+NO_ENVELOPE = 0
+
+
+class TransactionMonthlyRollup(Base):
+    """
+    Somme et nombre de transactions par utilisateur, mois, compte, enveloppe,
+    catégorie et type
+
+    Table dérivée : maintenue par les écritures de transactions (voir
+    app/services/transaction_effects.py) et reconstructible à tout moment
+    (python -m app.services.monthly_rollups).
+    """
+    __tablename__ = "transaction_monthly_rollups"
+    
+    # Clé d'agrégation
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    year_month = Column(String(7), primary_key=True)  # YYYY-MM
+    bank_account_id = Column(Integer, primary_key=True)
+    envelope_id = Column(Integer, primary_key=True, default=NO_ENVELOPE)
+    category_id = Column(Integer, primary_key=True)
+    transaction_type = Column(String(20), primary_key=True)
+    
+    # Agrégats
+    total_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return (
+            f"<TransactionMonthlyRollup(user_id={self.user_id}, month='{self.year_month}', "
+            f"type='{self.transaction_type}', total={self.total_amount}, count={self.transaction_count})>"
+        )
@@ -6,7 +6,10 @@ from app.routes.categories import router as categories_router
 from app.routes.bank_accounts import router as bank_accounts_router
 from app.routes.envelopes import router as envelopes_router
 from app.routes.transactions import router as transactions_router
+from app.routes.recurring_schedules import router as recurring_schedules_router
 from app.routes.wish_lists import router as wish_lists_router
+from app.routes.reports import router as reports_router
+from app.routes.dashboard import router as dashboard_router
 
 __all__ = [
     "auth_router",
@@ -14,5 +17,8 @@ __all__ = [
     "bank_accounts_router",
     "envelopes_router",
     "transactions_router",
+    "recurring_schedules_router",
     "wish_lists_router",
+    "reports_router",
+    "dashboard_router",
 ]
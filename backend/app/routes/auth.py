@@ -8,7 +8,10 @@ from sqlalchemy import select
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserRead, UserLogin, Token
-from app.utils.auth import hash_password, verify_password, create_access_token, create_refresh_token
+from app.utils.auth import (
+    PasswordHashingBusy, hash_password_async, verify_password_async,
+    create_access_token, create_refresh_token
+)
 from app.utils.dependencies import get_current_user, verify_refresh_token
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -38,8 +41,11 @@ async def register(
             detail="Email already registered"
         )
     
-    # Créer le nouvel utilisateur
-    hashed_password = hash_password(user_data.password)
+    # Créer le nouvel utilisateur (hash calculé hors de la boucle d'événements)
+    try:
+        hashed_password = await hash_password_async(user_data.password)
+    except PasswordHashingBusy:
+        raise _busy_exception()
     new_user = User(
         email=user_data.email,
         password_hash=hashed_password
@@ -77,8 +83,13 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Vérifier le mot de passe
-    if not verify_password(credentials.password, user.password_hash):
+    # Vérifier le mot de passe (hors de la boucle d'événements)
+    try:
+        password_ok = await verify_password_async(credentials.password, user.password_hash)
+    except PasswordHashingBusy:
+        raise _busy_exception()
+    
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -104,6 +115,15 @@ async def login(
     )
 
 
+def _busy_exception() -> HTTPException:
+    """Erreur renvoyée quand trop de hash de mots de passe sont en attente."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/refresh", response_model=Token)
 async def refresh_access_token(
     token_data = Depends(verify_refresh_token),
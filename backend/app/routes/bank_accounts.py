@@ -2,30 +2,47 @@
 Routes API pour la gestion des comptes bancaires
 """
 from typing import List, Optional
+from datetime import date
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, func
 
 from app.database import get_db
 from app.models.bank_account import BankAccount
+from app.models.envelope import Envelope
+from app.models.transaction import Transaction
 from app.models.user import User
 from app.schemas.bank_account import (
     BankAccountCreate,
     BankAccountUpdate,
     BankAccountRead,
-    BankAccountAdjustBalance
+    BankAccountAdjustBalance,
+    BankAccountReconciliation
 )
-from app.utils.dependencies import get_current_user
+from app.schemas.balance_movement import BalanceEntity, BalanceMovementRead, MovementKind
+from app.schemas.balance_snapshot import BalanceAsOf
+from app.services.balance_ledger import history_page, movement, movements_total, record_movements
+from app.services.balance_snapshots import balance_as_of
+from app.services.monthly_rollups import remove_rollup_contributions
+from app.services.transaction_effects import SIGNED_AMOUNT
+from app.utils.dependencies import cached_route, get_current_user, get_read_db, resource_etag
+from app.utils.pagination import decode_id_cursor, encode_cursor
+from app.utils.response_cache import RouteCache, response_cache
 
 router = APIRouter(prefix="/bank-accounts", tags=["Bank Accounts"])
 
+# Réponses en cache invalidées par toute écriture sur les comptes
+CACHED_SCOPES = ("bank_accounts.list",)
+
 
 @router.get("", response_model=List[BankAccountRead])
 async def get_bank_accounts(
     account_type: Optional[str] = Query(None, description="Filtrer par type de compte"),
     currency: Optional[str] = Query(None, description="Filtrer par devise"),
-    db: AsyncSession = Depends(get_db),
+    etag: str = Depends(resource_etag("bank_accounts")),
+    cache: RouteCache = Depends(cached_route("bank_accounts.list")),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -38,6 +55,9 @@ async def get_bank_accounts(
     Returns:
         Liste des comptes triés par nom
     """
+    if cache.hit is not None:
+        return cache.hit
+    
     # Construction de la requête de base
     query = select(BankAccount).where(BankAccount.user_id == current_user.id)
     
@@ -55,13 +75,13 @@ async def get_bank_accounts(
     result = await db.execute(query)
     accounts = result.scalars().all()
     
-    return accounts
+    return await cache.store(List[BankAccountRead], accounts)
 
 
 @router.get("/{account_id}", response_model=BankAccountRead)
 async def get_bank_account(
     account_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -123,7 +143,13 @@ async def create_bank_account(
     )
     
     db.add(new_account)
+    await db.flush()
+    await record_movements(db, [movement(
+        current_user.id, BalanceEntity.BANK_ACCOUNT, new_account.id,
+        new_account.current_balance, MovementKind.OPENING, balance=new_account.current_balance
+    )])
     await db.commit()
+    await response_cache.invalidate(current_user.id, *CACHED_SCOPES)
     await db.refresh(new_account)
     
     return new_account
@@ -173,6 +199,7 @@ async def update_bank_account(
         setattr(account, field, value)
     
     await db.commit()
+    await response_cache.invalidate(current_user.id, *CACHED_SCOPES)
     await db.refresh(account)
     
     return account
@@ -197,7 +224,9 @@ async def adjust_balance(
     
     Note:
     - Modifie directement current_balance
-    - initial_balance reste inchangé
+    - L'écart est enregistré dans l'historique du compte (GET /bank-accounts/{id}/history)
+    - initial_balance reste inchangé : la réconciliation (POST /reconcile)
+      ajoute les ajustements enregistrés au solde recalculé
     - Un ajustement peut aussi être enregistré comme transaction type 'adjustment'
     
     Returns:
@@ -220,23 +249,179 @@ async def adjust_balance(
             detail=f"Bank account {account_id} not found"
         )
     
-    # Ajuster le solde
+    # Ajuster le solde et noter l'écart dans le journal des mouvements
     old_balance = account.current_balance
     account.current_balance = adjustment_data.new_balance
+    await record_movements(db, [movement(
+        current_user.id, BalanceEntity.BANK_ACCOUNT, account_id,
+        adjustment_data.new_balance - old_balance, MovementKind.ADJUSTMENT,
+        balance=adjustment_data.new_balance, description=adjustment_data.reason
+    )])
     
     await db.commit()
+    await response_cache.invalidate(current_user.id, *CACHED_SCOPES)
     await db.refresh(account)
     
-    # Log l'ajustement (pour débogage)
-    print(f"Balance adjustment: Account {account_id} ({account.name})")
-    print(f"  Old balance: {old_balance} {account.currency}")
-    print(f"  New balance: {adjustment_data.new_balance} {account.currency}")
-    if adjustment_data.reason:
-        print(f"  Reason: {adjustment_data.reason}")
-    
     return account
 
 
+@router.get("/{account_id}/history", response_model=List[BalanceMovementRead])
+async def get_bank_account_history(
+    account_id: int,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Curseur de pagination (en-tête X-Next-Cursor de la page précédente)"),
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Historique des mouvements du solde d'un compte, du plus récent au plus ancien
+    
+    Chaque mouvement (transactions, ajustements, réconciliations, points de
+    contrôle) porte le solde après celui-ci. Quand la page est pleine, le
+    curseur de la page suivante est renvoyé dans l'en-tête `X-Next-Cursor`.
+    """
+    result = await db.execute(
+        select(BankAccount.id).where(
+            and_(
+                BankAccount.id == account_id,
+                BankAccount.user_id == current_user.id
+            )
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bank account {account_id} not found"
+        )
+    
+    before_id = None
+    if cursor is not None:
+        before_id = decode_id_cursor(cursor)
+        if before_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    movements = await history_page(
+        db, current_user.id, BalanceEntity.BANK_ACCOUNT, account_id, limit, before_id
+    )
+    if len(movements) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(movements[-1].id)
+    
+    return movements
+
+
+@router.get("/{account_id}/balance", response_model=BalanceAsOf)
+async def get_bank_account_balance(
+    account_id: int,
+    as_of: Optional[date] = Query(None, description="Date du solde, en fin de journée (défaut : aujourd'hui)"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Solde d'un compte à une date
+    
+    Calculé depuis le snapshot de fin de mois le plus proche, plus les
+    transactions datées depuis et les autres mouvements du solde
+    (ajustements, réconciliations) enregistrés depuis.
+    """
+    result = await db.execute(
+        select(BankAccount.id).where(
+            and_(
+                BankAccount.id == account_id,
+                BankAccount.user_id == current_user.id
+            )
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bank account {account_id} not found"
+        )
+    
+    return await balance_as_of(
+        db, current_user.id, BalanceEntity.BANK_ACCOUNT, account_id, as_of or date.today()
+    )
+
+
+@router.post("/{account_id}/reconcile", response_model=BankAccountReconciliation)
+async def reconcile_balance(
+    account_id: int,
+    apply: bool = Query(False, description="Remplacer le solde par le solde recalculé"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Recalcule le solde d'un compte à partir de ses transactions
+    
+    Le solde courant est maintenu de façon incrémentale à chaque écriture de
+    transaction. Cette route le recalcule entièrement (solde initial + somme
+    signée des transactions + ajustements manuels) et rapporte l'écart éventuel.
+    
+    Paramètres:
+    - **account_id**: ID du compte
+    - **apply**: Si true, corrige current_balance avec le solde recalculé
+    
+    Returns:
+        Rapport de réconciliation
+    """
+    result = await db.execute(
+        select(BankAccount).where(
+            and_(
+                BankAccount.id == account_id,
+                BankAccount.user_id == current_user.id
+            )
+        )
+    )
+    account = result.scalar_one_or_none()
+    
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bank account {account_id} not found"
+        )
+    
+    # Somme signée : les dépenses débitent, les autres types sont pris tels quels
+    totals = (await db.execute(
+        select(
+            func.coalesce(func.sum(SIGNED_AMOUNT), 0),
+            func.count(Transaction.id)
+        ).where(Transaction.bank_account_id == account_id)
+    )).one()
+    
+    # Ajustements manuels (POST /adjust), notés dans le journal des mouvements.
+    # Les mouvements de réconciliation ne comptent pas : ils ramènent le solde
+    # courant au solde recalculé, les ajouter rouvrirait l'écart qu'ils ferment.
+    adjustments = await movements_total(
+        db, current_user.id, BalanceEntity.BANK_ACCOUNT, account_id, [MovementKind.ADJUSTMENT]
+    )
+    
+    recorded_balance = Decimal(str(account.current_balance))
+    computed_balance = (
+        Decimal(str(account.initial_balance)) + Decimal(str(totals[0])) + adjustments
+    ).quantize(Decimal("0.01"))
+    drift = recorded_balance - computed_balance
+    
+    if apply and drift:
+        account.current_balance = computed_balance
+        await record_movements(db, [movement(
+            current_user.id, BalanceEntity.BANK_ACCOUNT, account_id,
+            -drift, MovementKind.RECONCILIATION, balance=computed_balance
+        )])
+        await db.commit()
+        await response_cache.invalidate(current_user.id, *CACHED_SCOPES)
+    
+    return BankAccountReconciliation(
+        account_id=account_id,
+        recorded_balance=recorded_balance,
+        computed_balance=computed_balance,
+        drift=drift,
+        transaction_count=totals[1],
+        applied=bool(apply and drift)
+    )
+
+
 @router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_bank_account(
     account_id: int,
@@ -277,8 +462,19 @@ async def delete_bank_account(
     # La contrainte FK en base empêchera la suppression
     
     try:
+        # Les transactions du compte et de ses enveloppes sont supprimées en
+        # cascade, sans passer par leurs effets : les retirer des agrégats
+        await remove_rollup_contributions(
+            db,
+            or_(
+                Transaction.bank_account_id == account_id,
+                Transaction.envelope_id.in_(select(Envelope.id).where(Envelope.bank_account_id == account_id))
+            )
+        )
         await db.delete(account)
         await db.commit()
+        # Les enveloppes du compte sont supprimées avec lui
+        await response_cache.invalidate(current_user.id, *CACHED_SCOPES, "envelopes.list")
     except Exception as e:
         await db.rollback()
         raise HTTPException(
@@ -15,16 +15,24 @@ from app.schemas.category import (
     CategoryRead,
     CategoryWithChildren
 )
-from app.utils.dependencies import get_current_user
+from app.services.category_closure import count_children, get_ancestors, is_in_subtree
+from app.services.category_tree import build_category_tree
+from app.utils.dependencies import cached_route, get_current_user, get_read_db, resource_etag
+from app.utils.response_cache import RouteCache, response_cache
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
+# Réponses en cache invalidées par toute écriture sur les catégories
+CACHED_SCOPES = ("categories.list", "categories.tree")
+
 
 @router.get("", response_model=List[CategoryRead])
 async def get_categories(
     parent_id: Optional[int] = Query(None, description="Filtrer par catégorie parente (None = racines)"),
     search: Optional[str] = Query(None, description="Recherche par nom"),
-    db: AsyncSession = Depends(get_db),
+    etag: str = Depends(resource_etag("categories")),
+    cache: RouteCache = Depends(cached_route("categories.list")),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -37,6 +45,9 @@ async def get_categories(
     Returns:
         Liste des catégories triées par sort_order
     """
+    if cache.hit is not None:
+        return cache.hit
+    
     # Construction de la requête de base
     query = select(Category).where(Category.user_id == current_user.id)
     
@@ -54,58 +65,52 @@ async def get_categories(
     result = await db.execute(query)
     categories = result.scalars().all()
     
-    return categories
+    return await cache.store(List[CategoryRead], categories)
 
 
 @router.get("/tree", response_model=List[CategoryWithChildren])
 async def get_categories_tree(
-    db: AsyncSession = Depends(get_db),
+    root_id: Optional[int] = Query(None, description="Racine du sous-arbre (None = arbre complet)"),
+    depth: Optional[int] = Query(None, ge=0, description="Niveaux d'enfants inclus (None = tous)"),
+    etag: str = Depends(resource_etag("categories")),
+    cache: RouteCache = Depends(cached_route("categories.tree")),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Récupère l'arbre complet des catégories (avec sous-catégories imbriquées)
+    Récupère l'arbre des catégories (avec sous-catégories imbriquées)
+    
+    Paramètres:
+    - **root_id**: Ne renvoyer que le sous-arbre de cette catégorie
+    - **depth**: Profondeur maximale sous les racines (0 = racines seules)
     
     Returns:
         Liste des catégories racines avec leurs enfants récursifs
     """
+    if cache.hit is not None:
+        return cache.hit
+    
     # Récupérer toutes les catégories de l'utilisateur
     result = await db.execute(
         select(Category)
         .where(Category.user_id == current_user.id)
         .order_by(Category.sort_order, Category.name)
     )
-    all_categories = result.scalars().all()
+    tree = build_category_tree(result.scalars().all(), root_id=root_id, depth=depth)
     
-    # Construire l'arbre manuellement (sans relation SQLAlchemy)
-    categories_by_id = {cat.id: cat for cat in all_categories}
-    root_categories = [cat for cat in all_categories if cat.parent_id is None]
+    if root_id is not None and not tree:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Category not found"
+        )
     
-    # Fonction récursive pour construire les enfants
-    def build_tree(category):
-        children_models = [c for c in all_categories if c.parent_id == category.id]
-        
-        # Convertir en dict pour éviter les problèmes de lazy loading
-        category_dict = {
-            "id": category.id,
-            "name": category.name,
-            "parent_id": category.parent_id,
-            "color": category.color,
-            "icon": category.icon,
-            "is_default": category.is_default,
-            "sort_order": category.sort_order,
-            "user_id": category.user_id,
-            "created_at": category.created_at,
-            "children": [build_tree(child) for child in children_models]
-        }
-        return category_dict
-    
-    return [build_tree(cat) for cat in root_categories]
+    return await cache.store(List[CategoryWithChildren], tree)
 
 
 @router.get("/{category_id}", response_model=CategoryRead)
 async def get_category(
     category_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -136,6 +141,32 @@ async def get_category(
     return category
 
 
+@router.get("/{category_id}/path", response_model=List[CategoryRead])
+async def get_category_path(
+    category_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Récupère le chemin d'une catégorie depuis sa racine (fil d'Ariane)
+    
+    Paramètres:
+    - **category_id**: ID de la catégorie
+    
+    Returns:
+        Catégories de la racine jusqu'à la catégorie demandée incluse
+    """
+    path = await get_ancestors(db, current_user.id, category_id)
+    
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Category {category_id} not found"
+        )
+    
+    return path
+
+
 @router.post("", response_model=CategoryRead, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category_data: CategoryCreate,
@@ -180,6 +211,7 @@ async def create_category(
     
     db.add(new_category)
     await db.commit()
+    await response_cache.invalidate(current_user.id, *CACHED_SCOPES)
     await db.refresh(new_category)
     
     return new_category
@@ -242,6 +274,13 @@ async def update_category(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Parent category {category_data.parent_id} not found"
             )
+        
+        # Ni sous l'une de ses propres sous-catégories (cycle)
+        if await is_in_subtree(db, category_id, category_data.parent_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A category cannot be moved under one of its subcategories"
+            )
     
     # Mettre à jour les champs
     update_data = category_data.model_dump(exclude_unset=True)
@@ -249,6 +288,7 @@ async def update_category(
         setattr(category, field, value)
     
     await db.commit()
+    await response_cache.invalidate(current_user.id, *CACHED_SCOPES)
     await db.refresh(category)
     
     return category
@@ -291,15 +331,12 @@ async def delete_category(
         )
     
     # Vérifier s'il y a des sous-catégories
-    children_result = await db.execute(
-        select(Category).where(Category.parent_id == category_id)
-    )
-    children = children_result.scalars().all()
+    children_count = await count_children(db, category_id)
     
-    if children:
+    if children_count:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot delete category with {len(children)} subcategories. Delete or reassign them first."
+            detail=f"Cannot delete category with {children_count} subcategories. Delete or reassign them first."
         )
     
     # Vérifier s'il y a des enveloppes liées
@@ -309,6 +346,8 @@ async def delete_category(
     try:
         await db.delete(category)
         await db.commit()
+        # Les enveloppes de la catégorie perdent leur category_id
+        await response_cache.invalidate(current_user.id, *CACHED_SCOPES, "envelopes.list")
     except Exception as e:
         await db.rollback()
         raise HTTPException(
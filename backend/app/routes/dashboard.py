@@ -0,0 +1,43 @@
+"""
+Route API du tableau de bord
+"""
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+
+from app.models.user import User
+from app.schemas.dashboard import DashboardRead
+from app.services.dashboard import build_dashboard
+from app.utils.dependencies import get_current_user, get_read_session_factory
+from app.utils.etag import etag_response
+
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("", response_model=DashboardRead)
+async def get_dashboard(
+    request: Request,
+    month: Optional[str] = Query(
+        None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Mois résumé (YYYY-MM, mois courant par défaut)"
+    ),
+    session_factory = Depends(get_read_session_factory),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Données du tableau de bord en une seule requête
+    
+    Totaux, soldes des comptes, remplissage des enveloppes, résumé du mois,
+    dernières transactions et avancement des listes de souhaits. Les requêtes
+    s'exécutent en parallèle.
+    
+    La réponse porte un ETag : avec If-None-Match, un tableau de bord inchangé
+    renvoie 304 sans corps.
+    """
+    dashboard = await build_dashboard(
+        session_factory,
+        current_user.id,
+        current_user.email,
+        month or date.today().strftime("%Y-%m")
+    )
+    return etag_response(request, dashboard)
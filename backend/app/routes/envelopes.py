@@ -1,35 +1,57 @@
 """
 Routes API pour les enveloppes budgétaires
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional
+from datetime import date
 from decimal import Decimal
 
 from app.database import get_db
-from app.models import User, Envelope, BankAccount, Category
+from app.models import User, Envelope, BankAccount, Category, Transaction
 from app.schemas.envelope import (
     EnvelopeCreate,
     EnvelopeUpdate,
     EnvelopeRead,
     EnvelopeReallocate,
+    EnvelopeAllocateBatch,
     EnvelopeWithStats
 )
-from app.utils.dependencies import get_current_user
+from app.schemas.balance_movement import BalanceEntity, BalanceMovementRead
+from app.schemas.balance_snapshot import BalanceAsOf
+from app.services.balance_ledger import history_page
+from app.services.balance_snapshots import balance_as_of
+from app.services.envelope_transfers import (
+    EnvelopeNotFound,
+    InsufficientFunds,
+    apply_envelope_deltas,
+    budget_distribution,
+    transfer_funds
+)
+from app.services.monthly_rollups import remove_rollup_contributions
+from app.utils.dependencies import cached_route, get_current_user, get_read_db, resource_etag
+from app.utils.pagination import decode_id_cursor, encode_cursor
+from app.utils.response_cache import RouteCache, response_cache
 
 
 router = APIRouter(prefix="/envelopes", tags=["envelopes"])
 
+# Réponses en cache invalidées par toute écriture sur les enveloppes
+CACHED_SCOPES = ("envelopes.list",)
+
 
 @router.get("", response_model=List[EnvelopeRead])
 async def list_envelopes(
     bank_account_id: Optional[int] = Query(None, description="Filtrer par compte bancaire"),
     category_id: Optional[int] = Query(None, description="Filtrer par catégorie"),
     is_active: Optional[bool] = Query(None, description="Filtrer par statut actif"),
+    etag: str = Depends(resource_etag("envelopes")),
+    cache: RouteCache = Depends(cached_route("envelopes.list")),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Liste toutes les enveloppes de l'utilisateur
@@ -39,6 +61,9 @@ async def list_envelopes(
     - **category_id**: ID de la catégorie
     - **is_active**: Actif ou inactif
     """
+    if cache.hit is not None:
+        return cache.hit
+    
     query = select(Envelope).where(Envelope.user_id == current_user.id)
     
     # Appliquer les filtres
@@ -55,14 +80,14 @@ async def list_envelopes(
     result = await db.execute(query)
     envelopes = result.scalars().all()
     
-    return envelopes
+    return await cache.store(List[EnvelopeRead], envelopes)
 
 
 @router.get("/{envelope_id}", response_model=EnvelopeRead)
 async def get_envelope(
     envelope_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère une enveloppe spécifique
@@ -136,6 +161,7 @@ async def create_envelope(
     
     db.add(envelope)
     await db.commit()
+    await response_cache.invalidate(current_user.id, *CACHED_SCOPES)
     await db.refresh(envelope)
     
     return envelope
@@ -207,6 +233,7 @@ async def update_envelope(
         setattr(envelope, field, value)
     
     await db.commit()
+    await response_cache.invalidate(current_user.id, *CACHED_SCOPES)
     await db.refresh(envelope)
     
     return envelope
@@ -241,8 +268,12 @@ async def delete_envelope(
     # Supprimer l'enveloppe
     # Les contraintes FK empêcheront la suppression si des transactions existent
     try:
+        # Les transactions de l'enveloppe sont supprimées en cascade, sans
+        # passer par leurs effets : les retirer des agrégats
+        await remove_rollup_contributions(db, Transaction.envelope_id == envelope_id)
         await db.delete(envelope)
         await db.commit()
+        await response_cache.invalidate(current_user.id, *CACHED_SCOPES)
     except Exception as e:
         await db.rollback()
         raise HTTPException(
@@ -253,6 +284,83 @@ async def delete_envelope(
     return None
 
 
+@router.get("/{envelope_id}/history", response_model=List[BalanceMovementRead])
+async def get_envelope_history(
+    envelope_id: int,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Curseur de pagination (en-tête X-Next-Cursor de la page précédente)"),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Historique des mouvements du solde d'une enveloppe, du plus récent au plus ancien
+    
+    Transactions, réallocations, allocations groupées, report mensuel et points
+    de contrôle, chacun avec le solde après le mouvement. Quand la page est
+    pleine, le curseur de la page suivante est renvoyé dans l'en-tête
+    `X-Next-Cursor`.
+    """
+    result = await db.execute(
+        select(Envelope.id).where(
+            Envelope.id == envelope_id,
+            Envelope.user_id == current_user.id
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Envelope not found"
+        )
+    
+    before_id = None
+    if cursor is not None:
+        before_id = decode_id_cursor(cursor)
+        if before_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    movements = await history_page(
+        db, current_user.id, BalanceEntity.ENVELOPE, envelope_id, limit, before_id
+    )
+    if len(movements) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(movements[-1].id)
+    
+    return movements
+
+
+@router.get("/{envelope_id}/balance", response_model=BalanceAsOf)
+async def get_envelope_balance(
+    envelope_id: int,
+    as_of: Optional[date] = Query(None, description="Date du solde, en fin de journée (défaut : aujourd'hui)"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Solde d'une enveloppe à une date
+    
+    Calculé depuis le snapshot de fin de mois le plus proche, plus les
+    transactions datées depuis et les autres mouvements du solde
+    (réallocations, allocations, report mensuel) enregistrés depuis.
+    """
+    result = await db.execute(
+        select(Envelope.id).where(
+            Envelope.id == envelope_id,
+            Envelope.user_id == current_user.id
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Envelope not found"
+        )
+    
+    return await balance_as_of(
+        db, current_user.id, BalanceEntity.ENVELOPE, envelope_id, as_of or date.today()
+    )
+
+
 @router.post("/{envelope_id}/reallocate", response_model=EnvelopeRead)
 async def reallocate_funds(
     envelope_id: int,
@@ -266,6 +374,10 @@ async def reallocate_funds(
     - Retire le montant de l'enveloppe source
     - Ajoute le montant à l'enveloppe destination
     - Les deux enveloppes doivent appartenir à l'utilisateur
+    
+    Le solde source est vérifié par la base au moment du débit (UPDATE
+    conditionnel) : deux transferts concurrents ne peuvent pas le mettre à
+    découvert.
     """
     # Vérifier que les IDs sont différents
     if reallocation.from_envelope_id == reallocation.to_envelope_id:
@@ -274,38 +386,108 @@ async def reallocate_funds(
             detail="Source and destination envelopes must be different"
         )
     
-    # Récupérer les deux enveloppes
-    result = await db.execute(
-        select(Envelope).where(
-            Envelope.id.in_([reallocation.from_envelope_id, reallocation.to_envelope_id]),
-            Envelope.user_id == current_user.id
+    # Effectuer le transfert (débit conditionnel + crédit, une transaction)
+    try:
+        await transfer_funds(
+            db, current_user.id,
+            reallocation.from_envelope_id, reallocation.to_envelope_id, reallocation.amount,
+            reallocation.description
         )
-    )
-    envelopes = result.scalars().all()
-    
-    if len(envelopes) != 2:
+    except EnvelopeNotFound:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="One or both envelopes not found"
         )
+    except InsufficientFunds as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Insufficient funds in source envelope. Available: {e.available}"
+        )
+    
+    await db.commit()
+    await response_cache.invalidate(current_user.id, *CACHED_SCOPES)
+    from_envelope = await db.get(Envelope, reallocation.from_envelope_id, populate_existing=True)
     
-    # Identifier source et destination
-    from_envelope = next((e for e in envelopes if e.id == reallocation.from_envelope_id), None)
-    to_envelope = next((e for e in envelopes if e.id == reallocation.to_envelope_id), None)
+    # Retourner l'enveloppe source mise à jour
+    return from_envelope
+
+
+@router.post("/allocate-batch", response_model=List[EnvelopeRead])
+async def allocate_batch(
+    allocation: EnvelopeAllocateBatch,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Applique plusieurs mouvements entre enveloppes en une seule transaction
     
-    # Vérifier que l'enveloppe source a assez de fonds
-    if from_envelope.current_balance < reallocation.amount:
+    - **moves**: transferts (source, destination, montant)
+    - **distribute**: répartit un montant entre les enveloppes actives au
+      prorata de leur budget mensuel (par exemple le salaire)
+    
+    Les mouvements sont cumulés par enveloppe puis appliqués en un seul
+    UPDATE : chaque enveloppe débitée doit couvrir son débit net. Tout ou rien.
+    
+    Returns:
+        Les enveloppes modifiées
+    """
+    if not allocation.moves and allocation.distribute is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Insufficient funds in source envelope. Available: {from_envelope.current_balance}"
+            detail="Nothing to allocate"
         )
     
-    # Effectuer le transfert
-    from_envelope.current_balance -= reallocation.amount
-    to_envelope.current_balance += reallocation.amount
+    deltas: Dict[int, Decimal] = defaultdict(Decimal)
+    for move in allocation.moves:
+        if move.from_envelope_id == move.to_envelope_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Source and destination envelopes must be different"
+            )
+        deltas[move.from_envelope_id] -= move.amount
+        deltas[move.to_envelope_id] += move.amount
+    
+    distribute = allocation.distribute
+    if distribute is not None:
+        shares = await budget_distribution(
+            db, current_user.id, distribute.amount,
+            distribute.bank_account_id, distribute.from_envelope_id
+        )
+        if not shares:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No active envelope with a monthly budget to distribute to"
+            )
+        if distribute.from_envelope_id is not None:
+            deltas[distribute.from_envelope_id] -= distribute.amount
+        for envelope_id, share in shares.items():
+            deltas[envelope_id] += share
+    
+    try:
+        await apply_envelope_deltas(db, current_user.id, deltas, description=allocation.description)
+    except EnvelopeNotFound as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Envelope {e.envelope_id} not found"
+        )
+    except InsufficientFunds as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Insufficient funds in envelope {e.envelope_id}. Available: {e.available}"
+        )
     
     await db.commit()
-    await db.refresh(from_envelope)
+    await response_cache.invalidate(current_user.id, *CACHED_SCOPES)
     
-    # Retourner l'enveloppe source mise à jour
-    return from_envelope
+    # Les enveloppes dont les mouvements s'annulent ne sont pas modifiées
+    changed = [envelope_id for envelope_id, delta in deltas.items() if delta]
+    result = await db.execute(
+        select(Envelope)
+        .where(Envelope.user_id == current_user.id, Envelope.id.in_(changed))
+        .order_by(Envelope.name)
+    )
+    return result.scalars().all()
@@ -0,0 +1,229 @@
+"""
+Routes API pour les échéanciers de transactions récurrentes
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models import User, BankAccount, Category, Envelope, Transaction, RecurringSchedule
+from app.schemas.recurring_schedule import (
+    RecurringScheduleCreate,
+    RecurringScheduleFromTransaction,
+    RecurringScheduleUpdate,
+    RecurringScheduleRead
+)
+from app.utils.dependencies import get_current_user, get_read_db
+from app.utils.recurrence import first_occurrence, parse_rule
+
+
+router = APIRouter(prefix="/recurring-schedules", tags=["recurring-schedules"])
+
+
+async def _check_owned(db: AsyncSession, model, entity_id: int, user_id: int, detail: str) -> None:
+    """Vérifie qu'un compte, une catégorie ou une enveloppe appartient à l'utilisateur."""
+    result = await db.execute(
+        select(model.id).where(and_(model.id == entity_id, model.user_id == user_id))
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+async def _get_schedule(db: AsyncSession, schedule_id: int, user_id: int) -> RecurringSchedule:
+    result = await db.execute(
+        select(RecurringSchedule).where(
+            and_(
+                RecurringSchedule.id == schedule_id,
+                RecurringSchedule.user_id == user_id
+            )
+        )
+    )
+    schedule = result.scalar_one_or_none()
+    if not schedule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recurring schedule not found"
+        )
+    return schedule
+
+
+def _next_occurrence(schedule: RecurringSchedule):
+    """Prochaine occurrence non encore générée (après last_occurrence)."""
+    rule = parse_rule(schedule.rrule, schedule.start_date)
+    if schedule.last_occurrence is None or schedule.last_occurrence < schedule.start_date:
+        return first_occurrence(rule)
+    return first_occurrence(rule, schedule.last_occurrence)
+
+
+@router.get("", response_model=List[RecurringScheduleRead])
+async def list_recurring_schedules(
+    bank_account_id: Optional[int] = Query(None, description="Filtrer par compte bancaire"),
+    is_active: Optional[bool] = Query(None, description="Filtrer par statut actif"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Liste les échéanciers de l'utilisateur, par prochaine occurrence
+
+    Filtres disponibles :
+    - **bank_account_id**: ID du compte bancaire
+    - **is_active**: Actif ou inactif
+    """
+    query = select(RecurringSchedule).where(RecurringSchedule.user_id == current_user.id)
+    if bank_account_id is not None:
+        query = query.where(RecurringSchedule.bank_account_id == bank_account_id)
+    if is_active is not None:
+        query = query.where(RecurringSchedule.is_active == is_active)
+    query = query.order_by(RecurringSchedule.next_occurrence, RecurringSchedule.id)
+
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+@router.get("/{schedule_id}", response_model=RecurringScheduleRead)
+async def get_recurring_schedule(
+    schedule_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Récupère un échéancier par son ID."""
+    return await _get_schedule(db, schedule_id, current_user.id)
+
+
+@router.post("", response_model=RecurringScheduleRead, status_code=status.HTTP_201_CREATED)
+async def create_recurring_schedule(
+    schedule_data: RecurringScheduleCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Crée un échéancier
+
+    Les occurrences à partir de start_date sont créées par le générateur
+    planifié, y compris celles déjà passées.
+    """
+    await _check_owned(db, BankAccount, schedule_data.bank_account_id, current_user.id, "Bank account not found")
+    await _check_owned(db, Category, schedule_data.category_id, current_user.id, "Category not found")
+    if schedule_data.envelope_id is not None:
+        await _check_owned(db, Envelope, schedule_data.envelope_id, current_user.id, "Envelope not found")
+
+    schedule = RecurringSchedule(user_id=current_user.id, **schedule_data.model_dump())
+    schedule.next_occurrence = _next_occurrence(schedule)
+
+    db.add(schedule)
+    await db.commit()
+    await db.refresh(schedule)
+
+    return schedule
+
+
+@router.post(
+    "/from-transaction/{transaction_id}",
+    response_model=RecurringScheduleRead,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_recurring_schedule_from_transaction(
+    transaction_id: int,
+    schedule_data: RecurringScheduleFromTransaction,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Rend une transaction existante récurrente
+
+    La transaction sert de modèle et de première occurrence : l'échéancier
+    démarre à sa date et les occurrences suivantes seront générées.
+    """
+    result = await db.execute(
+        select(Transaction).where(
+            and_(
+                Transaction.id == transaction_id,
+                Transaction.user_id == current_user.id
+            )
+        )
+    )
+    transaction = result.scalar_one_or_none()
+    if not transaction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found"
+        )
+    if transaction.recurring_schedule_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Transaction already belongs to a recurring schedule"
+        )
+
+    schedule = RecurringSchedule(
+        user_id=current_user.id,
+        bank_account_id=transaction.bank_account_id,
+        envelope_id=transaction.envelope_id,
+        category_id=transaction.category_id,
+        amount=transaction.amount,
+        transaction_type=transaction.transaction_type,
+        description=transaction.description,
+        payee=transaction.payee,
+        priority=transaction.priority,
+        rrule=schedule_data.rrule,
+        start_date=transaction.date,
+        last_occurrence=transaction.date
+    )
+    schedule.next_occurrence = _next_occurrence(schedule)
+    transaction.recurring_schedule = schedule
+    transaction.is_recurring = True
+
+    db.add(schedule)
+    await db.commit()
+    await db.refresh(schedule)
+
+    return schedule
+
+
+@router.put("/{schedule_id}", response_model=RecurringScheduleRead)
+async def update_recurring_schedule(
+    schedule_id: int,
+    schedule_data: RecurringScheduleUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Met à jour un échéancier
+
+    Changer la règle ou la date de début recalcule la prochaine occurrence
+    (après la dernière déjà générée). Les transactions déjà créées ne sont
+    pas modifiées.
+    """
+    schedule = await _get_schedule(db, schedule_id, current_user.id)
+    update_data = schedule_data.model_dump(exclude_unset=True)
+
+    if update_data.get("category_id") is not None:
+        await _check_owned(db, Category, update_data["category_id"], current_user.id, "Category not found")
+    if update_data.get("envelope_id") is not None:
+        await _check_owned(db, Envelope, update_data["envelope_id"], current_user.id, "Envelope not found")
+
+    for key, value in update_data.items():
+        setattr(schedule, key, value)
+    if "rrule" in update_data or "start_date" in update_data:
+        schedule.next_occurrence = _next_occurrence(schedule)
+
+    await db.commit()
+    await db.refresh(schedule)
+
+    return schedule
+
+
+@router.delete("/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_recurring_schedule(
+    schedule_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Supprime un échéancier (les transactions déjà générées sont conservées)."""
+    schedule = await _get_schedule(db, schedule_id, current_user.id)
+
+    await db.delete(schedule)
+    await db.commit()
+
+    return None
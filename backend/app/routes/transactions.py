@@ -1,34 +1,54 @@
 """
 Routes API pour les transactions
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import date
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, and_, or_
+import codecs
+import json
+import tempfile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_db, get_session_factory
 from app.models.transaction import Transaction
 from app.models.bank_account import BankAccount
 from app.models.envelope import Envelope
 from app.models.category import Category
 from app.models.user import User
 from app.schemas.transaction import (
-    TransactionCreate, TransactionUpdate, TransactionRead,
-    TransactionType, TransactionPriority
+    TransactionCreate, TransactionUpdate, TransactionRead, TransactionBulkResult,
+    TransactionImportJobRead, ImportFormat,
+    TransactionFilter, TransactionType, TransactionPriority, TransactionSort, SummaryGroupBy,
+    ExportFormat
 )
-from app.utils.dependencies import get_current_user
+from app.services.bulk_transactions import TransactionBulkInserter, missing_reference
+from app.services.category_closure import subtree_ids
+from app.services.statement_import import ImportOptions, create_job, get_job, run_import_job
+from app.services.transaction_effects import BALANCE_SCOPES, apply_transaction_effects, snapshot
+from app.services.transaction_export import EXPORT_COLUMNS, MEDIA_TYPES, stream_export
+from app.services.transaction_search import apply_search
+from app.services.transaction_summary import add_to_summary, empty_summary, format_summary, summary_sort_key
+from app.utils.dependencies import get_current_user, get_read_db
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.response_cache import response_cache
+from app.utils.sql import year_month
 
 
+settings = get_settings()
+
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
 
-@router.get("", response_model=List[TransactionRead])
-async def list_transactions(
+def _transaction_filters(
     bank_account_id: Optional[int] = Query(None, description="Filtrer par compte bancaire"),
     envelope_id: Optional[int] = Query(None, description="Filtrer par enveloppe"),
     category_id: Optional[int] = Query(None, description="Filtrer par catégorie"),
+    include_descendants: bool = Query(False, description="Inclure les sous-catégories de category_id"),
     transaction_type: Optional[TransactionType] = Query(None, description="Filtrer par type"),
     priority: Optional[TransactionPriority] = Query(None, description="Filtrer par priorité"),
     date_from: Optional[date] = Query(None, description="Date de début"),
@@ -36,62 +56,169 @@ async def list_transactions(
     min_amount: Optional[Decimal] = Query(None, description="Montant minimum"),
     max_amount: Optional[Decimal] = Query(None, description="Montant maximum"),
     search: Optional[str] = Query(None, description="Recherche dans description/payee"),
-    is_recurring: Optional[bool] = Query(None, description="Transactions récurrentes uniquement"),
-    skip: int = Query(0, ge=0),
+    is_recurring: Optional[bool] = Query(None, description="Transactions récurrentes uniquement")
+) -> TransactionFilter:
+    """Filtres communs à la liste et à l'export des transactions."""
+    return TransactionFilter(
+        bank_account_id=bank_account_id,
+        envelope_id=envelope_id,
+        category_id=category_id,
+        include_descendants=include_descendants,
+        transaction_type=transaction_type,
+        priority=priority,
+        date_from=date_from,
+        date_to=date_to,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        search=search,
+        is_recurring=is_recurring
+    )
+
+
+def _apply_transaction_filters(
+    query, filters: TransactionFilter, user_id: int, dialect_name: str, by_relevance: bool = False
+):
+    """Ajoute à une requête sur les transactions (de user_id) les clauses des filtres renseignés."""
+    if filters.bank_account_id is not None:
+        query = query.where(Transaction.bank_account_id == filters.bank_account_id)
+    if filters.envelope_id is not None:
+        query = query.where(Transaction.envelope_id == filters.envelope_id)
+    if filters.category_id is not None:
+        query = query.where(_category_clause(user_id, filters.category_id, filters.include_descendants))
+    if filters.transaction_type is not None:
+        query = query.where(Transaction.transaction_type == filters.transaction_type)
+    if filters.priority is not None:
+        query = query.where(Transaction.priority == filters.priority)
+    if filters.date_from is not None:
+        query = query.where(Transaction.date >= filters.date_from)
+    if filters.date_to is not None:
+        query = query.where(Transaction.date <= filters.date_to)
+    if filters.min_amount is not None:
+        query = query.where(Transaction.amount >= filters.min_amount)
+    if filters.max_amount is not None:
+        query = query.where(Transaction.amount <= filters.max_amount)
+    if filters.search is not None:
+        query = apply_search(query, filters.search, dialect_name, by_relevance=by_relevance)
+    if filters.is_recurring is not None:
+        query = query.where(Transaction.is_recurring == filters.is_recurring)
+    return query
+
+
+def _category_clause(user_id: int, category_id: int, include_descendants: bool):
+    """Filtre sur une catégorie, ou sur son sous-arbre (table de fermeture, même requête)."""
+    if include_descendants:
+        return Transaction.category_id.in_(subtree_ids(user_id, category_id))
+    return Transaction.category_id == category_id
+
+
+@router.get("", response_model=List[TransactionRead])
+async def list_transactions(
+    response: Response,
+    filters: TransactionFilter = Depends(_transaction_filters),
+    sort: TransactionSort = Query(TransactionSort.DATE, description="Tri: date ou pertinence (avec search)"),
+    cursor: Optional[str] = Query(None, description="Curseur de pagination (en-tête X-Next-Cursor de la page précédente)"),
+    skip: int = Query(0, ge=0, description="Pagination par offset (ignoré si cursor est fourni)"),
     limit: int = Query(100, ge=1, le=500),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Liste toutes les transactions de l'utilisateur avec filtres optionnels."""
+    """
+    Liste toutes les transactions de l'utilisateur avec filtres optionnels.
+    
+    Pagination:
+    - **cursor**: pagination par clé (date, id), servie directement par l'index
+      `(user_id, date, id)`. Quand la page est pleine, le curseur de la page
+      suivante est renvoyé dans l'en-tête `X-Next-Cursor`.
+    - **skip**: pagination par offset, conservée pour compatibilité
+    
+    Recherche:
+    - **search**: recherche par préfixe de mots dans l'index plein texte
+      (FTS5 sous SQLite, sous-chaîne sur les autres bases)
+    - **sort=relevance**: trie les résultats de la recherche par pertinence
+      (pagination par offset uniquement)
+    """
+    by_relevance = sort == TransactionSort.RELEVANCE and filters.search is not None
+    if by_relevance and cursor is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not available when sorting by relevance"
+        )
+    
     query = select(Transaction).where(Transaction.user_id == current_user.id)
+    query = _apply_transaction_filters(query, filters, current_user.id, db.bind.dialect.name, by_relevance)
     
-    # Filtres
-    if bank_account_id is not None:
-        query = query.where(Transaction.bank_account_id == bank_account_id)
-    if envelope_id is not None:
-        query = query.where(Transaction.envelope_id == envelope_id)
-    if category_id is not None:
-        query = query.where(Transaction.category_id == category_id)
-    if transaction_type is not None:
-        query = query.where(Transaction.transaction_type == transaction_type)
-    if priority is not None:
-        query = query.where(Transaction.priority == priority)
-    if date_from is not None:
-        query = query.where(Transaction.date >= date_from)
-    if date_to is not None:
-        query = query.where(Transaction.date <= date_to)
-    if min_amount is not None:
-        query = query.where(Transaction.amount >= min_amount)
-    if max_amount is not None:
-        query = query.where(Transaction.amount <= max_amount)
-    if search is not None:
-        search_pattern = f"%{search}%"
+    # Pagination par curseur : reprendre après la dernière ligne renvoyée
+    if cursor is not None:
+        cursor_date, cursor_id = _decode_transaction_cursor(cursor)
         query = query.where(
             or_(
-                Transaction.description.ilike(search_pattern),
-                Transaction.payee.ilike(search_pattern)
+                Transaction.date < cursor_date,
+                and_(Transaction.date == cursor_date, Transaction.id < cursor_id)
             )
         )
-    if is_recurring is not None:
-        query = query.where(Transaction.is_recurring == is_recurring)
+    elif skip:
+        query = query.offset(skip)
     
     # Tri par date décroissante
     query = query.order_by(Transaction.date.desc(), Transaction.id.desc())
-    query = query.offset(skip).limit(limit)
+    query = query.limit(limit)
     
     result = await db.execute(query)
     transactions = result.scalars().all()
     
+    if len(transactions) == limit and not by_relevance:
+        last = transactions[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.date.isoformat(), last.id)
+    
     return transactions
 
 
+def _decode_transaction_cursor(cursor: str) -> Tuple[date, int]:
+    """Décode un curseur (date, id) ou lève une erreur 400."""
+    values = decode_cursor(cursor, 2)
+    try:
+        return date.fromisoformat(values[0]), int(values[1])
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+@router.get("/export")
+async def export_transactions(
+    filters: TransactionFilter = Depends(_transaction_filters),
+    format: ExportFormat = Query(ExportFormat.CSV, description="Format d'export (csv, ndjson)"),
+    session_factory = Depends(get_session_factory),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Exporte les transactions de l'utilisateur (mêmes filtres que la liste).
+    
+    Les lignes sont lues par lots depuis un curseur côté serveur et envoyées au
+    fil de l'eau, triées par date décroissante : l'export n'est pas limité en
+    nombre de lignes et sa mémoire reste constante.
+    """
+    query = select(*EXPORT_COLUMNS).where(Transaction.user_id == current_user.id)
+    # Dialecte lu sur l'engine de la fabrique : aucune session n'est ouverte ici
+    dialect_name = session_factory.kw["bind"].dialect.name
+    query = _apply_transaction_filters(query, filters, current_user.id, dialect_name)
+    query = query.order_by(Transaction.date.desc(), Transaction.id.desc())
+    
+    return StreamingResponse(
+        stream_export(session_factory, query, format, settings.EXPORT_BATCH_SIZE),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format.value}"'}
+    )
+
+
 @router.post("", response_model=TransactionRead, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     transaction_data: TransactionCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Crée une nouvelle transaction."""
+    """Crée une nouvelle transaction et met à jour les soldes du compte et de l'enveloppe."""
     # Vérifier que le compte bancaire appartient à l'utilisateur
     result = await db.execute(
         select(BankAccount).where(
@@ -148,16 +275,173 @@ async def create_transaction(
     )
     
     db.add(transaction)
+    await apply_transaction_effects(db, added=[snapshot(transaction)])
     await db.commit()
+    await response_cache.invalidate(current_user.id, *BALANCE_SCOPES)
     await db.refresh(transaction)
     
     return transaction
 
 
+@router.post("/bulk", response_model=TransactionBulkResult)
+async def bulk_create_transactions(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Importe un lot de transactions en une seule transaction SQL.
+    
+    Le corps est soit un tableau JSON de transactions, soit un flux NDJSON
+    (`Content-Type: application/x-ndjson`, une transaction par ligne) lu au fil
+    de l'eau. Les lignes sont validées et insérées par lots ; les lignes
+    invalides sont ignorées et rapportées avec leur position.
+    
+    Returns:
+        Nombre de lignes créées, erreurs par ligne et débit (lignes/s)
+    """
+    inserter = TransactionBulkInserter(db, current_user.id, settings.BULK_INSERT_CHUNK_SIZE)
+    
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        async for index, line in _iter_ndjson_lines(request):
+            try:
+                raw = json.loads(line)
+            except ValueError:
+                inserter.add_error(index, "Invalid JSON")
+                continue
+            await inserter.add(index, raw)
+    else:
+        try:
+            rows = await request.json()
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid JSON body"
+            )
+        if not isinstance(rows, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Expected a JSON array of transactions"
+            )
+        for index, raw in enumerate(rows):
+            await inserter.add(index, raw)
+    
+    await inserter.flush()
+    await db.commit()
+    await response_cache.invalidate(current_user.id, *BALANCE_SCOPES)
+    
+    return inserter.result()
+
+
+async def _iter_ndjson_lines(request: Request):
+    """Découpe le flux de la requête en lignes non vides, sans le charger en entier."""
+    buffer = b""
+    index = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield index, line
+                index += 1
+    if buffer.strip():
+        yield index, buffer
+
+
+@router.post("/import", response_model=TransactionImportJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def import_statement(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    format: ImportFormat = Query(ImportFormat.CSV, description="Format du relevé (csv, ofx)"),
+    bank_account_id: Optional[int] = Query(None, description="Compte par défaut des opérations"),
+    category_id: Optional[int] = Query(None, description="Catégorie par défaut des opérations"),
+    envelope_id: Optional[int] = Query(None, description="Enveloppe par défaut des opérations"),
+    delimiter: str = Query(",", min_length=1, max_length=1, description="Séparateur CSV"),
+    encoding: str = Query("utf-8-sig", description="Encodage du fichier"),
+    date_format: Optional[str] = Query(None, description="Format strptime des dates (ex: %d/%m/%Y)"),
+    db: AsyncSession = Depends(get_db),
+    session_factory = Depends(get_session_factory),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Importe un relevé bancaire (CSV ou OFX) en tâche de fond.
+    
+    Le corps de la requête est le fichier brut. Il est recopié par morceaux dans
+    un fichier temporaire (écritures hors de la boucle d'événements), puis parsé
+    ligne à ligne et inséré par lots : la mémoire utilisée ne dépend pas de la
+    taille du relevé. Le compte, la catégorie et l'enveloppe par défaut sont
+    vérifiés avant la création du job (404 s'ils n'appartiennent pas à
+    l'utilisateur).
+    
+    Colonnes CSV reconnues (en-têtes, accents et casse ignorés): date, amount/montant,
+    debit/credit, description/libelle, payee/beneficiaire, transaction_type/type,
+    bank_account_id, category_id, envelope_id, priority. Sans type, un montant
+    négatif est une dépense et un montant positif un revenu.
+    
+    Returns:
+        Job d'import, dont l'avancement se suit avec GET /transactions/import/{job_id}
+    """
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown encoding: {encoding}"
+        )
+    
+    detail = await missing_reference(
+        db, current_user.id,
+        bank_account_id=bank_account_id, category_id=category_id, envelope_id=envelope_id
+    )
+    if detail is not None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+    
+    source = await run_in_threadpool(tempfile.TemporaryFile)
+    total_bytes = 0
+    async for chunk in request.stream():
+        await run_in_threadpool(source.write, chunk)
+        total_bytes += len(chunk)
+    await run_in_threadpool(source.seek, 0)
+    
+    options = ImportOptions(
+        format=format,
+        bank_account_id=bank_account_id,
+        category_id=category_id,
+        envelope_id=envelope_id,
+        delimiter=delimiter,
+        encoding=encoding,
+        date_format=date_format
+    )
+    job = create_job(current_user.id, format, total_bytes)
+    background_tasks.add_task(
+        run_import_job, job, source, options, session_factory, settings.BULK_INSERT_CHUNK_SIZE
+    )
+    
+    return job
+
+
+@router.get("/import/{job_id}", response_model=TransactionImportJobRead)
+async def get_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Récupère l'avancement d'un import de relevé."""
+    job = get_job(job_id, current_user.id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    
+    return job
+
+
 @router.get("/{transaction_id}", response_model=TransactionRead)
 async def get_transaction(
     transaction_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Récupère une transaction par son ID."""
@@ -187,7 +471,7 @@ async def update_transaction(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Met à jour une transaction existante."""
+    """Met à jour une transaction existante et reporte la différence sur les soldes."""
     # Récupérer la transaction
     result = await db.execute(
         select(Transaction).where(
@@ -260,10 +544,15 @@ async def update_transaction(
             )
     
     # Appliquer les modifications
+    previous = snapshot(transaction)
     for key, value in update_data.items():
         setattr(transaction, key, value)
     
+    # Reporter la différence sur les soldes (ancien état retiré, nouvel état ajouté)
+    await apply_transaction_effects(db, added=[snapshot(transaction)], removed=[previous])
+    
     await db.commit()
+    await response_cache.invalidate(current_user.id, *BALANCE_SCOPES)
     await db.refresh(transaction)
     
     return transaction
@@ -275,7 +564,7 @@ async def delete_transaction(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Supprime une transaction."""
+    """Supprime une transaction et annule son effet sur les soldes."""
     result = await db.execute(
         select(Transaction).where(
             and_(
@@ -292,8 +581,10 @@ async def delete_transaction(
             detail="Transaction not found"
         )
     
+    await apply_transaction_effects(db, removed=[snapshot(transaction)])
     await db.delete(transaction)
     await db.commit()
+    await response_cache.invalidate(current_user.id, *BALANCE_SCOPES)
     
     return None
 
@@ -302,32 +593,73 @@ async def delete_transaction(
 async def get_transaction_summary(
     date_from: Optional[date] = Query(None, description="Date de début"),
     date_to: Optional[date] = Query(None, description="Date de fin"),
-    db: AsyncSession = Depends(get_db),
+    group_by: Optional[List[SummaryGroupBy]] = Query(
+        None, description="Dimensions de regroupement (bank_account_id, envelope_id, category_id, month)"
+    ),
+    category_id: Optional[int] = Query(None, description="Filtrer par catégorie"),
+    include_descendants: bool = Query(False, description="Inclure les sous-catégories de category_id"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Obtient un résumé des transactions (revenus, dépenses, solde)."""
-    query = select(Transaction).where(Transaction.user_id == current_user.id)
+    """
+    Obtient un résumé des transactions (revenus, dépenses, solde).
+    
+    Les totaux sont calculés en base (SUM/COUNT groupés par type de transaction).
+    Avec `group_by`, la réponse contient aussi une entrée `groups` par combinaison
+    de dimensions, ce qui permet d'alimenter les graphiques en un seul appel.
+    Avec `include_descendants`, le total d'une catégorie inclut ses
+    sous-catégories, quelle que soit leur profondeur.
+    """
+    dimensions = list(dict.fromkeys(group_by or []))
+    dimension_columns = [
+        _summary_dimension(dimension).label(dimension.value)
+        for dimension in dimensions
+    ]
+    
+    query = (
+        select(
+            *dimension_columns,
+            Transaction.transaction_type,
+            func.sum(Transaction.amount).label("total_amount"),
+            func.count(Transaction.id).label("transaction_count")
+        )
+        .where(Transaction.user_id == current_user.id)
+        .group_by(*dimension_columns, Transaction.transaction_type)
+    )
     
     if date_from:
         query = query.where(Transaction.date >= date_from)
     if date_to:
         query = query.where(Transaction.date <= date_to)
+    if category_id is not None:
+        query = query.where(_category_clause(current_user.id, category_id, include_descendants))
     
     result = await db.execute(query)
-    transactions = result.scalars().all()
     
-    total_income = Decimal("0")
-    total_expense = Decimal("0")
-    
-    for transaction in transactions:
-        if transaction.transaction_type == "income":
-            total_income += transaction.amount
-        elif transaction.transaction_type == "expense":
-            total_expense += transaction.amount
-    
-    return {
-        "total_income": float(total_income),
-        "total_expense": float(total_expense),
-        "balance": float(total_income - total_expense),
-        "transaction_count": len(transactions)
-    }
+    totals = empty_summary()
+    groups = {}
+    for row in result:
+        key = tuple(getattr(row, dimension.value) for dimension in dimensions)
+        if key not in groups:
+            groups[key] = empty_summary()
+        for summary in (totals, groups[key]):
+            add_to_summary(summary, row.transaction_type, row.total_amount, row.transaction_count)
+    
+    response = format_summary(totals)
+    if dimensions:
+        response["groups"] = [
+            {
+                **{dimension.value: value for dimension, value in zip(dimensions, key)},
+                **format_summary(summary)
+            }
+            for key, summary in sorted(groups.items(), key=lambda item: summary_sort_key(item[0]))
+        ]
+    
+    return response
+
+
+def _summary_dimension(dimension: SummaryGroupBy):
+    """Retourne l'expression SQL correspondant à une dimension de regroupement."""
+    if dimension == SummaryGroupBy.MONTH:
+        return year_month(Transaction.date)
+    return getattr(Transaction, dimension.value)
@@ -17,20 +17,31 @@ from app.schemas.wish_list import (
     WishListItemCreate, WishListItemUpdate, WishListItemRead,
     WishListType, WishListStatus, ItemStatus
 )
-from app.utils.dependencies import get_current_user
+from app.utils.dependencies import cached_route, get_current_user, get_read_db, resource_etag
+from app.utils.response_cache import RouteCache, cache_scope, response_cache
 
 
 router = APIRouter(prefix="/wish-lists", tags=["wish-lists"])
 
 
+def _detail_scope(wish_list_id: int) -> str:
+    # Réponse en cache d'une wish list avec ses articles
+    return cache_scope("wish_lists.detail", wish_list_id)
+
+
 @router.get("", response_model=List[WishListRead])
 async def list_wish_lists(
     list_type: Optional[WishListType] = Query(None, description="Filtrer par type"),
     status: Optional[WishListStatus] = Query(None, description="Filtrer par statut"),
-    db: AsyncSession = Depends(get_db),
+    etag: str = Depends(resource_etag("wish_lists")),
+    cache: RouteCache = Depends(cached_route("wish_lists.list")),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Liste toutes les wish lists de l'utilisateur."""
+    if cache.hit is not None:
+        return cache.hit
+    
     query = select(WishList).where(WishList.user_id == current_user.id)
     
     if list_type is not None:
@@ -43,7 +54,7 @@ async def list_wish_lists(
     result = await db.execute(query)
     wish_lists = result.scalars().all()
     
-    return wish_lists
+    return await cache.store(List[WishListRead], wish_lists)
 
 
 @router.post("", response_model=WishListRead, status_code=status.HTTP_201_CREATED)
@@ -60,6 +71,7 @@ async def create_wish_list(
     
     db.add(wish_list)
     await db.commit()
+    await response_cache.invalidate(current_user.id, "wish_lists.list")
     await db.refresh(wish_list)
     
     return wish_list
@@ -68,10 +80,14 @@ async def create_wish_list(
 @router.get("/{wish_list_id}", response_model=WishListWithItems)
 async def get_wish_list(
     wish_list_id: int,
-    db: AsyncSession = Depends(get_db),
+    cache: RouteCache = Depends(cached_route("wish_lists.detail", "wish_list_id")),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Récupère une wish list avec tous ses articles."""
+    if cache.hit is not None:
+        return cache.hit
+    
     result = await db.execute(
         select(WishList)
         .options(selectinload(WishList.items))
@@ -108,7 +124,7 @@ async def get_wish_list(
         "remaining_cost": remaining_cost
     }
     
-    return wish_list_dict
+    return await cache.store(WishListWithItems, wish_list_dict)
 
 
 @router.put("/{wish_list_id}", response_model=WishListRead)
@@ -141,6 +157,7 @@ async def update_wish_list(
         setattr(wish_list, key, value)
     
     await db.commit()
+    await response_cache.invalidate(current_user.id, "wish_lists.list", _detail_scope(wish_list_id))
     await db.refresh(wish_list)
     
     return wish_list
@@ -171,6 +188,7 @@ async def delete_wish_list(
     
     await db.delete(wish_list)
     await db.commit()
+    await response_cache.invalidate(current_user.id, "wish_lists.list", _detail_scope(wish_list_id))
     
     return None
 
@@ -213,6 +231,7 @@ async def create_wish_list_item(
     
     db.add(item)
     await db.commit()
+    await response_cache.invalidate(current_user.id, _detail_scope(wish_list_id))
     await db.refresh(item)
     
     return item
@@ -222,7 +241,7 @@ async def create_wish_list_item(
 async def list_wish_list_items(
     wish_list_id: int,
     item_status: Optional[ItemStatus] = Query(None, description="Filtrer par statut"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Liste tous les articles d'une wish list."""
@@ -289,6 +308,7 @@ async def update_wish_list_item(
         setattr(item, key, value)
     
     await db.commit()
+    await response_cache.invalidate(current_user.id, _detail_scope(item.wish_list_id))
     await db.refresh(item)
     
     return item
@@ -322,6 +342,7 @@ async def delete_wish_list_item(
     
     await db.delete(item)
     await db.commit()
+    await response_cache.invalidate(current_user.id, _detail_scope(item.wish_list_id))
     
     return None
 
@@ -359,6 +380,7 @@ async def mark_item_as_purchased(
     item.purchased_date = date.fromisoformat(purchased_date) if purchased_date else date.today()
     
     await db.commit()
+    await response_cache.invalidate(current_user.id, _detail_scope(item.wish_list_id))
     await db.refresh(item)
     
     return item
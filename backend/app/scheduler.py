@@ -0,0 +1,106 @@
+"""
+Tâches planifiées (APScheduler)
+
+Le planificateur tourne dans la boucle d'événements de l'application. Il
+est désactivé par défaut (SCHEDULER_ENABLED) : ne l'activer que dans un seul
+processus (un seul worker uvicorn), les autres tâches lancées en parallèle
+restent sans effet en double mais exécutent le travail pour rien.
+
+Les tâches suivent leur crontab. Avec SCHEDULER_CATCH_UP, chacune est aussi
+lancée une fois au démarrage pour rattraper une échéance manquée pendant un
+arrêt (le report mensuel finance alors le mois courant s'il ne l'est pas).
+"""
+import logging
+from datetime import datetime
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from app.config import Settings
+from app.database import AsyncSessionLocal
+from app.services.balance_ledger import run_checkpoints
+from app.services.balance_snapshots import compact_snapshots
+from app.services.envelope_rollover import run_rollover
+from app.services.recurring_transactions import generate_due_transactions
+
+logger = logging.getLogger(__name__)
+
+
+def create_scheduler(config: Settings) -> AsyncIOScheduler:
+    """Crée le planificateur et y enregistre les tâches (non démarré)."""
+    scheduler = AsyncIOScheduler()
+    # Sans rattrapage, la première exécution est la prochaine échéance du crontab
+    catch_up = {"next_run_time": datetime.now()} if config.SCHEDULER_CATCH_UP else {}
+    scheduler.add_job(
+        envelope_rollover_job,
+        CronTrigger.from_crontab(config.ENVELOPE_ROLLOVER_CRON),
+        args=[config.ROLLOVER_BATCH_SIZE],
+        id="envelope_rollover",
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=None,
+        **catch_up,
+    )
+    scheduler.add_job(
+        recurring_transactions_job,
+        CronTrigger.from_crontab(config.RECURRING_TRANSACTIONS_CRON),
+        args=[config.RECURRING_BATCH_SIZE],
+        id="recurring_transactions",
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=None,
+        **catch_up,
+    )
+    scheduler.add_job(
+        balance_checkpoints_job,
+        CronTrigger.from_crontab(config.BALANCE_CHECKPOINT_CRON),
+        args=[config.CHECKPOINT_BATCH_SIZE],
+        id="balance_checkpoints",
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=None,
+        **catch_up,
+    )
+    scheduler.add_job(
+        balance_snapshots_job,
+        CronTrigger.from_crontab(config.BALANCE_SNAPSHOT_CRON),
+        args=[config.SNAPSHOT_BATCH_SIZE],
+        id="balance_snapshots",
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=None,
+        **catch_up,
+    )
+    return scheduler
+
+
+async def envelope_rollover_job(batch_size: int) -> None:
+    """Report mensuel des enveloppes pour le mois courant."""
+    try:
+        await run_rollover(AsyncSessionLocal, batch_size=batch_size)
+    except Exception:
+        logger.exception("Envelope rollover failed")
+
+
+async def recurring_transactions_job(batch_size: int) -> None:
+    """Création des transactions récurrentes dues jusqu'à aujourd'hui."""
+    try:
+        await generate_due_transactions(AsyncSessionLocal, batch_size=batch_size)
+    except Exception:
+        logger.exception("Recurring transactions generation failed")
+
+
+async def balance_checkpoints_job(batch_size: int) -> None:
+    """Points de contrôle du journal des soldes."""
+    try:
+        await run_checkpoints(AsyncSessionLocal, batch_size=batch_size)
+    except Exception:
+        logger.exception("Balance checkpoints failed")
+
+
+async def balance_snapshots_job(batch_size: int) -> None:
+    """Compaction des snapshots de solde de fin de mois."""
+    try:
+        await compact_snapshots(AsyncSessionLocal, batch_size=batch_size)
+    except Exception:
+        logger.exception("Balance snapshots compaction failed")
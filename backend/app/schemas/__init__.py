@@ -23,25 +23,65 @@ from app.schemas.bank_account import (
     BankAccountUpdate,
     BankAccountAdjustBalance,
     BankAccountRead,
+    BankAccountReconciliation,
 )
 from app.schemas.envelope import (
+    RolloverPolicy,
     EnvelopeBase,
     EnvelopeCreate,
     EnvelopeUpdate,
     EnvelopeReallocate,
+    EnvelopeMove,
+    EnvelopeDistribution,
+    EnvelopeAllocateBatch,
     EnvelopeRead,
     EnvelopeWithStats,
 )
+from app.schemas.balance_movement import (
+    BalanceEntity,
+    MovementKind,
+    BalanceMovementRead,
+)
+from app.schemas.balance_snapshot import BalanceAsOf
 from app.schemas.transaction import (
     TransactionType,
     TransactionPriority,
+    TransactionSort,
+    SummaryGroupBy,
     TransactionBase,
     TransactionCreate,
     TransactionUpdate,
     TransactionRead,
     TransactionWithDetails,
+    TransactionBulkError,
+    TransactionBulkResult,
+    ImportFormat,
+    ImportJobStatus,
+    TransactionImportJobRead,
+    ExportFormat,
     TransactionFilter,
 )
+from app.schemas.recurring_schedule import (
+    RecurringScheduleBase,
+    RecurringScheduleCreate,
+    RecurringScheduleFromTransaction,
+    RecurringScheduleUpdate,
+    RecurringScheduleRead,
+)
+from app.schemas.report import (
+    ReportGroupBy,
+    MonthlyReportRow,
+)
+from app.schemas.dashboard import (
+    DashboardTotals,
+    DashboardAccount,
+    DashboardEnvelope,
+    DashboardCategoryTotal,
+    DashboardMonth,
+    DashboardTransaction,
+    DashboardWishList,
+    DashboardRead,
+)
 from app.schemas.wish_list import (
     WishListType,
     WishListStatus,
@@ -80,22 +120,59 @@ __all__ = [
     "BankAccountUpdate",
     "BankAccountAdjustBalance",
     "BankAccountRead",
+    "BankAccountReconciliation",
     # Envelope
+    "RolloverPolicy",
     "EnvelopeBase",
     "EnvelopeCreate",
     "EnvelopeUpdate",
     "EnvelopeReallocate",
+    "EnvelopeMove",
+    "EnvelopeDistribution",
+    "EnvelopeAllocateBatch",
     "EnvelopeRead",
     "EnvelopeWithStats",
+    # BalanceMovement
+    "BalanceEntity",
+    "MovementKind",
+    "BalanceMovementRead",
+    # BalanceSnapshot
+    "BalanceAsOf",
     # Transaction
     "TransactionType",
     "TransactionPriority",
+    "TransactionSort",
+    "SummaryGroupBy",
     "TransactionBase",
     "TransactionCreate",
     "TransactionUpdate",
     "TransactionRead",
     "TransactionWithDetails",
+    "TransactionBulkError",
+    "TransactionBulkResult",
+    "ImportFormat",
+    "ImportJobStatus",
+    "TransactionImportJobRead",
+    "ExportFormat",
     "TransactionFilter",
+    # RecurringSchedule
+    "RecurringScheduleBase",
+    "RecurringScheduleCreate",
+    "RecurringScheduleFromTransaction",
+    "RecurringScheduleUpdate",
+    "RecurringScheduleRead",
+    # Report
+    "ReportGroupBy",
+    "MonthlyReportRow",
+    # Dashboard
+    "DashboardTotals",
+    "DashboardAccount",
+    "DashboardEnvelope",
+    "DashboardCategoryTotal",
+    "DashboardMonth",
+    "DashboardTransaction",
+    "DashboardWishList",
+    "DashboardRead",
     # WishList
     "WishListType",
     "WishListStatus",
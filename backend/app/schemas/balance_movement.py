@@ -0,0 +1,39 @@
+"""
+Schémas Pydantic pour BalanceMovement
+"""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+from decimal import Decimal
+from enum import Enum
+
+
+class BalanceEntity(str, Enum):
+    """Entité dont le solde est suivi"""
+    BANK_ACCOUNT = "bank_account"
+    ENVELOPE = "envelope"
+
+
+class MovementKind(str, Enum):
+    """Origine d'un mouvement de solde"""
+    OPENING = "opening"  # Solde initial d'un compte
+    TRANSACTION = "transaction"  # Création, modification ou suppression de transactions
+    REALLOCATION = "reallocation"  # Transfert entre deux enveloppes
+    ALLOCATION = "allocation"  # Allocation groupée (allocate-batch)
+    ADJUSTMENT = "adjustment"  # Ajustement manuel du solde
+    RECONCILIATION = "reconciliation"  # Correction par réconciliation
+    ROLLOVER = "rollover"  # Report mensuel des enveloppes
+    CHECKPOINT = "checkpoint"  # Point de contrôle périodique (solde courant)
+
+
+# Schéma pour la lecture
+class BalanceMovementRead(BaseModel):
+    """Mouvement de l'historique, avec le solde après le mouvement"""
+    id: int
+    entity_type: BalanceEntity
+    entity_id: int
+    kind: MovementKind
+    amount: Decimal
+    balance_after: Decimal
+    description: Optional[str] = None
+    created_at: datetime
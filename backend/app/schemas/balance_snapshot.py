@@ -0,0 +1,19 @@
+"""
+Schémas Pydantic pour les soldes à date (BalanceSnapshot)
+"""
+from pydantic import BaseModel
+from datetime import date
+from typing import Optional
+from decimal import Decimal
+
+from app.schemas.balance_movement import BalanceEntity
+
+
+# Schéma pour la lecture
+class BalanceAsOf(BaseModel):
+    """Solde d'un compte ou d'une enveloppe à la fin d'une journée"""
+    entity_type: BalanceEntity
+    entity_id: int
+    as_of: date
+    balance: Decimal
+    snapshot_date: Optional[date] = None  # Snapshot de départ (None : calculé depuis le solde courant)
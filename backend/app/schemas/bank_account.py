@@ -52,3 +52,14 @@ class BankAccountRead(BankAccountBase):
     updated_at: Optional[datetime] = None
     
     model_config = ConfigDict(from_attributes=True)
+
+
+# Schéma du rapport de réconciliation
+class BankAccountReconciliation(BaseModel):
+    """Comparaison entre le solde matérialisé et le solde recalculé"""
+    account_id: int
+    recorded_balance: Decimal = Field(description="Solde matérialisé (current_balance)")
+    computed_balance: Decimal = Field(description="Solde initial + somme des transactions")
+    drift: Decimal = Field(description="Écart: recorded_balance - computed_balance")
+    transaction_count: int
+    applied: bool = Field(description="Le solde recalculé a été appliqué")
@@ -45,7 +45,7 @@ class CategoryRead(CategoryBase):
 
 # Schéma avec sous-catégories (nested)
 class CategoryWithChildren(CategoryRead):
-    """Schéma avec la liste des sous-catégories"""
-    children: List['CategoryRead'] = []
+    """Schéma avec la liste des sous-catégories (imbriquées sur tous les niveaux)"""
+    children: List['CategoryWithChildren'] = []
     
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,88 @@
+"""
+Schémas Pydantic pour le tableau de bord
+"""
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import List, Optional
+from decimal import Decimal
+
+
+class DashboardTotals(BaseModel):
+    """Chiffres clés du tableau de bord"""
+    total_balance: Decimal = Field(description="Somme des soldes des comptes actifs")
+    account_count: int
+    active_envelopes: int
+    envelope_balance: Decimal = Field(description="Somme des soldes des enveloppes actives")
+    wish_list_count: int
+
+
+class DashboardAccount(BaseModel):
+    """Solde d'un compte bancaire"""
+    id: int
+    name: str
+    account_type: str
+    current_balance: Decimal
+    currency: str
+
+
+class DashboardEnvelope(BaseModel):
+    """Remplissage d'une enveloppe"""
+    id: int
+    name: str
+    bank_account_id: int
+    monthly_budget: Decimal
+    current_balance: Decimal
+    fill_percent: float = Field(description="Solde / budget mensuel, en pourcentage")
+    color: Optional[str] = None
+
+
+class DashboardCategoryTotal(BaseModel):
+    """Totaux du mois pour une catégorie"""
+    category_id: int
+    name: Optional[str] = None
+    total_income: float
+    total_expense: float
+
+
+class DashboardMonth(BaseModel):
+    """Résumé du mois"""
+    year_month: str = Field(description="Mois au format YYYY-MM")
+    total_income: float
+    total_expense: float
+    balance: float
+    transaction_count: int
+    categories: List[DashboardCategoryTotal] = []
+
+
+class DashboardTransaction(BaseModel):
+    """Transaction récente"""
+    id: int
+    date: date
+    amount: Decimal
+    transaction_type: str
+    description: Optional[str] = None
+    payee: Optional[str] = None
+    category_name: Optional[str] = None
+
+
+class DashboardWishList(BaseModel):
+    """Avancement d'une liste de souhaits"""
+    id: int
+    name: str
+    status: str
+    total_items: int
+    purchased_items: int
+    total_cost: Decimal
+    purchased_cost: Decimal
+    completion_percent: float
+
+
+class DashboardRead(BaseModel):
+    """Données du tableau de bord"""
+    email: str
+    totals: DashboardTotals
+    accounts: List[DashboardAccount]
+    envelopes: List[DashboardEnvelope]
+    month: DashboardMonth
+    recent_transactions: List[DashboardTransaction]
+    wish_lists: List[DashboardWishList]
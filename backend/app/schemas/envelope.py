@@ -3,8 +3,15 @@ Schémas Pydantic pour Envelope
 """
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
+from enum import Enum
+
+
+class RolloverPolicy(str, Enum):
+    """Application du budget mensuel au solde de l'enveloppe"""
+    CARRY_OVER = "carry_over"  # Le reste du mois précédent est conservé
+    RESET = "reset"  # Le solde repart du budget mensuel
 
 
 # Schéma de base
@@ -14,6 +21,7 @@ class EnvelopeBase(BaseModel):
     bank_account_id: int
     category_id: Optional[int] = None
     monthly_budget: Decimal = Field(..., ge=0, decimal_places=2, description="Budget mensuel alloué")
+    rollover_policy: RolloverPolicy = Field(RolloverPolicy.CARRY_OVER, description="Report du solde en début de mois")
     color: Optional[str] = Field(None, pattern="^#[0-9A-Fa-f]{6}$")
     icon: Optional[str] = Field(None, max_length=50)
     is_active: bool = True
@@ -32,6 +40,7 @@ class EnvelopeUpdate(BaseModel):
     bank_account_id: Optional[int] = None
     category_id: Optional[int] = None
     monthly_budget: Optional[Decimal] = Field(None, ge=0, decimal_places=2)
+    rollover_policy: Optional[RolloverPolicy] = None
     color: Optional[str] = Field(None, pattern="^#[0-9A-Fa-f]{6}$")
     icon: Optional[str] = Field(None, max_length=50)
     is_active: Optional[bool] = None
@@ -46,6 +55,30 @@ class EnvelopeReallocate(BaseModel):
     description: Optional[str] = Field(None, max_length=255)
 
 
+# Schémas pour les allocations groupées
+class EnvelopeMove(BaseModel):
+    """Transfert d'un montant d'une enveloppe à une autre"""
+    from_envelope_id: int
+    to_envelope_id: int
+    amount: Decimal = Field(..., gt=0, decimal_places=2)
+
+
+class EnvelopeDistribution(BaseModel):
+    """Répartition d'un montant entre les enveloppes actives, au prorata du budget mensuel"""
+    amount: Decimal = Field(..., gt=0, decimal_places=2)
+    bank_account_id: Optional[int] = Field(None, description="Limiter aux enveloppes de ce compte")
+    from_envelope_id: Optional[int] = Field(
+        None, description="Enveloppe débitée du montant (par défaut : revenu non encore alloué)"
+    )
+
+
+class EnvelopeAllocateBatch(BaseModel):
+    """Transferts et/ou répartition appliqués en une seule transaction"""
+    moves: List[EnvelopeMove] = Field(default_factory=list, max_length=500)
+    distribute: Optional[EnvelopeDistribution] = None
+    description: Optional[str] = Field(None, max_length=255)
+
+
 # Schéma pour la lecture
 class EnvelopeRead(EnvelopeBase):
     """Schéma pour lire une enveloppe"""
@@ -0,0 +1,76 @@
+"""
+Schémas Pydantic pour RecurringSchedule
+"""
+from pydantic import AfterValidator, BaseModel, Field, ConfigDict
+from datetime import date, datetime
+from typing import Annotated, Optional
+from decimal import Decimal
+
+from app.schemas.transaction import TransactionType, TransactionPriority
+from app.utils.recurrence import normalize_rule
+
+
+# Règle RRULE validée et mise sous forme canonique
+RecurrenceRule = Annotated[
+    str,
+    Field(
+        max_length=255,
+        description="Règle de récurrence RRULE (FREQ, INTERVAL, COUNT, UNTIL, BYDAY, BYMONTHDAY, BYMONTH)"
+    ),
+    AfterValidator(normalize_rule),
+]
+
+
+# Schéma de base
+class RecurringScheduleBase(BaseModel):
+    """Champs de base d'un échéancier de transaction récurrente"""
+    bank_account_id: int
+    envelope_id: Optional[int] = None
+    category_id: int
+    amount: Decimal = Field(..., decimal_places=2, description="Montant de chaque occurrence")
+    transaction_type: TransactionType
+    description: Optional[str] = Field(None, max_length=255)
+    payee: Optional[str] = Field(None, max_length=100)
+    priority: Optional[TransactionPriority] = None
+    rrule: RecurrenceRule
+    start_date: date = Field(description="Date de la première occurrence possible")
+    is_active: bool = True
+
+
+# Schéma pour la création
+class RecurringScheduleCreate(RecurringScheduleBase):
+    """Schéma pour créer un échéancier"""
+    pass
+
+
+# Schéma pour créer un échéancier à partir d'une transaction existante
+class RecurringScheduleFromTransaction(BaseModel):
+    """Règle appliquée à une transaction modèle (la transaction est la première occurrence)"""
+    rrule: RecurrenceRule
+
+
+# Schéma pour la mise à jour
+class RecurringScheduleUpdate(BaseModel):
+    """Schéma pour mettre à jour un échéancier"""
+    envelope_id: Optional[int] = None
+    category_id: Optional[int] = None
+    amount: Optional[Decimal] = Field(None, decimal_places=2)
+    description: Optional[str] = Field(None, max_length=255)
+    payee: Optional[str] = Field(None, max_length=100)
+    priority: Optional[TransactionPriority] = None
+    rrule: Optional[RecurrenceRule] = None
+    start_date: Optional[date] = None
+    is_active: Optional[bool] = None
+
+
+# Schéma pour la lecture
+class RecurringScheduleRead(RecurringScheduleBase):
+    """Schéma pour lire un échéancier"""
+    id: int
+    user_id: int
+    next_occurrence: Optional[date] = None
+    last_occurrence: Optional[date] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,25 @@
+"""
+Schémas Pydantic pour les rapports
+"""
+from pydantic import BaseModel, Field
+from typing import Optional
+from enum import Enum
+
+
+class ReportGroupBy(str, Enum):
+    """Dimensions de regroupement des rapports mensuels (en plus du mois)"""
+    BANK_ACCOUNT = "bank_account_id"
+    ENVELOPE = "envelope_id"
+    CATEGORY = "category_id"
+
+
+class MonthlyReportRow(BaseModel):
+    """Totaux d'un mois (et des dimensions demandées)"""
+    year_month: str = Field(description="Mois au format YYYY-MM")
+    bank_account_id: Optional[int] = None
+    envelope_id: Optional[int] = None
+    category_id: Optional[int] = None
+    total_income: float
+    total_expense: float
+    balance: float
+    transaction_count: int
@@ -3,7 +3,7 @@ Schémas Pydantic pour Transaction
 """
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 from enum import Enum
 
@@ -24,6 +24,20 @@ class TransactionPriority(str, Enum):
     PLEASURE = "pleasure"
 
 
+class TransactionSort(str, Enum):
+    """Ordres de tri de la liste des transactions"""
+    DATE = "date"
+    RELEVANCE = "relevance"
+
+
+class SummaryGroupBy(str, Enum):
+    """Dimensions de regroupement du résumé des transactions"""
+    BANK_ACCOUNT = "bank_account_id"
+    ENVELOPE = "envelope_id"
+    CATEGORY = "category_id"
+    MONTH = "month"
+
+
 # Schéma de base
 class TransactionBase(BaseModel):
     """Champs de base pour une transaction"""
@@ -79,12 +93,71 @@ class TransactionWithDetails(TransactionRead):
     envelope_name: Optional[str] = None
 
 
+# Schémas pour l'import en masse
+class TransactionBulkError(BaseModel):
+    """Erreur sur une ligne d'un import en masse"""
+    index: int = Field(description="Position de la ligne dans le lot (à partir de 0)")
+    detail: str
+
+
+class TransactionBulkResult(BaseModel):
+    """Résultat d'un import en masse"""
+    created: int
+    failed: int
+    errors: List[TransactionBulkError] = []
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+# Schémas pour l'import de relevés bancaires
+class ImportFormat(str, Enum):
+    """Formats de relevé supportés"""
+    CSV = "csv"
+    OFX = "ofx"
+
+
+class ImportJobStatus(str, Enum):
+    """États d'un job d'import"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class TransactionImportJobRead(BaseModel):
+    """Avancement d'un job d'import de relevé"""
+    id: str
+    status: ImportJobStatus
+    format: ImportFormat
+    total_bytes: int
+    bytes_read: int
+    progress_percent: float
+    rows_processed: int
+    created: int
+    failed: int
+    rows_per_second: float
+    errors: List[TransactionBulkError] = []
+    detail: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Formats d'export
+class ExportFormat(str, Enum):
+    """Formats d'export des transactions"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 # Schéma pour les filtres de recherche
 class TransactionFilter(BaseModel):
     """Schéma pour filtrer les transactions"""
     bank_account_id: Optional[int] = None
     envelope_id: Optional[int] = None
     category_id: Optional[int] = None
+    include_descendants: bool = Field(False, description="Inclure les sous-catégories de category_id")
     transaction_type: Optional[TransactionType] = None
     priority: Optional[TransactionPriority] = None
     date_from: Optional[date] = None
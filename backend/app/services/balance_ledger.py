@@ -0,0 +1,343 @@
+"""
+Journal des mouvements de solde (table balance_movements)
+
+Chaque écriture de solde ajoute, dans la même transaction SQL, un mouvement
+signé par compte ou enveloppe touché (agrégé par écriture : un import de
+1000 transactions sur un compte produit un seul mouvement par lot). Le
+journal n'est jamais modifié : il permet d'auditer un écart et de
+reconstruire les soldes.
+
+Des points de contrôle périodiques enregistrent le solde courant des entités
+ayant bougé depuis le précédent. Le solde à une position de l'historique se
+calcule à partir du dernier point de contrôle antérieur : la somme ne porte
+que sur une période, quelle que soit l'ancienneté du compte.
+
+Points de contrôle exécutés par le planificateur (app/scheduler.py) ou à la main :
+
+    python -m app.services.balance_ledger [--batch-size N]
+"""
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, exists, func, insert, literal, or_, select
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.balance_movement import BalanceMovement
+from app.models.bank_account import BankAccount
+from app.models.envelope import Envelope
+from app.schemas.balance_movement import BalanceEntity, BalanceMovementRead, MovementKind
+
+logger = logging.getLogger(__name__)
+
+# Entité suivie -> modèle portant current_balance
+ENTITY_MODELS = (
+    (BalanceEntity.BANK_ACCOUNT, BankAccount),
+    (BalanceEntity.ENVELOPE, Envelope),
+)
+
+
+def movement(
+    user_id: int,
+    entity_type: BalanceEntity,
+    entity_id: int,
+    amount: Decimal,
+    kind: MovementKind,
+    balance: Optional[Decimal] = None,
+    description: Optional[str] = None
+) -> Dict:
+    """Ligne de balance_movements (voir record_movements)."""
+    return {
+        "user_id": user_id,
+        "entity_type": entity_type.value,
+        "entity_id": entity_id,
+        "kind": kind.value,
+        "amount": amount,
+        "balance": balance,
+        "description": description,
+    }
+
+
+async def record_movements(db: AsyncSession, movements: Iterable[Dict]) -> None:
+    """
+    Ajoute des mouvements au journal (session non commitée)
+
+    Les deltas nuls sans solde connu sont ignorés.
+    """
+    rows = [row for row in movements if row["amount"] or row["balance"] is not None]
+    if rows:
+        await db.execute(insert(BalanceMovement), rows)
+
+
+def entity_movements(entity_type: BalanceEntity, entity_id: int):
+    """Filtre sur les mouvements d'une entité."""
+    return and_(
+        BalanceMovement.entity_type == entity_type.value,
+        BalanceMovement.entity_id == entity_id
+    )
+
+
+async def movements_total(
+    db: AsyncSession,
+    user_id: int,
+    entity_type: BalanceEntity,
+    entity_id: int,
+    kinds: Iterable[MovementKind]
+) -> Decimal:
+    """Somme des mouvements d'une entité pour certaines origines."""
+    result = await db.execute(
+        select(func.coalesce(func.sum(BalanceMovement.amount), 0)).where(
+            BalanceMovement.user_id == user_id,
+            entity_movements(entity_type, entity_id),
+            BalanceMovement.kind.in_([kind.value for kind in kinds])
+        )
+    )
+    return Decimal(str(result.scalar_one()))
+
+
+def _created_at(movement_id: int):
+    return select(BalanceMovement.created_at).where(BalanceMovement.id == movement_id).scalar_subquery()
+
+
+def before_movement(movement_id: int, inclusive: bool = False):
+    """
+    Mouvements antérieurs à un mouvement, dans l'ordre (created_at, id)
+
+    created_at est comparé à la valeur stockée (sous-requête) et non à une
+    valeur repassée par le client : le format stocké dépend de la base.
+    """
+    anchor = _created_at(movement_id)
+    same_time = BalanceMovement.id <= movement_id if inclusive else BalanceMovement.id < movement_id
+    return or_(
+        BalanceMovement.created_at < anchor,
+        and_(BalanceMovement.created_at == anchor, same_time)
+    )
+
+
+def after_movement(movement_id: int):
+    """Mouvements postérieurs à un mouvement, dans l'ordre (created_at, id)."""
+    anchor = _created_at(movement_id)
+    return or_(
+        BalanceMovement.created_at > anchor,
+        and_(BalanceMovement.created_at == anchor, BalanceMovement.id > movement_id)
+    )
+
+
+async def balance_after(
+    db: AsyncSession,
+    user_id: int,
+    entity_type: BalanceEntity,
+    entity_id: int,
+    movement_id: int
+) -> Decimal:
+    """
+    Solde d'une entité juste après un mouvement de son historique
+
+    Dernier point de contrôle jusqu'au mouvement inclus, plus la somme des
+    mouvements qui le suivent : au plus une période de mouvements est lue.
+    """
+    entity = and_(BalanceMovement.user_id == user_id, entity_movements(entity_type, entity_id))
+    until = before_movement(movement_id, inclusive=True)
+
+    checkpoint = (await db.execute(
+        select(BalanceMovement.id, BalanceMovement.balance)
+        .where(entity, until, BalanceMovement.kind == MovementKind.CHECKPOINT.value)
+        .order_by(BalanceMovement.created_at.desc(), BalanceMovement.id.desc())
+        .limit(1)
+    )).first()
+
+    query = select(func.coalesce(func.sum(BalanceMovement.amount), 0)).where(
+        entity, until, BalanceMovement.kind != MovementKind.CHECKPOINT.value
+    )
+    base = Decimal("0")
+    if checkpoint is not None:
+        base = Decimal(str(checkpoint.balance))
+        query = query.where(after_movement(checkpoint.id))
+    total = (await db.execute(query)).scalar_one()
+    return base + Decimal(str(total))
+
+
+async def with_running_balance(
+    db: AsyncSession,
+    user_id: int,
+    entity_type: BalanceEntity,
+    entity_id: int,
+    movements: List[BalanceMovement]
+) -> List[Tuple[BalanceMovement, Decimal]]:
+    """
+    Associe à chaque mouvement (du plus récent au plus ancien) le solde après celui-ci
+
+    Un calcul depuis un point de contrôle pour le premier mouvement de la page,
+    puis les soldes précédents se déduisent des montants. Un point de contrôle
+    peut absorber un écart hors journal : le mouvement qui le précède repart
+    du point de contrôle antérieur.
+    """
+    rows = []
+    balance = None
+    for row in movements:
+        if row.kind == MovementKind.CHECKPOINT.value:
+            balance = Decimal(str(row.balance))
+        elif balance is None:
+            balance = await balance_after(db, user_id, entity_type, entity_id, row.id)
+        rows.append((row, balance))
+        balance = None if row.kind == MovementKind.CHECKPOINT.value else balance - Decimal(str(row.amount))
+    return rows
+
+
+async def history_page(
+    db: AsyncSession,
+    user_id: int,
+    entity_type: BalanceEntity,
+    entity_id: int,
+    limit: int,
+    before_id: Optional[int] = None
+) -> List[BalanceMovementRead]:
+    """
+    Page de l'historique d'une entité, du plus récent au plus ancien
+
+    Pagination par clé (created_at, id) sur l'index ix_balance_movements_entity.
+
+    Args:
+        before_id: Dernier mouvement de la page précédente
+    """
+    query = select(BalanceMovement).where(
+        BalanceMovement.user_id == user_id, entity_movements(entity_type, entity_id)
+    )
+    if before_id is not None:
+        query = query.where(before_movement(before_id))
+    query = query.order_by(BalanceMovement.created_at.desc(), BalanceMovement.id.desc()).limit(limit)
+    movements = list((await db.execute(query)).scalars().all())
+
+    return [
+        BalanceMovementRead(
+            id=row.id,
+            entity_type=row.entity_type,
+            entity_id=row.entity_id,
+            kind=row.kind,
+            amount=row.amount,
+            balance_after=balance,
+            description=row.description,
+            created_at=row.created_at,
+        )
+        for row, balance in await with_running_balance(db, user_id, entity_type, entity_id, movements)
+    ]
+
+
+# === Points de contrôle ===
+
+@dataclass
+class CheckpointResult:
+    """Bilan d'une exécution des points de contrôle"""
+    users: int = 0
+    checkpoints: int = 0
+    batches: int = 0
+
+
+async def checkpoint_user_ids(db: AsyncSession, after_user_id: int, limit: int) -> List[int]:
+    """Utilisateurs suivants possédant au moins un compte."""
+    result = await db.execute(
+        select(BankAccount.user_id)
+        .where(BankAccount.user_id > after_user_id)
+        .group_by(BankAccount.user_id)
+        .order_by(BankAccount.user_id)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def write_checkpoints(db: AsyncSession, user_ids: List[int]) -> int:
+    """
+    Enregistre le solde courant des entités ayant bougé depuis leur dernier point de contrôle
+
+    Un INSERT ... SELECT par type d'entité (session non commitée).
+
+    Returns:
+        Nombre de points de contrôle écrits
+    """
+    count = 0
+    for entity_type, model in ENTITY_MODELS:
+        previous = aliased(BalanceMovement)
+        last_checkpoint = (
+            select(func.max(previous.id))
+            .where(
+                previous.user_id == model.user_id,
+                previous.entity_type == entity_type.value,
+                previous.entity_id == model.id,
+                previous.kind == MovementKind.CHECKPOINT.value
+            )
+            .scalar_subquery()
+        )
+        moved = exists().where(
+            BalanceMovement.user_id == model.user_id,
+            BalanceMovement.entity_type == entity_type.value,
+            BalanceMovement.entity_id == model.id,
+            BalanceMovement.kind != MovementKind.CHECKPOINT.value,
+            BalanceMovement.id > func.coalesce(last_checkpoint, 0)
+        )
+        result = await db.execute(
+            insert(BalanceMovement).from_select(
+                ["user_id", "entity_type", "entity_id", "kind", "amount", "balance"],
+                select(
+                    model.user_id,
+                    literal(entity_type.value),
+                    model.id,
+                    literal(MovementKind.CHECKPOINT.value),
+                    literal(0),
+                    model.current_balance
+                )
+                .where(model.user_id.in_(user_ids), moved)
+            )
+        )
+        count += result.rowcount
+    return count
+
+
+async def run_checkpoints(session_factory: async_sessionmaker, batch_size: int = 1000) -> CheckpointResult:
+    """
+    Écrit les points de contrôle de tous les utilisateurs
+
+    Args:
+        session_factory: Fabrique de sessions (une transaction par lot)
+        batch_size: Utilisateurs par lot
+    """
+    outcome = CheckpointResult()
+    after_user_id = 0
+    while True:
+        async with session_factory() as session:
+            user_ids = await checkpoint_user_ids(session, after_user_id, batch_size)
+            if not user_ids:
+                break
+            checkpoints = await write_checkpoints(session, user_ids)
+            await session.commit()
+
+        after_user_id = user_ids[-1]
+        outcome.users += len(user_ids)
+        outcome.checkpoints += checkpoints
+        outcome.batches += 1
+
+    logger.info(
+        "Balance checkpoints: %d checkpoints for %d users in %d batches",
+        outcome.checkpoints, outcome.users, outcome.batches
+    )
+    return outcome
+
+
+async def _run(batch_size: int) -> None:
+    from app.database import AsyncSessionLocal, engine
+
+    outcome = await run_checkpoints(AsyncSessionLocal, batch_size)
+    await engine.dispose()
+    print(f"{outcome.checkpoints} points de contrôle pour {outcome.users} utilisateurs")
+
+
+if __name__ == "__main__":
+    from app.config import get_settings
+
+    parser = argparse.ArgumentParser(description="Écrit les points de contrôle du journal des soldes")
+    parser.add_argument("--batch-size", type=int, default=get_settings().CHECKPOINT_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(_run(args.batch_size))
@@ -0,0 +1,393 @@
+"""
+Soldes à date (table balance_snapshots)
+
+Le solde d'un compte ou d'une enveloppe à la fin d'une journée se calcule
+depuis le snapshot de fin de mois le plus proche, plus les mouvements
+intermédiaires :
+- transactions, par date métier (plage sur la date, index ix_transactions_date) ;
+- autres mouvements du journal (réallocations, ajustements, report...), par
+  date d'enregistrement.
+
+La compaction écrit, pour chaque entité, un snapshot par mois écoulé : une
+requête ne relit jamais plus d'une période de mouvements. Le premier
+snapshot d'une entité est ancré sur son solde courant (solde courant moins
+les mouvements postérieurs), puis la série est prolongée mois par mois.
+Une transaction écrite à une date déjà couverte supprime les snapshots à
+partir de cette date (voir transaction_effects.invalidate_snapshots) ; le
+passage suivant les recalcule.
+
+Compaction exécutée par le planificateur (app/scheduler.py) ou à la main :
+
+    python -m app.services.balance_snapshots [--date YYYY-MM-DD] [--batch-size N]
+"""
+import argparse
+import asyncio
+import calendar
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.balance_movement import BalanceMovement
+from app.models.balance_snapshot import BalanceSnapshot
+from app.models.bank_account import BankAccount
+from app.models.envelope import Envelope
+from app.models.transaction import Transaction
+from app.schemas.balance_movement import BalanceEntity, MovementKind
+from app.schemas.balance_snapshot import BalanceAsOf
+from app.services.balance_ledger import checkpoint_user_ids, entity_movements
+from app.services.transaction_effects import SIGNED_AMOUNT
+from app.utils.sql import year_month
+
+logger = logging.getLogger(__name__)
+
+# Entité suivie -> (modèle portant current_balance, colonne de la transaction)
+ENTITY_COLUMNS = (
+    (BalanceEntity.BANK_ACCOUNT, BankAccount, Transaction.bank_account_id),
+    (BalanceEntity.ENVELOPE, Envelope, Transaction.envelope_id),
+)
+
+# Mouvements du journal non datés par leur enregistrement : transactions (comptées
+# par date métier), solde initial (antérieur à toute transaction), points de contrôle
+UNDATED_KINDS = (MovementKind.TRANSACTION.value, MovementKind.OPENING.value, MovementKind.CHECKPOINT.value)
+
+def period_end(day: date) -> date:
+    """Dernier jour du mois d'une date."""
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def closed_period_end(today: date) -> date:
+    """
+    Fin du dernier mois compactable
+
+    Un mois n'est compacté qu'à partir du 2 du mois suivant : les mouvements
+    du journal sont datés en UTC, le décalage horaire ne doit pas en faire
+    tomber un dans un mois déjà compacté.
+    """
+    return (today - timedelta(days=1)).replace(day=1) - timedelta(days=1)
+
+
+def _entity_column(entity_type: BalanceEntity):
+    return next(column for kind, _, column in ENTITY_COLUMNS if kind == entity_type)
+
+
+def _entity_model(entity_type: BalanceEntity):
+    return next(model for kind, model, _ in ENTITY_COLUMNS if kind == entity_type)
+
+
+async def balance_delta(
+    db: AsyncSession,
+    user_id: int,
+    entity_type: BalanceEntity,
+    entity_id: int,
+    after: Optional[date] = None,
+    until: Optional[date] = None
+) -> Decimal:
+    """
+    Somme des mouvements d'une entité datés dans ]after, until]
+
+    Transactions par date métier, autres mouvements du journal par date
+    d'enregistrement. Une borne absente n'est pas appliquée.
+    """
+    column = _entity_column(entity_type)
+    transactions = select(func.coalesce(func.sum(SIGNED_AMOUNT), 0)).where(
+        Transaction.user_id == user_id, column == entity_id
+    )
+    recorded = func.date(BalanceMovement.created_at)
+    movements = select(func.coalesce(func.sum(BalanceMovement.amount), 0)).where(
+        BalanceMovement.user_id == user_id,
+        entity_movements(entity_type, entity_id),
+        BalanceMovement.kind.not_in(UNDATED_KINDS)
+    )
+    if after is not None:
+        transactions = transactions.where(Transaction.date > after)
+        movements = movements.where(recorded > after)
+    if until is not None:
+        transactions = transactions.where(Transaction.date <= until)
+        movements = movements.where(recorded <= until)
+
+    total = Decimal("0")
+    for query in (transactions, movements):
+        total += Decimal(str((await db.execute(query)).scalar_one()))
+    return total
+
+
+async def balance_as_of(
+    db: AsyncSession,
+    user_id: int,
+    entity_type: BalanceEntity,
+    entity_id: int,
+    as_of: date
+) -> BalanceAsOf:
+    """
+    Solde d'une entité à la fin d'une journée
+
+    Part du dernier snapshot antérieur (plus les mouvements depuis), à défaut
+    du premier snapshot postérieur (moins les mouvements jusqu'à lui), et en
+    dernier recours du solde courant (entité pas encore compactée).
+    """
+    snapshots = select(BalanceSnapshot.snapshot_date, BalanceSnapshot.balance).where(
+        BalanceSnapshot.user_id == user_id,
+        BalanceSnapshot.entity_type == entity_type.value,
+        BalanceSnapshot.entity_id == entity_id
+    )
+    before = (await db.execute(
+        snapshots.where(BalanceSnapshot.snapshot_date <= as_of)
+        .order_by(BalanceSnapshot.snapshot_date.desc())
+        .limit(1)
+    )).first()
+    if before is not None:
+        balance = Decimal(str(before.balance)) + await balance_delta(
+            db, user_id, entity_type, entity_id, before.snapshot_date, as_of
+        )
+        return BalanceAsOf(
+            entity_type=entity_type, entity_id=entity_id, as_of=as_of,
+            balance=balance, snapshot_date=before.snapshot_date
+        )
+
+    after = (await db.execute(
+        snapshots.where(BalanceSnapshot.snapshot_date > as_of)
+        .order_by(BalanceSnapshot.snapshot_date)
+        .limit(1)
+    )).first()
+    if after is not None:
+        reference, until = Decimal(str(after.balance)), after.snapshot_date
+    else:
+        model = _entity_model(entity_type)
+        current = await db.execute(
+            select(model.current_balance).where(model.id == entity_id, model.user_id == user_id)
+        )
+        reference, until = Decimal(str(current.scalar_one())), None
+    balance = reference - await balance_delta(db, user_id, entity_type, entity_id, as_of, until)
+    return BalanceAsOf(
+        entity_type=entity_type, entity_id=entity_id, as_of=as_of,
+        balance=balance, snapshot_date=until
+    )
+
+
+# === Compaction ===
+
+@dataclass
+class SnapshotResult:
+    """Bilan d'une exécution de la compaction"""
+    period_end: date
+    users: int = 0
+    snapshots: int = 0
+    batches: int = 0
+    conflicts: int = 0
+
+
+def _period_ends(first: date, last: date) -> List[date]:
+    """Fins de mois de first à last inclus."""
+    ends = []
+    day = period_end(first)
+    while day <= last:
+        ends.append(day)
+        day = period_end(day + timedelta(days=1))
+    return ends
+
+
+def period_balances(
+    deltas: Dict[str, Decimal],
+    closed: date,
+    current_balance: Decimal,
+    latest: Optional[Tuple[date, Decimal]] = None
+) -> List[Tuple[date, Decimal]]:
+    """
+    Snapshots de fin de mois manquants d'une entité
+
+    Args:
+        deltas: Mouvements par mois (YYYY-MM), au moins ceux postérieurs au dernier snapshot
+        closed: Fin du dernier mois à compacter
+        current_balance: Solde courant (ancre d'une entité sans snapshot)
+        latest: Dernier snapshot existant (date, solde)
+
+    Returns:
+        (date, solde) par fin de mois, dans l'ordre chronologique
+    """
+    if latest is not None:
+        balance = latest[1]
+        rows = []
+        for day in _period_ends(latest[0] + timedelta(days=1), closed):
+            balance += deltas.get(day.strftime("%Y-%m"), Decimal("0"))
+            rows.append((day, balance))
+        return rows
+
+    closed_month = closed.strftime("%Y-%m")
+    balance = current_balance - sum(
+        (delta for month, delta in deltas.items() if month > closed_month), Decimal("0")
+    )
+    months = [month for month in deltas if month <= closed_month]
+    first = date.fromisoformat(f"{min(months)}-01") if months else closed
+    rows = []
+    for day in reversed(_period_ends(first, closed)):
+        rows.append((day, balance))
+        balance -= deltas.get(day.strftime("%Y-%m"), Decimal("0"))
+    return rows[::-1]
+
+
+async def monthly_deltas(
+    db: AsyncSession,
+    user_ids: List[int],
+    entity_type: BalanceEntity,
+    after: Optional[date]
+) -> Dict[int, Dict[str, Decimal]]:
+    """Mouvements par entité et par mois (YYYY-MM), datés après `after`."""
+    column = _entity_column(entity_type)
+    month = year_month(Transaction.date)
+    transactions = (
+        select(column, month, func.sum(SIGNED_AMOUNT))
+        .where(Transaction.user_id.in_(user_ids), column.is_not(None))
+        .group_by(column, month)
+    )
+    month = year_month(BalanceMovement.created_at)
+    movements = (
+        select(BalanceMovement.entity_id, month, func.sum(BalanceMovement.amount))
+        .where(
+            BalanceMovement.user_id.in_(user_ids),
+            BalanceMovement.entity_type == entity_type.value,
+            BalanceMovement.kind.not_in(UNDATED_KINDS)
+        )
+        .group_by(BalanceMovement.entity_id, month)
+    )
+    if after is not None:
+        transactions = transactions.where(Transaction.date > after)
+        movements = movements.where(func.date(BalanceMovement.created_at) > after)
+
+    deltas: Dict[int, Dict[str, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+    for query in (transactions, movements):
+        for entity_id, month, amount in (await db.execute(query)).all():
+            deltas[entity_id][month] += Decimal(str(amount))
+    return deltas
+
+
+async def write_snapshots(db: AsyncSession, user_ids: List[int], closed: date) -> int:
+    """
+    Complète jusqu'à `closed` les snapshots des comptes et enveloppes d'un lot (session non commitée)
+
+    Returns:
+        Nombre de snapshots écrits
+    """
+    rows = []
+    for entity_type, model, _ in ENTITY_COLUMNS:
+        entities = (await db.execute(
+            select(model.id, model.user_id, model.current_balance).where(model.user_id.in_(user_ids))
+        )).all()
+
+        previous = aliased(BalanceSnapshot)
+        latest_date = (
+            select(func.max(previous.snapshot_date))
+            .where(
+                previous.user_id == BalanceSnapshot.user_id,
+                previous.entity_type == BalanceSnapshot.entity_type,
+                previous.entity_id == BalanceSnapshot.entity_id
+            )
+            .scalar_subquery()
+        )
+        latest = {
+            entity_id: (snapshot_date, Decimal(str(balance)))
+            for entity_id, snapshot_date, balance in (await db.execute(
+                select(BalanceSnapshot.entity_id, BalanceSnapshot.snapshot_date, BalanceSnapshot.balance)
+                .where(
+                    BalanceSnapshot.user_id.in_(user_ids),
+                    BalanceSnapshot.entity_type == entity_type.value,
+                    BalanceSnapshot.snapshot_date == latest_date
+                )
+            )).all()
+        }
+
+        pending = [row for row in entities if row.id not in latest or latest[row.id][0] < closed]
+        if not pending:
+            continue
+        # Entité sans snapshot : tout l'historique est nécessaire à l'ancrage
+        after = None if any(row.id not in latest for row in pending) else min(
+            latest[row.id][0] for row in pending
+        )
+        deltas = await monthly_deltas(db, user_ids, entity_type, after)
+
+        for row in pending:
+            for snapshot_date, balance in period_balances(
+                deltas.get(row.id, {}), closed, Decimal(str(row.current_balance)), latest.get(row.id)
+            ):
+                rows.append({
+                    "user_id": row.user_id,
+                    "entity_type": entity_type.value,
+                    "entity_id": row.id,
+                    "snapshot_date": snapshot_date,
+                    "balance": balance,
+                })
+
+    if rows:
+        await db.execute(insert(BalanceSnapshot), rows)
+    return len(rows)
+
+
+async def compact_snapshots(
+    session_factory: async_sessionmaker,
+    today: Optional[date] = None,
+    batch_size: int = 1000
+) -> SnapshotResult:
+    """
+    Écrit les snapshots de fin de mois manquants de tous les utilisateurs
+
+    Args:
+        session_factory: Fabrique de sessions (une transaction par lot)
+        today: Date de référence (défaut : aujourd'hui)
+        batch_size: Utilisateurs par lot
+    """
+    outcome = SnapshotResult(period_end=closed_period_end(today or date.today()))
+    after_user_id = 0
+    retried = False
+    while True:
+        async with session_factory() as session:
+            user_ids = await checkpoint_user_ids(session, after_user_id, batch_size)
+            if not user_ids:
+                break
+            try:
+                snapshots = await write_snapshots(session, user_ids, outcome.period_end)
+                await session.commit()
+            except IntegrityError:
+                # Lot compacté en parallèle (autre worker) : recalculer une fois le lot
+                await session.rollback()
+                if retried:
+                    raise
+                retried = True
+                outcome.conflicts += 1
+                continue
+
+        retried = False
+        after_user_id = user_ids[-1]
+        outcome.users += len(user_ids)
+        outcome.snapshots += snapshots
+        outcome.batches += 1
+
+    logger.info(
+        "Balance snapshots up to %s: %d snapshots for %d users in %d batches",
+        outcome.period_end, outcome.snapshots, outcome.users, outcome.batches
+    )
+    return outcome
+
+
+async def _run(today: Optional[date], batch_size: int) -> None:
+    from app.database import AsyncSessionLocal, engine
+
+    outcome = await compact_snapshots(AsyncSessionLocal, today, batch_size)
+    await engine.dispose()
+    print(f"Jusqu'au {outcome.period_end} : {outcome.snapshots} snapshots pour {outcome.users} utilisateurs")
+
+
+if __name__ == "__main__":
+    from app.config import get_settings
+
+    parser = argparse.ArgumentParser(description="Écrit les snapshots de solde de fin de mois")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="Date de référence (YYYY-MM-DD)")
+    parser.add_argument("--batch-size", type=int, default=get_settings().SNAPSHOT_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(_run(args.date, args.batch_size))
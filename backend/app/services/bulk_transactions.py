@@ -0,0 +1,167 @@
+"""
+Insertion en masse de transactions avec validation par lots
+"""
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.bank_account import BankAccount
+from app.models.category import Category
+from app.models.envelope import Envelope
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionCreate, TransactionBulkError, TransactionBulkResult
+from app.services.transaction_effects import apply_transaction_effects, snapshot
+
+
+# Entités référencées par une transaction : (champ, modèle, message d'erreur)
+_REFERENCES = (
+    ("bank_account_id", BankAccount, "Bank account not found"),
+    ("category_id", Category, "Category not found"),
+    ("envelope_id", Envelope, "Envelope not found"),
+)
+
+
+async def missing_reference(db: AsyncSession, user_id: int, **ids: Optional[int]) -> Optional[str]:
+    """
+    Vérifie que les comptes, catégories et enveloppes donnés appartiennent à l'utilisateur
+
+    Args:
+        ids: IDs par champ (bank_account_id, category_id, envelope_id), None ignoré
+
+    Returns:
+        Message d'erreur de la première référence introuvable, ou None
+    """
+    for field, model, detail in _REFERENCES:
+        value = ids.get(field)
+        if value is None:
+            continue
+        result = await db.execute(select(model.id).where(model.id == value, model.user_id == user_id))
+        if result.scalar_one_or_none() is None:
+            return detail
+    return None
+
+
+class TransactionBulkInserter:
+    """
+    Accumule des lignes brutes et les insère par lots
+
+    Pour chaque lot :
+    - chaque ligne est validée avec TransactionCreate
+    - l'appartenance des comptes, catégories et enveloppes est vérifiée avec une
+      seule requête IN par type d'entité (les IDs déjà vérifiés ne sont pas
+      redemandés)
+    - les lignes valides sont insérées en un seul executemany et leurs effets
+      sur les soldes sont appliqués de façon agrégée
+
+    Rien n'est commité : l'appelant décide de la portée de la transaction SQL.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        chunk_size: int = 1000,
+        max_errors: Optional[int] = None
+    ):
+        self.db = db
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.created = 0
+        self.failed = 0
+        self.errors: List[TransactionBulkError] = []
+        self._pending: List[Tuple[int, Any]] = []
+        self._owned_ids: Dict[str, Set[int]] = {field: set() for field, _, _ in _REFERENCES}
+        self._started_at = time.perf_counter()
+
+    async def add(self, index: int, raw: Any) -> None:
+        """Ajoute une ligne brute (dict ou TransactionCreate), insère le lot s'il est plein."""
+        self._pending.append((index, raw))
+        if len(self._pending) >= self.chunk_size:
+            await self.flush()
+
+    def add_error(self, index: int, detail: str) -> None:
+        """Enregistre une ligne rejetée (seules les max_errors premières sont conservées)."""
+        self.failed += 1
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append(TransactionBulkError(index=index, detail=detail))
+
+    async def flush(self) -> None:
+        """Valide et insère les lignes en attente."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        validated: List[Tuple[int, TransactionCreate]] = []
+        for index, raw in pending:
+            try:
+                row = raw if isinstance(raw, TransactionCreate) else TransactionCreate.model_validate(raw)
+            except ValidationError as e:
+                self.add_error(index, _format_validation_error(e))
+                continue
+            validated.append((index, row))
+
+        await self._load_ownership(row for _, row in validated)
+
+        values = []
+        for index, row in validated:
+            detail = self._check_ownership(row)
+            if detail is not None:
+                self.add_error(index, detail)
+                continue
+            values.append({"user_id": self.user_id, **row.model_dump()})
+
+        if not values:
+            return
+
+        await self.db.execute(insert(Transaction), values)
+        await apply_transaction_effects(self.db, added=[snapshot(value) for value in values])
+        self.created += len(values)
+
+    def result(self) -> TransactionBulkResult:
+        """Retourne le bilan de l'import (à appeler après le dernier flush)."""
+        elapsed = time.perf_counter() - self._started_at
+        processed = self.created + self.failed
+        return TransactionBulkResult(
+            created=self.created,
+            failed=self.failed,
+            errors=sorted(self.errors, key=lambda error: error.index),
+            elapsed_seconds=round(elapsed, 4),
+            rows_per_second=round(processed / elapsed, 1) if elapsed > 0 else 0.0
+        )
+
+    async def _load_ownership(self, rows) -> None:
+        requested: Dict[str, Set[int]] = {field: set() for field, _, _ in _REFERENCES}
+        for row in rows:
+            for field, _, _ in _REFERENCES:
+                value = getattr(row, field)
+                if value is not None and value not in self._owned_ids[field]:
+                    requested[field].add(value)
+
+        for field, model, _ in _REFERENCES:
+            if not requested[field]:
+                continue
+            result = await self.db.execute(
+                select(model.id).where(
+                    model.id.in_(requested[field]),
+                    model.user_id == self.user_id
+                )
+            )
+            self._owned_ids[field].update(result.scalars().all())
+
+    def _check_ownership(self, row: TransactionCreate):
+        for field, _, detail in _REFERENCES:
+            value = getattr(row, field)
+            if value is not None and value not in self._owned_ids[field]:
+                return detail
+        return None
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
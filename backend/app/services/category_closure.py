@@ -0,0 +1,208 @@
+"""
+Table de fermeture des catégories (table category_closure)
+
+La table est tenue à jour au flush de chaque session : une catégorie créée
+reçoit ses liens vers elle-même et vers tous ses ancêtres, une catégorie
+déplacée (parent_id modifié) emporte son sous-arbre, une catégorie supprimée
+perd ses liens. Les routes de catégories (création, re-parentage,
+suppression) passent par là, comme toute écriture ORM sur Category.
+
+Elle peut être reconstruite depuis categories.parent_id :
+
+    python -m app.services.category_closure [--user-id ID]
+"""
+import argparse
+import asyncio
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, event, func, insert, inspect, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from app.models.category import Category
+from app.models.category_closure import CategoryClosure
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_closure(session: Session, flush_context) -> None:
+    deleted = [instance.id for instance in session.deleted if isinstance(instance, Category)]
+    moved = []
+    for instance in session.dirty:
+        if isinstance(instance, Category) and inspect(instance).attrs.parent_id.history.has_changes():
+            moved.append(instance)
+    # Les parents sont insérés avant leurs enfants (ids croissants)
+    created = sorted(
+        (instance for instance in session.new if isinstance(instance, Category)),
+        key=lambda instance: instance.id
+    )
+    if not (deleted or moved or created):
+        return
+
+    connection = session.connection()
+    if deleted:
+        connection.execute(delete(CategoryClosure).where(
+            CategoryClosure.ancestor_id.in_(deleted) | CategoryClosure.descendant_id.in_(deleted)
+        ))
+    for category in moved:
+        for statement in move_statements(category.id, category.parent_id):
+            connection.execute(statement)
+    for category in created:
+        for statement in insert_statements(category.id, category.parent_id, category.user_id):
+            connection.execute(statement)
+
+
+def insert_statements(category_id: int, parent_id: Optional[int], user_id: int) -> list:
+    """Liens d'une nouvelle catégorie : elle-même, puis les ancêtres de son parent."""
+    statements = [insert(CategoryClosure).values(
+        ancestor_id=category_id, descendant_id=category_id, depth=0, user_id=user_id
+    )]
+    if parent_id is not None:
+        statements.append(insert(CategoryClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth", "user_id"],
+            select(
+                CategoryClosure.ancestor_id,
+                literal(category_id),
+                CategoryClosure.depth + 1,
+                literal(user_id)
+            ).where(CategoryClosure.descendant_id == parent_id)
+        ))
+    return statements
+
+
+def move_statements(category_id: int, parent_id: Optional[int]) -> list:
+    """Déplace le sous-arbre d'une catégorie sous un nouveau parent (ou à la racine)."""
+    subtree = select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category_id)
+    # Détacher le sous-arbre de ses anciens ancêtres (les liens internes restent)
+    statements = [delete(CategoryClosure).where(
+        CategoryClosure.descendant_id.in_(subtree),
+        CategoryClosure.ancestor_id.not_in(subtree)
+    )]
+    if parent_id is not None:
+        # Produit cartésien : ancêtres du nouveau parent x descendants du sous-arbre
+        above = aliased(CategoryClosure)
+        below = aliased(CategoryClosure)
+        statements.append(insert(CategoryClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth", "user_id"],
+            select(
+                above.ancestor_id,
+                below.descendant_id,
+                above.depth + below.depth + 1,
+                below.user_id
+            )
+            .select_from(above)
+            .join(below, below.ancestor_id == category_id)
+            .where(above.descendant_id == parent_id)
+        ))
+    return statements
+
+
+def subtree_ids(user_id: int, category_id: int):
+    """
+    Sous-requête des ids d'une catégorie et de tous ses descendants
+
+    Usage : query.where(Transaction.category_id.in_(subtree_ids(user_id, category_id)))
+    """
+    return select(CategoryClosure.descendant_id).where(
+        CategoryClosure.ancestor_id == category_id,
+        CategoryClosure.user_id == user_id
+    )
+
+
+async def is_in_subtree(db: AsyncSession, category_id: int, candidate_id: int) -> bool:
+    """Indique si candidate_id est category_id ou l'un de ses descendants."""
+    result = await db.execute(
+        select(CategoryClosure.depth).where(
+            CategoryClosure.ancestor_id == category_id,
+            CategoryClosure.descendant_id == candidate_id
+        )
+    )
+    return result.first() is not None
+
+
+async def count_children(db: AsyncSession, category_id: int) -> int:
+    """Nombre de sous-catégories directes."""
+    result = await db.execute(
+        select(func.count()).where(
+            CategoryClosure.ancestor_id == category_id,
+            CategoryClosure.depth == 1
+        )
+    )
+    return result.scalar_one()
+
+
+async def get_ancestors(db: AsyncSession, user_id: int, category_id: int) -> List[Category]:
+    """
+    Chemin d'une catégorie depuis sa racine (fil d'Ariane)
+
+    Returns:
+        Catégories de la racine à category_id incluse (vide si elle n'existe pas)
+    """
+    result = await db.execute(
+        select(Category)
+        .join(CategoryClosure, CategoryClosure.ancestor_id == Category.id)
+        .where(
+            CategoryClosure.descendant_id == category_id,
+            CategoryClosure.user_id == user_id
+        )
+        .order_by(CategoryClosure.depth.desc())
+    )
+    return list(result.scalars().all())
+
+
+async def rebuild_category_closure(db: AsyncSession, user_id: Optional[int] = None) -> int:
+    """
+    Reconstruit la table de fermeture depuis categories.parent_id
+
+    Un cycle parent_id en base est coupé à la première catégorie déjà visitée.
+
+    Args:
+        db: Session de base de données (non commitée)
+        user_id: Limiter la reconstruction à un utilisateur
+
+    Returns:
+        Nombre de liens créés
+    """
+    clear = delete(CategoryClosure)
+    source = select(Category.id, Category.parent_id, Category.user_id)
+    if user_id is not None:
+        clear = clear.where(CategoryClosure.user_id == user_id)
+        source = source.where(Category.user_id == user_id)
+
+    parents: Dict[int, Optional[int]] = {}
+    owners: Dict[int, int] = {}
+    for row in await db.execute(source):
+        parents[row.id] = row.parent_id
+        owners[row.id] = row.user_id
+
+    rows = []
+    for category_id in parents:
+        ancestor_id, depth, seen = category_id, 0, set()
+        while ancestor_id is not None and ancestor_id in parents and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            rows.append({
+                "ancestor_id": ancestor_id, "descendant_id": category_id,
+                "depth": depth, "user_id": owners[category_id]
+            })
+            ancestor_id, depth = parents[ancestor_id], depth + 1
+
+    await db.execute(clear)
+    if rows:
+        await db.execute(insert(CategoryClosure), rows)
+    return len(rows)
+
+
+async def _rebuild(user_id: Optional[int]) -> None:
+    from app.database import AsyncSessionLocal, engine
+
+    async with AsyncSessionLocal() as session:
+        rows = await rebuild_category_closure(session, user_id)
+        await session.commit()
+    await engine.dispose()
+    print(f"{rows} liens de catégories reconstruits")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconstruit la table de fermeture des catégories")
+    parser.add_argument("--user-id", type=int, default=None, help="Limiter à un utilisateur")
+    args = parser.parse_args()
+    asyncio.run(_rebuild(args.user_id))
@@ -0,0 +1,79 @@
+"""
+Arbre des catégories
+
+Les catégories sont lues en une requête, triées (sort_order, nom), puis
+indexées par parent en un seul passage : chaque nœud est construit une fois,
+sans rescanner la liste (O(n) au lieu de O(n²)) et sans récursion.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from app.models.category import Category
+
+
+def category_node(category: Category) -> dict:
+    """Nœud de l'arbre (dict, pour éviter le lazy loading des relations)."""
+    return {
+        "id": category.id,
+        "name": category.name,
+        "parent_id": category.parent_id,
+        "color": category.color,
+        "icon": category.icon,
+        "is_default": category.is_default,
+        "sort_order": category.sort_order,
+        "user_id": category.user_id,
+        "created_at": category.created_at,
+        "children": [],
+    }
+
+
+def children_index(categories: Iterable[Category]) -> Dict[Optional[int], List[Category]]:
+    """Index parent_id -> enfants, dans l'ordre des catégories fournies."""
+    children: Dict[Optional[int], List[Category]] = defaultdict(list)
+    for category in categories:
+        children[category.parent_id].append(category)
+    return children
+
+
+def build_category_tree(
+    categories: Iterable[Category],
+    root_id: Optional[int] = None,
+    depth: Optional[int] = None
+) -> List[dict]:
+    """
+    Construit l'arbre des catégories
+
+    Args:
+        categories: Catégories d'un utilisateur, déjà triées
+        root_id: Racine du sous-arbre (None = toutes les catégories racines)
+        depth: Nombre de niveaux d'enfants inclus sous les racines (None = tous)
+
+    Returns:
+        Liste des nœuds racines avec leurs enfants imbriqués
+        (vide si root_id ne correspond à aucune catégorie)
+    """
+    categories = list(categories)
+    children = children_index(categories)
+
+    if root_id is None:
+        roots = children.get(None, [])
+    else:
+        roots = [category for category in categories if category.id == root_id]
+
+    tree = [category_node(category) for category in roots]
+    # Parcours itératif (pile) : (nœud, catégorie, niveau)
+    pending = [(node, category, 0) for node, category in zip(tree, roots)]
+    visited = {category.id for category in roots}
+    while pending:
+        node, category, level = pending.pop()
+        if depth is not None and level >= depth:
+            continue
+        for child in children.get(category.id, ()):
+            # Protection contre un cycle parent_id en base
+            if child.id in visited:
+                continue
+            visited.add(child.id)
+            child_node = category_node(child)
+            node["children"].append(child_node)
+            pending.append((child_node, child, level + 1))
+    return tree
@@ -0,0 +1,196 @@
+"""
+Agrégation des données du tableau de bord
+
+Les requêtes sont indépendantes : chacune ouvre sa propre session et elles
+s'exécutent simultanément (asyncio.gather). La durée de la requête est celle
+de la plus lente au lieu de leur somme.
+"""
+import asyncio
+from decimal import Decimal
+from typing import Awaitable, Callable, List, TypeVar
+
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.bank_account import BankAccount
+from app.models.category import Category
+from app.models.envelope import Envelope
+from app.models.transaction import Transaction
+from app.models.transaction_monthly_rollup import TransactionMonthlyRollup
+from app.models.wish_list import WishList
+from app.models.wish_list_item import WishListItem
+from app.schemas.dashboard import (
+    DashboardAccount, DashboardCategoryTotal, DashboardEnvelope, DashboardMonth,
+    DashboardRead, DashboardTotals, DashboardTransaction, DashboardWishList
+)
+from app.services.transaction_summary import add_to_summary, empty_summary, format_summary
+
+T = TypeVar("T")
+
+# Nombre de transactions récentes affichées
+RECENT_TRANSACTIONS = 5
+
+
+async def build_dashboard(
+    session_factory: async_sessionmaker,
+    user_id: int,
+    email: str,
+    year_month: str
+) -> DashboardRead:
+    """
+    Rassemble les données du tableau de bord d'un utilisateur
+
+    Args:
+        session_factory: Fabrique de sessions (une session par requête)
+        user_id: ID de l'utilisateur
+        email: Email affiché
+        year_month: Mois résumé (YYYY-MM)
+    """
+    accounts, envelopes, month, recent_transactions, wish_lists = await asyncio.gather(
+        _in_session(session_factory, load_accounts, user_id),
+        _in_session(session_factory, load_envelopes, user_id),
+        _in_session(session_factory, load_month, user_id, year_month),
+        _in_session(session_factory, load_recent_transactions, user_id),
+        _in_session(session_factory, load_wish_lists, user_id),
+    )
+
+    totals = DashboardTotals(
+        total_balance=sum((account.current_balance for account in accounts), Decimal("0")),
+        account_count=len(accounts),
+        active_envelopes=len(envelopes),
+        envelope_balance=sum((envelope.current_balance for envelope in envelopes), Decimal("0")),
+        wish_list_count=len(wish_lists),
+    )
+    return DashboardRead(
+        email=email,
+        totals=totals,
+        accounts=accounts,
+        envelopes=envelopes,
+        month=month,
+        recent_transactions=recent_transactions,
+        wish_lists=wish_lists,
+    )
+
+
+async def _in_session(
+    session_factory: async_sessionmaker,
+    loader: Callable[..., Awaitable[T]],
+    *args
+) -> T:
+    async with session_factory() as session:
+        return await loader(session, *args)
+
+
+async def load_accounts(db: AsyncSession, user_id: int) -> List[DashboardAccount]:
+    """Soldes des comptes actifs."""
+    result = await db.execute(
+        select(
+            BankAccount.id, BankAccount.name, BankAccount.account_type,
+            BankAccount.current_balance, BankAccount.currency
+        )
+        .where(BankAccount.user_id == user_id, BankAccount.is_active.is_(True))
+        .order_by(BankAccount.name)
+    )
+    return [DashboardAccount(**row._mapping) for row in result]
+
+
+async def load_envelopes(db: AsyncSession, user_id: int) -> List[DashboardEnvelope]:
+    """Remplissage des enveloppes actives."""
+    result = await db.execute(
+        select(
+            Envelope.id, Envelope.name, Envelope.bank_account_id,
+            Envelope.monthly_budget, Envelope.current_balance, Envelope.color
+        )
+        .where(Envelope.user_id == user_id, Envelope.is_active.is_(True))
+        .order_by(Envelope.name)
+    )
+    envelopes = []
+    for row in result:
+        budget = Decimal(str(row.monthly_budget or 0))
+        fill_percent = float(Decimal(str(row.current_balance)) / budget * 100) if budget > 0 else 0.0
+        envelopes.append(DashboardEnvelope(**row._mapping, fill_percent=round(fill_percent, 1)))
+    return envelopes
+
+
+async def load_month(db: AsyncSession, user_id: int, year_month: str) -> DashboardMonth:
+    """Revenus et dépenses du mois par catégorie, lus dans les agrégats mensuels."""
+    result = await db.execute(
+        select(
+            TransactionMonthlyRollup.category_id,
+            Category.name,
+            TransactionMonthlyRollup.transaction_type,
+            func.sum(TransactionMonthlyRollup.total_amount).label("total_amount"),
+            func.sum(TransactionMonthlyRollup.transaction_count).label("transaction_count")
+        )
+        .outerjoin(Category, Category.id == TransactionMonthlyRollup.category_id)
+        .where(
+            TransactionMonthlyRollup.user_id == user_id,
+            TransactionMonthlyRollup.year_month == year_month
+        )
+        .group_by(
+            TransactionMonthlyRollup.category_id, Category.name,
+            TransactionMonthlyRollup.transaction_type
+        )
+    )
+
+    month = empty_summary()
+    categories = {}
+    for row in result:
+        add_to_summary(month, row.transaction_type, row.total_amount, row.transaction_count)
+        if row.category_id not in categories:
+            categories[row.category_id] = (row.name, empty_summary())
+        add_to_summary(categories[row.category_id][1], row.transaction_type, row.total_amount, row.transaction_count)
+
+    category_totals = []
+    for category_id, (name, summary) in categories.items():
+        formatted = format_summary(summary)
+        category_totals.append(DashboardCategoryTotal(
+            category_id=category_id,
+            name=name,
+            total_income=formatted["total_income"],
+            total_expense=formatted["total_expense"],
+        ))
+    category_totals.sort(key=lambda category: (-category.total_expense, category.name or ""))
+
+    return DashboardMonth(year_month=year_month, categories=category_totals, **format_summary(month))
+
+
+async def load_recent_transactions(db: AsyncSession, user_id: int) -> List[DashboardTransaction]:
+    """Dernières transactions avec le nom de leur catégorie."""
+    result = await db.execute(
+        select(
+            Transaction.id, Transaction.date, Transaction.amount, Transaction.transaction_type,
+            Transaction.description, Transaction.payee, Category.name.label("category_name")
+        )
+        .outerjoin(Category, Category.id == Transaction.category_id)
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+        .limit(RECENT_TRANSACTIONS)
+    )
+    return [DashboardTransaction(**row._mapping) for row in result]
+
+
+async def load_wish_lists(db: AsyncSession, user_id: int) -> List[DashboardWishList]:
+    """Avancement des listes de souhaits (articles et montants achetés)."""
+    is_purchased = WishListItem.status == "purchased"
+    item_cost = WishListItem.price * WishListItem.quantity
+    result = await db.execute(
+        select(
+            WishList.id, WishList.name, WishList.status,
+            func.count(WishListItem.id).label("total_items"),
+            func.coalesce(func.sum(case((is_purchased, 1), else_=0)), 0).label("purchased_items"),
+            func.coalesce(func.sum(item_cost), 0).label("total_cost"),
+            func.coalesce(func.sum(case((is_purchased, item_cost), else_=0)), 0).label("purchased_cost")
+        )
+        .outerjoin(WishListItem, WishListItem.wish_list_id == WishList.id)
+        .where(WishList.user_id == user_id)
+        .group_by(WishList.id, WishList.name, WishList.status)
+        .order_by(WishList.name)
+    )
+    wish_lists = []
+    for row in result:
+        completion = row.purchased_items / row.total_items * 100 if row.total_items else 0.0
+        wish_lists.append(DashboardWishList(
+            **row._mapping, completion_percent=round(completion, 1)
+        ))
+    return wish_lists
@@ -0,0 +1,198 @@
+"""
+Report mensuel des enveloppes (financement par le budget mensuel)
+
+Une fois par mois, chaque enveloppe active reçoit son budget mensuel selon
+sa politique de report :
+- carry_over : current_balance = current_balance + monthly_budget
+- reset : current_balance = monthly_budget
+
+Les utilisateurs sont traités par lots (pagination par clé sur user_id). Pour
+chaque lot, une transaction insère les lignes envelope_rollover_runs puis met
+à jour toutes les enveloppes du lot en un seul UPDATE. Un utilisateur déjà
+financé pour le mois n'est plus candidat et sa ligne de run ne peut pas être
+insérée deux fois : relancer le traitement (redémarrage, plusieurs workers)
+ne finance pas deux fois. Les montants crédités sont notés dans le journal
+des mouvements (balance_movements) par un INSERT ... SELECT.
+
+Exécuté par le planificateur (app/scheduler.py) ou à la main :
+
+    python -m app.services.envelope_rollover [--month YYYY-MM]
+"""
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import and_, case, exists, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.balance_movement import BalanceMovement
+from app.models.envelope import Envelope
+from app.models.envelope_rollover_run import EnvelopeRolloverRun
+from app.schemas.balance_movement import BalanceEntity, MovementKind
+from app.schemas.envelope import RolloverPolicy
+from app.services.resource_versions import bump_versions
+from app.utils.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+# Réponses en cache dont les soldes d'enveloppes changent
+ROLLOVER_SCOPES = ("envelopes.list",)
+
+
+@dataclass
+class RolloverResult:
+    """Bilan d'une exécution du report mensuel"""
+    year_month: str
+    users: int = 0
+    envelopes: int = 0
+    batches: int = 0
+    conflicts: int = 0
+
+
+def current_year_month() -> str:
+    """Mois courant (YYYY-MM)."""
+    return date.today().strftime("%Y-%m")
+
+
+async def pending_users(
+    db: AsyncSession,
+    year_month: str,
+    after_user_id: int,
+    limit: int
+) -> List[int]:
+    """Utilisateurs suivants ayant des enveloppes actives et pas encore financés ce mois."""
+    already_funded = exists().where(
+        EnvelopeRolloverRun.user_id == Envelope.user_id,
+        EnvelopeRolloverRun.year_month == year_month
+    )
+    result = await db.execute(
+        select(Envelope.user_id)
+        .where(Envelope.is_active.is_(True), Envelope.user_id > after_user_id, ~already_funded)
+        .group_by(Envelope.user_id)
+        .order_by(Envelope.user_id)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def fund_users(db: AsyncSession, user_ids: List[int], year_month: str) -> int:
+    """
+    Finance les enveloppes actives d'un lot d'utilisateurs (session non commitée)
+
+    Lève IntegrityError si un utilisateur du lot a déjà été financé ce mois.
+
+    Returns:
+        Nombre d'enveloppes financées
+    """
+    active = and_(Envelope.user_id.in_(user_ids), Envelope.is_active.is_(True))
+    await db.execute(
+        insert(EnvelopeRolloverRun).from_select(
+            ["user_id", "year_month", "envelope_count", "total_budget"],
+            select(
+                Envelope.user_id,
+                literal(year_month),
+                func.count(Envelope.id),
+                func.coalesce(func.sum(Envelope.monthly_budget), 0)
+            )
+            .where(active)
+            .group_by(Envelope.user_id)
+        )
+    )
+    # Delta de chaque enveloppe, noté avant la mise à jour des soldes
+    credited = case(
+        (Envelope.rollover_policy == RolloverPolicy.RESET.value, Envelope.monthly_budget - Envelope.current_balance),
+        else_=Envelope.monthly_budget
+    )
+    await db.execute(
+        insert(BalanceMovement).from_select(
+            ["user_id", "entity_type", "entity_id", "kind", "amount", "description"],
+            select(
+                Envelope.user_id,
+                literal(BalanceEntity.ENVELOPE.value),
+                Envelope.id,
+                literal(MovementKind.ROLLOVER.value),
+                credited,
+                literal(year_month)
+            )
+            .where(active, credited != 0)
+        )
+    )
+    result = await db.execute(
+        update(Envelope)
+        .where(active)
+        .values(current_balance=Envelope.current_balance + credited)
+        .execution_options(synchronize_session=False)
+    )
+    # UPDATE en masse : les versions (ETag) ne sont pas attribuées automatiquement
+    await db.run_sync(bump_versions, [(user_id, "envelopes") for user_id in user_ids])
+    return result.rowcount
+
+
+async def run_rollover(
+    session_factory: async_sessionmaker,
+    year_month: Optional[str] = None,
+    batch_size: int = 1000
+) -> RolloverResult:
+    """
+    Finance, pour le mois, les enveloppes de tous les utilisateurs pas encore traités
+
+    Args:
+        session_factory: Fabrique de sessions (une transaction par lot)
+        year_month: Mois financé (YYYY-MM, défaut : mois courant)
+        batch_size: Utilisateurs par lot
+    """
+    outcome = RolloverResult(year_month=year_month or current_year_month())
+    after_user_id = 0
+    retried = False
+    while True:
+        async with session_factory() as session:
+            user_ids = await pending_users(session, outcome.year_month, after_user_id, batch_size)
+            if not user_ids:
+                break
+            try:
+                envelopes = await fund_users(session, user_ids, outcome.year_month)
+                await session.commit()
+            except IntegrityError:
+                # Lot financé en parallèle (autre worker) : relire une fois les candidats restants
+                await session.rollback()
+                if retried:
+                    raise
+                retried = True
+                outcome.conflicts += 1
+                continue
+
+        retried = False
+        after_user_id = user_ids[-1]
+        outcome.users += len(user_ids)
+        outcome.envelopes += envelopes
+        outcome.batches += 1
+        for user_id in user_ids:
+            await response_cache.invalidate(user_id, *ROLLOVER_SCOPES)
+
+    logger.info(
+        "Envelope rollover %s: %d users, %d envelopes in %d batches",
+        outcome.year_month, outcome.users, outcome.envelopes, outcome.batches
+    )
+    return outcome
+
+
+async def _run(year_month: Optional[str], batch_size: int) -> None:
+    from app.database import AsyncSessionLocal, engine
+
+    outcome = await run_rollover(AsyncSessionLocal, year_month, batch_size)
+    await engine.dispose()
+    print(f"{outcome.year_month} : {outcome.envelopes} enveloppes financées pour {outcome.users} utilisateurs")
+
+
+if __name__ == "__main__":
+    from app.config import get_settings
+
+    parser = argparse.ArgumentParser(description="Finance les enveloppes pour le mois (report mensuel)")
+    parser.add_argument("--month", default=None, help="Mois financé (YYYY-MM, défaut : mois courant)")
+    parser.add_argument("--batch-size", type=int, default=get_settings().ROLLOVER_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(_run(args.month, args.batch_size))
@@ -0,0 +1,200 @@
+"""
+Transferts de fonds entre enveloppes
+
+Le débit est un UPDATE conditionnel (current_balance >= montant) et le crédit
+un UPDATE relatif, dans la même transaction : aucune lecture préalable du
+solde, donc pas de mise à jour perdue ni de découvert lorsque plusieurs
+transferts concurrents (plusieurs onglets, plusieurs workers) visent la même
+enveloppe. Les deux lignes sont verrouillées dans l'ordre de leurs IDs pour
+que deux transferts croisés (A -> B et B -> A) ne s'interbloquent pas.
+
+Les allocations groupées (plusieurs transferts, répartition d'un revenu)
+sont réduites à un delta net par enveloppe et appliquées en un seul UPDATE
+(CASE sur l'ID), conditionné au solde des enveloppes débitées.
+
+Chaque transfert est noté dans le journal des mouvements (balance_movements).
+"""
+from decimal import Decimal
+from typing import Dict, Optional
+
+from sqlalchemy import case, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.envelope import Envelope
+from app.schemas.balance_movement import BalanceEntity, MovementKind
+from app.services.balance_ledger import movement, record_movements
+
+
+class EnvelopeNotFound(Exception):
+    """Enveloppe inexistante ou appartenant à un autre utilisateur"""
+
+    def __init__(self, envelope_id: int):
+        super().__init__(f"Envelope {envelope_id} not found")
+        self.envelope_id = envelope_id
+
+
+class InsufficientFunds(Exception):
+    """Solde de l'enveloppe source inférieur au montant demandé"""
+
+    def __init__(self, envelope_id: int, available: Decimal):
+        super().__init__(f"Insufficient funds in envelope {envelope_id}. Available: {available}")
+        self.envelope_id = envelope_id
+        self.available = available
+
+
+async def transfer_funds(
+    db: AsyncSession,
+    user_id: int,
+    from_envelope_id: int,
+    to_envelope_id: int,
+    amount: Decimal,
+    description: Optional[str] = None
+) -> None:
+    """
+    Transfère un montant d'une enveloppe à une autre (session non commitée)
+
+    En cas d'erreur, une partie du transfert peut déjà être écrite : l'appelant
+    doit annuler la transaction (rollback).
+
+    Raises:
+        EnvelopeNotFound: Une des enveloppes n'appartient pas à l'utilisateur
+        InsufficientFunds: Solde source insuffisant au moment du débit
+    """
+    for envelope_id in sorted((from_envelope_id, to_envelope_id)):
+        if envelope_id == from_envelope_id:
+            await debit_envelope(db, user_id, envelope_id, amount)
+        else:
+            await credit_envelope(db, user_id, envelope_id, amount)
+    await record_movements(db, [
+        movement(user_id, BalanceEntity.ENVELOPE, from_envelope_id, -amount, MovementKind.REALLOCATION,
+                 description=description),
+        movement(user_id, BalanceEntity.ENVELOPE, to_envelope_id, amount, MovementKind.REALLOCATION,
+                 description=description),
+    ])
+
+
+async def debit_envelope(db: AsyncSession, user_id: int, envelope_id: int, amount: Decimal) -> None:
+    """Débite une enveloppe si son solde le permet (UPDATE conditionnel)."""
+    result = await db.execute(
+        update(Envelope)
+        .where(
+            Envelope.id == envelope_id,
+            Envelope.user_id == user_id,
+            Envelope.current_balance >= amount
+        )
+        .values(current_balance=Envelope.current_balance - amount)
+        .execution_options(synchronize_session="fetch")
+    )
+    if result.rowcount != 1:
+        available = await _current_balance(db, user_id, envelope_id)
+        if available is None:
+            raise EnvelopeNotFound(envelope_id)
+        raise InsufficientFunds(envelope_id, available)
+
+
+async def credit_envelope(db: AsyncSession, user_id: int, envelope_id: int, amount: Decimal) -> None:
+    """Crédite une enveloppe (UPDATE relatif)."""
+    result = await db.execute(
+        update(Envelope)
+        .where(Envelope.id == envelope_id, Envelope.user_id == user_id)
+        .values(current_balance=Envelope.current_balance + amount)
+        .execution_options(synchronize_session="fetch")
+    )
+    if result.rowcount != 1:
+        raise EnvelopeNotFound(envelope_id)
+
+
+async def apply_envelope_deltas(
+    db: AsyncSession,
+    user_id: int,
+    deltas: Dict[int, Decimal],
+    kind: MovementKind = MovementKind.ALLOCATION,
+    description: Optional[str] = None
+) -> None:
+    """
+    Applique des deltas nets à plusieurs enveloppes en un UPDATE (session non commitée)
+
+    Une enveloppe débitée doit couvrir son débit net ; une enveloppe créditée
+    est mise à jour quel que soit son solde. En cas d'erreur, l'appelant doit
+    annuler la transaction (rollback).
+
+    Raises:
+        EnvelopeNotFound: Une des enveloppes n'appartient pas à l'utilisateur
+        InsufficientFunds: Solde insuffisant pour un débit net
+    """
+    deltas = {envelope_id: delta for envelope_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    delta = case(deltas, value=Envelope.id)
+    debited = [envelope_id for envelope_id, value in deltas.items() if value < 0]
+    result = await db.execute(
+        update(Envelope)
+        .where(
+            Envelope.user_id == user_id,
+            Envelope.id.in_(deltas),
+            or_(Envelope.id.not_in(debited), Envelope.current_balance + delta >= 0)
+        )
+        .values(current_balance=Envelope.current_balance + delta)
+        .returning(Envelope.id)
+        .execution_options(synchronize_session="fetch")
+    )
+    skipped = set(deltas) - set(result.scalars().all())
+    # Enveloppes non mises à jour : inexistantes ou débit non couvert
+    for envelope_id in sorted(skipped):
+        available = await _current_balance(db, user_id, envelope_id)
+        if available is None:
+            raise EnvelopeNotFound(envelope_id)
+        raise InsufficientFunds(envelope_id, available)
+
+    await record_movements(db, (
+        movement(user_id, BalanceEntity.ENVELOPE, envelope_id, delta, kind, description=description)
+        for envelope_id, delta in sorted(deltas.items())
+    ))
+
+
+async def budget_distribution(
+    db: AsyncSession,
+    user_id: int,
+    amount: Decimal,
+    bank_account_id: Optional[int] = None,
+    exclude_envelope_id: Optional[int] = None
+) -> Dict[int, Decimal]:
+    """
+    Part de chaque enveloppe active dans un montant, au prorata de son budget mensuel
+
+    Les parts sont arrondies au centime (méthode du plus fort reste) : leur
+    somme vaut exactement le montant. Dictionnaire vide si aucune enveloppe
+    n'a de budget.
+    """
+    query = select(Envelope.id, Envelope.monthly_budget).where(
+        Envelope.user_id == user_id,
+        Envelope.is_active.is_(True),
+        Envelope.monthly_budget > 0
+    )
+    if bank_account_id is not None:
+        query = query.where(Envelope.bank_account_id == bank_account_id)
+    if exclude_envelope_id is not None:
+        query = query.where(Envelope.id != exclude_envelope_id)
+    budgets = dict((await db.execute(query)).all())
+    return split_by_weight(amount, budgets)
+
+
+def split_by_weight(amount: Decimal, weights: Dict[int, Decimal]) -> Dict[int, Decimal]:
+    """Répartit un montant au centime près, proportionnellement aux poids."""
+    total = sum(weights.values())
+    if not total:
+        return {}
+    cents = int(amount * 100)
+    exact = {key: Decimal(cents) * weight / total for key, weight in weights.items()}
+    shares = {key: int(value) for key, value in exact.items()}
+    remainder = cents - sum(shares.values())
+    for key in sorted(exact, key=lambda key: (shares[key] - exact[key], key))[:remainder]:
+        shares[key] += 1
+    return {key: Decimal(share).scaleb(-2) for key, share in shares.items() if share}
+
+
+async def _current_balance(db: AsyncSession, user_id: int, envelope_id: int) -> Optional[Decimal]:
+    result = await db.execute(
+        select(Envelope.current_balance).where(Envelope.id == envelope_id, Envelope.user_id == user_id)
+    )
+    return result.scalar_one_or_none()
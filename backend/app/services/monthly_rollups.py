@@ -0,0 +1,188 @@
+"""
+Agrégats mensuels des transactions (table transaction_monthly_rollups)
+
+Les agrégats sont mis à jour de façon incrémentale par les écritures de
+transactions et peuvent être reconstruits depuis la table transactions :
+
+    python -m app.services.monthly_rollups [--user-id ID]
+"""
+import argparse
+import asyncio
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.transaction import Transaction
+from app.models.transaction_monthly_rollup import NO_ENVELOPE, TransactionMonthlyRollup
+from app.utils.sql import year_month
+
+# (user_id, year_month, bank_account_id, envelope_id, category_id, transaction_type)
+RollupKey = Tuple[int, str, int, int, int, str]
+
+KEY_COLUMNS = (
+    "user_id", "year_month", "bank_account_id", "envelope_id", "category_id", "transaction_type"
+)
+
+# Lignes par instruction d'upsert (limite de paramètres de SQLite)
+UPSERT_BATCH_SIZE = 500
+
+
+def rollup_key(transaction) -> RollupKey:
+    """Clé d'agrégation d'une transaction (snapshot ou modèle)."""
+    return (
+        transaction.user_id,
+        transaction.date.strftime("%Y-%m"),
+        transaction.bank_account_id,
+        transaction.envelope_id if transaction.envelope_id is not None else NO_ENVELOPE,
+        transaction.category_id,
+        transaction.transaction_type,
+    )
+
+
+async def apply_rollup_deltas(db: AsyncSession, deltas: Dict[RollupKey, Tuple[Decimal, int]]) -> None:
+    """
+    Ajoute des deltas (montant, nombre) aux agrégats mensuels
+
+    Utilise un upsert (INSERT ... ON CONFLICT DO UPDATE) sous SQLite et
+    PostgreSQL. Les agrégats qui retombent à zéro transaction sont supprimés.
+
+    Args:
+        db: Session de base de données (non commitée)
+        deltas: Delta de montant et de nombre de transactions par clé
+    """
+    rows = [
+        {**dict(zip(KEY_COLUMNS, key)), "total_amount": amount, "transaction_count": count}
+        for key, (amount, count) in deltas.items()
+        if amount or count
+    ]
+    if not rows:
+        return
+
+    dialect_name = db.bind.dialect.name
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[start:start + UPSERT_BATCH_SIZE]
+        if dialect_name in ("sqlite", "postgresql"):
+            await db.execute(_upsert_statement(dialect_name, batch))
+        else:
+            await _update_or_insert(db, batch)
+
+    if any(row["transaction_count"] < 0 for row in rows):
+        user_ids = {row["user_id"] for row in rows}
+        await db.execute(
+            delete(TransactionMonthlyRollup).where(
+                TransactionMonthlyRollup.user_id.in_(user_ids),
+                TransactionMonthlyRollup.transaction_count <= 0
+            )
+        )
+
+
+def _upsert_statement(dialect_name: str, rows: List[dict]):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    statement = dialect_insert(TransactionMonthlyRollup).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=list(KEY_COLUMNS),
+        set_={
+            "total_amount": TransactionMonthlyRollup.total_amount + statement.excluded.total_amount,
+            "transaction_count": TransactionMonthlyRollup.transaction_count + statement.excluded.transaction_count,
+        }
+    )
+
+
+async def _update_or_insert(db: AsyncSession, rows: List[dict]) -> None:
+    # Repli sans upsert natif : UPDATE relatif, INSERT si la ligne n'existe pas
+    for row in rows:
+        result = await db.execute(
+            update(TransactionMonthlyRollup)
+            .where(*(getattr(TransactionMonthlyRollup, column) == row[column] for column in KEY_COLUMNS))
+            .values(
+                total_amount=TransactionMonthlyRollup.total_amount + row["total_amount"],
+                transaction_count=TransactionMonthlyRollup.transaction_count + row["transaction_count"]
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            await db.execute(insert(TransactionMonthlyRollup).values(row))
+
+
+def _rollup_source(*conditions):
+    # Agrégats (clé, somme, nombre) des transactions répondant aux conditions
+    source = select(
+        Transaction.user_id,
+        year_month(Transaction.date),
+        Transaction.bank_account_id,
+        func.coalesce(Transaction.envelope_id, NO_ENVELOPE),
+        Transaction.category_id,
+        Transaction.transaction_type,
+        func.sum(Transaction.amount),
+        func.count(Transaction.id),
+    ).where(*conditions)
+    return source.group_by(*source.selected_columns[:len(KEY_COLUMNS)])
+
+
+async def remove_rollup_contributions(db: AsyncSession, *conditions) -> None:
+    """
+    Retire des agrégats les transactions répondant aux conditions
+
+    À appeler avant une suppression qui emporte des transactions sans passer
+    par leurs effets (compte ou enveloppe supprimé en cascade), dans la même
+    transaction SQL.
+
+    Args:
+        db: Session de base de données (non commitée)
+        conditions: Filtres sur Transaction
+    """
+    result = await db.execute(_rollup_source(*conditions))
+    await apply_rollup_deltas(db, {
+        tuple(row[:len(KEY_COLUMNS)]): (-Decimal(str(row[-2])), -row[-1])
+        for row in result
+    })
+
+
+async def rebuild_monthly_rollups(db: AsyncSession, user_id: Optional[int] = None) -> int:
+    """
+    Reconstruit les agrégats depuis la table transactions
+
+    Args:
+        db: Session de base de données (non commitée)
+        user_id: Limiter la reconstruction à un utilisateur
+
+    Returns:
+        Nombre de lignes d'agrégats créées
+    """
+    clear = delete(TransactionMonthlyRollup)
+    conditions = []
+    if user_id is not None:
+        clear = clear.where(TransactionMonthlyRollup.user_id == user_id)
+        conditions.append(Transaction.user_id == user_id)
+    source = _rollup_source(*conditions)
+
+    await db.execute(clear)
+    result = await db.execute(
+        insert(TransactionMonthlyRollup).from_select(
+            [*KEY_COLUMNS, "total_amount", "transaction_count"], source
+        )
+    )
+    return result.rowcount
+
+
+async def _rebuild(user_id: Optional[int]) -> None:
+    from app.database import AsyncSessionLocal, engine
+
+    async with AsyncSessionLocal() as session:
+        rows = await rebuild_monthly_rollups(session, user_id)
+        await session.commit()
+    await engine.dispose()
+    print(f"{rows} agrégats mensuels reconstruits")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconstruit les agrégats mensuels des transactions")
+    parser.add_argument("--user-id", type=int, default=None, help="Limiter à un utilisateur")
+    args = parser.parse_args()
+    asyncio.run(_rebuild(args.user_id))
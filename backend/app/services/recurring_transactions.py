@@ -0,0 +1,212 @@
+"""
+Génération des transactions récurrentes
+
+Chaque échéancier (recurring_schedules) porte une règle RRULE et sa prochaine
+occurrence (next_occurrence), qui sert de marque de progression : une
+exécution ne lit que les échéanciers actifs dont la prochaine occurrence est
+passée, crée toutes les occurrences dues jusqu'à aujourd'hui, puis avance la
+marque. Un échéancier à jour n'est donc ni relu ni recalculé.
+
+Les échéanciers dus sont traités par lots (pagination par clé sur id). Pour
+chaque lot, une transaction SQL :
+- insère toutes les occurrences en un INSERT multi-lignes ;
+- applique les soldes et agrégats mensuels, agrégés par compte et enveloppe ;
+- avance next_occurrence / last_occurrence en un UPDATE groupé par clé.
+L'index unique (recurring_schedule_id, date) empêche de créer deux fois la
+même occurrence si deux workers traitent le même lot.
+
+Exécuté par le planificateur (app/scheduler.py) ou à la main :
+
+    python -m app.services.recurring_transactions [--date YYYY-MM-DD]
+"""
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.recurring_schedule import RecurringSchedule
+from app.models.transaction import Transaction
+from app.services.resource_versions import bump_versions
+from app.services.transaction_effects import BALANCE_SCOPES, apply_transaction_effects, snapshot
+from app.utils.recurrence import first_occurrence, occurrences_between, parse_rule
+from app.utils.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RecurringGenerationResult:
+    """Bilan d'une exécution du générateur"""
+    today: date
+    schedules: int = 0
+    transactions: int = 0
+    batches: int = 0
+    conflicts: int = 0
+
+
+async def due_schedules(
+    db: AsyncSession,
+    today: date,
+    after_id: int,
+    limit: int
+) -> List[RecurringSchedule]:
+    """Échéanciers actifs suivants dont la prochaine occurrence est passée."""
+    result = await db.execute(
+        select(RecurringSchedule)
+        .where(
+            RecurringSchedule.is_active.is_(True),
+            RecurringSchedule.next_occurrence <= today,
+            RecurringSchedule.id > after_id
+        )
+        .order_by(RecurringSchedule.id)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+def schedule_occurrences(schedule: RecurringSchedule, today: date) -> Tuple[List[date], Optional[date]]:
+    """
+    Occurrences dues d'un échéancier et sa nouvelle marque
+
+    Returns:
+        (dates à créer, prochaine occurrence après aujourd'hui ou None)
+    """
+    rule = parse_rule(schedule.rrule, schedule.start_date)
+    dates = occurrences_between(rule, schedule.next_occurrence, today)
+    return dates, first_occurrence(rule, today)
+
+
+def occurrence_values(schedule: RecurringSchedule, occurrence: date) -> Dict:
+    """Colonnes de la transaction créée pour une occurrence."""
+    return {
+        "user_id": schedule.user_id,
+        "bank_account_id": schedule.bank_account_id,
+        "envelope_id": schedule.envelope_id,
+        "category_id": schedule.category_id,
+        "recurring_schedule_id": schedule.id,
+        "amount": schedule.amount,
+        "transaction_type": schedule.transaction_type,
+        "description": schedule.description,
+        "payee": schedule.payee,
+        "priority": schedule.priority,
+        "date": occurrence,
+        "is_recurring": True,
+    }
+
+
+async def generate_for_schedules(
+    db: AsyncSession,
+    schedules: List[RecurringSchedule],
+    today: date
+) -> Tuple[int, Set[int]]:
+    """
+    Crée les occurrences dues d'un lot d'échéanciers (session non commitée)
+
+    Lève IntegrityError si une occurrence du lot existe déjà.
+
+    Returns:
+        (nombre de transactions créées, utilisateurs concernés)
+    """
+    values: List[Dict] = []
+    marks: List[Dict] = []
+    for schedule in schedules:
+        dates, next_occurrence = schedule_occurrences(schedule, today)
+        values.extend(occurrence_values(schedule, occurrence) for occurrence in dates)
+        marks.append({
+            "id": schedule.id,
+            "next_occurrence": next_occurrence,
+            "last_occurrence": dates[-1] if dates else schedule.last_occurrence,
+        })
+
+    if values:
+        await db.execute(insert(Transaction), values)
+        await apply_transaction_effects(db, added=[snapshot(row) for row in values])
+    # UPDATE groupé par clé primaire (executemany)
+    await db.execute(update(RecurringSchedule), marks)
+
+    user_ids = {row["user_id"] for row in values}
+    # Écritures en masse : les versions (ETag) ne sont pas attribuées automatiquement
+    await db.run_sync(
+        bump_versions,
+        [(user_id, resource) for user_id in user_ids for resource in ("bank_accounts", "envelopes")]
+    )
+    return len(values), user_ids
+
+
+async def generate_due_transactions(
+    session_factory: async_sessionmaker,
+    today: Optional[date] = None,
+    batch_size: int = 1000
+) -> RecurringGenerationResult:
+    """
+    Crée les transactions dues de tous les échéanciers actifs
+
+    Args:
+        session_factory: Fabrique de sessions (une transaction par lot)
+        today: Date jusqu'à laquelle générer (incluse, défaut : aujourd'hui)
+        batch_size: Échéanciers par lot
+    """
+    outcome = RecurringGenerationResult(today=today or date.today())
+    after_id = 0
+    retried = False
+    while True:
+        async with session_factory() as session:
+            schedules = await due_schedules(session, outcome.today, after_id, batch_size)
+            if not schedules:
+                break
+            last_id = schedules[-1].id
+            try:
+                created, user_ids = await generate_for_schedules(session, schedules, outcome.today)
+                await session.commit()
+            except IntegrityError:
+                # Lot traité en parallèle (autre worker) : relire une fois les échéanciers dus
+                await session.rollback()
+                if retried:
+                    raise
+                retried = True
+                outcome.conflicts += 1
+                continue
+
+        retried = False
+        after_id = last_id
+        outcome.schedules += len(schedules)
+        outcome.transactions += created
+        outcome.batches += 1
+        for user_id in user_ids:
+            await response_cache.invalidate(user_id, *BALANCE_SCOPES)
+
+    logger.info(
+        "Recurring transactions up to %s: %d transactions for %d schedules in %d batches",
+        outcome.today, outcome.transactions, outcome.schedules, outcome.batches
+    )
+    return outcome
+
+
+async def _run(today: Optional[date], batch_size: int) -> None:
+    from app.database import AsyncSessionLocal, engine
+
+    outcome = await generate_due_transactions(AsyncSessionLocal, today, batch_size)
+    await engine.dispose()
+    print(
+        f"{outcome.today} : {outcome.transactions} transactions créées "
+        f"pour {outcome.schedules} échéanciers"
+    )
+
+
+if __name__ == "__main__":
+    from app.config import get_settings
+
+    parser = argparse.ArgumentParser(description="Crée les transactions récurrentes dues")
+    parser.add_argument(
+        "--date", type=date.fromisoformat, default=None,
+        help="Générer jusqu'à cette date incluse (YYYY-MM-DD, défaut : aujourd'hui)"
+    )
+    parser.add_argument("--batch-size", type=int, default=get_settings().RECURRING_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(_run(args.date, args.batch_size))
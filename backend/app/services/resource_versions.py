@@ -0,0 +1,116 @@
+"""
+Versions des ressources d'un utilisateur (ETag des listes)
+
+Chaque session note les ressources modifiées (objets ORM ajoutés, modifiés
+ou supprimés, et UPDATE/INSERT/DELETE ORM en masse comme les mises à jour de
+solde). Au commit, la version de chaque ressource touchée est incrémentée
+dans resource_versions, dans la même transaction que l'écriture.
+
+Les écritures en masse ne portent pas l'utilisateur concerné : elles sont
+attribuées à session.info["user_id"] (renseigné par get_current_user). Un
+traitement hors requête qui écrit via update(...) doit le renseigner.
+"""
+from typing import Dict, Iterable, Set, Tuple
+
+from sqlalchemy import event, select, update, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.resource_version import ResourceVersion
+
+# Table modifiée -> ressources dont la liste change
+RESOURCES: Dict[str, Tuple[str, ...]] = {
+    "categories": ("categories",),
+    # Suppression d'un compte : ses enveloppes sont supprimées en cascade
+    "bank_accounts": ("bank_accounts", "envelopes"),
+    "envelopes": ("envelopes",),
+    "wish_lists": ("wish_lists",),
+    "wish_list_items": ("wish_lists",),
+}
+
+_TOUCHED_KEY = "touched_resources"
+
+
+def _touch(session: Session, user_id, table_name: str) -> None:
+    if user_id is None or table_name not in RESOURCES:
+        return
+    touched: Set[Tuple[int, str]] = session.info.setdefault(_TOUCHED_KEY, set())
+    touched.update((user_id, resource) for resource in RESOURCES[table_name])
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_objects(session: Session, flush_context) -> None:
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(type(instance), "__table__", None)
+        if table is None:
+            continue
+        user_id = getattr(instance, "user_id", None) or session.info.get("user_id")
+        _touch(session, user_id, table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(orm_execute_state) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        session = orm_execute_state.session
+        _touch(session, session.info.get("user_id"), mapper.local_table.name)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_touched_versions(session: Session) -> None:
+    # Flusher d'abord : les objets encore en attente comptent aussi
+    session.flush()
+    touched = session.info.pop(_TOUCHED_KEY, None)
+    if touched:
+        bump_versions(session, touched)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_touched(session: Session) -> None:
+    session.info.pop(_TOUCHED_KEY, None)
+
+
+def bump_versions(session: Session, keys: Iterable[Tuple[int, str]]) -> None:
+    """
+    Incrémente la version de ressources (session synchrone, non commitée)
+
+    Args:
+        session: Session de base de données
+        keys: Couples (user_id, ressource)
+    """
+    rows = [{"user_id": user_id, "resource": resource, "version": 1} for user_id, resource in sorted(keys)]
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name in ("sqlite", "postgresql"):
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = dialect_insert(ResourceVersion).values(rows)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=["user_id", "resource"],
+            set_={"version": ResourceVersion.version + 1}
+        ))
+        return
+
+    # Repli sans upsert natif : UPDATE relatif, INSERT si la ligne n'existe pas
+    for row in rows:
+        result = session.execute(
+            update(ResourceVersion)
+            .where(ResourceVersion.user_id == row["user_id"], ResourceVersion.resource == row["resource"])
+            .values(version=ResourceVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            session.execute(insert(ResourceVersion).values(row))
+
+
+async def get_version(db: AsyncSession, user_id: int, resource: str) -> int:
+    """Version courante d'une ressource (0 tant qu'elle n'a jamais été modifiée)."""
+    result = await db.execute(
+        select(ResourceVersion.version).where(
+            ResourceVersion.user_id == user_id,
+            ResourceVersion.resource == resource
+        )
+    )
+    return result.scalar_one_or_none() or 0
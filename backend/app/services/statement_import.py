@@ -0,0 +1,355 @@
+"""
+Import de relevés bancaires (CSV, sous-ensemble OFX) en flux continu
+
+Le fichier est lu ligne à ligne (ou par blocs pour l'OFX) et inséré par lots de
+taille fixe : la mémoire utilisée ne dépend pas de la taille du relevé.
+L'avancement est suivi dans un registre de jobs en mémoire (par processus).
+"""
+import csv
+import io
+import logging
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.schemas.transaction import ImportFormat, ImportJobStatus, TransactionBulkError
+from app.services.bulk_transactions import TransactionBulkInserter
+from app.services.transaction_effects import BALANCE_SCOPES
+from app.utils.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal de jobs terminés conservés dans le registre
+MAX_FINISHED_JOBS = 100
+# Nombre maximal d'erreurs détaillées conservées par job
+MAX_JOB_ERRORS = 100
+
+_DATE_FORMATS = ("%d/%m/%Y", "%d/%m/%y", "%d-%m-%Y", "%d.%m.%Y", "%Y%m%d")
+
+# En-têtes CSV reconnus (normalisés : minuscules, sans accents) -> champ
+_CSV_COLUMNS = {
+    "date": "date", "date operation": "date", "date_operation": "date",
+    "date de l'operation": "date", "booking date": "date",
+    "amount": "amount", "montant": "amount",
+    "debit": "debit", "credit": "credit",
+    "description": "description", "libelle": "description", "label": "description",
+    "memo": "description",
+    "payee": "payee", "beneficiaire": "payee", "tiers": "payee",
+    "transaction_type": "transaction_type", "type": "transaction_type",
+    "bank_account_id": "bank_account_id", "category_id": "category_id",
+    "envelope_id": "envelope_id", "priority": "priority",
+    "is_recurring": "is_recurring",
+}
+
+
+@dataclass
+class ImportOptions:
+    """Paramètres de correspondance appliqués à chaque ligne du relevé"""
+    format: ImportFormat = ImportFormat.CSV
+    bank_account_id: Optional[int] = None
+    category_id: Optional[int] = None
+    envelope_id: Optional[int] = None
+    delimiter: str = ","
+    encoding: str = "utf-8-sig"
+    date_format: Optional[str] = None
+
+
+@dataclass
+class ImportJob:
+    """Avancement d'un import"""
+    user_id: int
+    format: ImportFormat
+    total_bytes: int = 0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: ImportJobStatus = ImportJobStatus.PENDING
+    bytes_read: int = 0
+    rows_processed: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: List[TransactionBulkError] = field(default_factory=list)
+    detail: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def progress_percent(self) -> float:
+        if self.status == ImportJobStatus.COMPLETED or not self.total_bytes:
+            return 100.0 if self.status == ImportJobStatus.COMPLETED else 0.0
+        return round(min(self.bytes_read / self.total_bytes, 1.0) * 100, 1)
+
+    @property
+    def rows_per_second(self) -> float:
+        if not self.elapsed_seconds:
+            return 0.0
+        return round(self.rows_processed / self.elapsed_seconds, 1)
+
+
+# === Registre des jobs ===
+
+_jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+
+
+def create_job(user_id: int, import_format: ImportFormat, total_bytes: int) -> ImportJob:
+    """Enregistre un nouveau job et purge les plus anciens jobs terminés."""
+    job = ImportJob(user_id=user_id, format=import_format, total_bytes=total_bytes)
+    _jobs[job.id] = job
+
+    finished = [
+        job_id for job_id, existing in _jobs.items()
+        if existing.status in (ImportJobStatus.COMPLETED, ImportJobStatus.FAILED)
+    ]
+    for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+        del _jobs[job_id]
+    return job
+
+
+def get_job(job_id: str, user_id: int) -> Optional[ImportJob]:
+    """Retourne un job s'il appartient à l'utilisateur."""
+    job = _jobs.get(job_id)
+    if job is None or job.user_id != user_id:
+        return None
+    return job
+
+
+# === Exécution ===
+
+async def run_import_job(
+    job: ImportJob,
+    source: IO[bytes],
+    options: ImportOptions,
+    session_factory: async_sessionmaker,
+    chunk_size: int = 1000
+) -> None:
+    """
+    Parse le relevé et insère les transactions par lots
+
+    Chaque lot est commité séparément : un relevé volumineux ne garde pas le
+    verrou d'écriture pendant tout l'import, et l'avancement reste visible.
+
+    Args:
+        job: Job à mettre à jour
+        source: Fichier binaire contenant le relevé (fermé en fin d'import)
+        options: Correspondance des colonnes et valeurs par défaut
+        session_factory: Fabrique de sessions de base de données
+        chunk_size: Taille des lots d'insertion
+    """
+    job.status = ImportJobStatus.RUNNING
+    started_at = time.perf_counter()
+
+    try:
+        async with session_factory() as session:
+            # Attribue les mises à jour de soldes à l'utilisateur (versions, réplicas)
+            session.info["user_id"] = job.user_id
+            inserter = TransactionBulkInserter(
+                session, job.user_id, chunk_size, max_errors=MAX_JOB_ERRORS
+            )
+            text = io.TextIOWrapper(source, encoding=options.encoding, errors="replace", newline="")
+
+            rows = 0
+            for index, row in enumerate(_iter_statement(text, options)):
+                if isinstance(row, str):
+                    inserter.add_error(index, row)
+                else:
+                    await inserter.add(index, row)
+                rows = index + 1
+
+                if rows % chunk_size == 0:
+                    await inserter.flush()
+                    await session.commit()
+                    await response_cache.invalidate(job.user_id, *BALANCE_SCOPES)
+                    _update_progress(job, inserter, source, rows, started_at)
+
+            await inserter.flush()
+            await session.commit()
+            await response_cache.invalidate(job.user_id, *BALANCE_SCOPES)
+            _update_progress(job, inserter, source, rows, started_at)
+        job.status = ImportJobStatus.COMPLETED
+    except Exception as e:
+        logger.exception("Import job %s failed", job.id)
+        job.status = ImportJobStatus.FAILED
+        job.detail = str(e)
+    finally:
+        job.elapsed_seconds = round(time.perf_counter() - started_at, 4)
+        job.finished_at = datetime.now(timezone.utc)
+        source.close()
+
+
+def _update_progress(job: ImportJob, inserter, source: IO[bytes], rows: int, started_at: float) -> None:
+    job.rows_processed = rows
+    job.created = inserter.created
+    job.failed = inserter.failed
+    job.errors = list(inserter.errors)
+    job.elapsed_seconds = round(time.perf_counter() - started_at, 4)
+    try:
+        job.bytes_read = source.tell()
+    except (OSError, ValueError):
+        pass
+
+
+def _iter_statement(text: IO[str], options: ImportOptions) -> Iterator[Any]:
+    """Produit, pour chaque opération du relevé, un dict de champs ou un message d'erreur."""
+    if options.format == ImportFormat.OFX:
+        records = (map_ofx_record(record, options) for record in iter_ofx_records(text))
+    else:
+        records = (map_csv_row(row, options) for row in iter_csv_rows(text, options.delimiter))
+    yield from records
+
+
+# === CSV ===
+
+def iter_csv_rows(text: IO[str], delimiter: str = ",") -> Iterator[Dict[str, str]]:
+    """Lit un CSV ligne à ligne en normalisant les en-têtes."""
+    reader = csv.reader(text, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [_CSV_COLUMNS.get(_normalize_header(name)) for name in header]
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        yield {
+            column: value.strip()
+            for column, value in zip(columns, values)
+            if column is not None
+        }
+
+
+def map_csv_row(row: Dict[str, str], options: ImportOptions) -> Any:
+    """Transforme une ligne CSV en champs de TransactionCreate."""
+    try:
+        if row.get("amount"):
+            amount = parse_amount(row["amount"])
+        else:
+            amount = parse_amount(row.get("credit") or "0") - parse_amount(row.get("debit") or "0").copy_abs()
+        transaction_date = parse_date(row.get("date", ""), options.date_format)
+    except ValueError as e:
+        return str(e)
+
+    values = _defaults(options)
+    for key in ("bank_account_id", "category_id", "envelope_id", "priority", "is_recurring"):
+        if row.get(key):
+            values[key] = row[key]
+
+    transaction_type = row.get("transaction_type") or ("expense" if amount < 0 else "income")
+    if transaction_type == "expense":
+        amount = amount.copy_abs()
+
+    values.update({
+        "amount": amount,
+        "transaction_type": transaction_type,
+        "date": transaction_date,
+        "description": (row.get("description") or None) and row["description"][:255],
+        "payee": (row.get("payee") or None) and row["payee"][:100],
+    })
+    return values
+
+
+# === OFX ===
+
+def iter_ofx_records(text: IO[str], block_size: int = 65536) -> Iterator[Dict[str, str]]:
+    """
+    Lit les blocs <STMTTRN> d'un fichier OFX par morceaux
+
+    Gère l'OFX 1.x (SGML, balises non fermées) comme l'OFX 2.x (XML), que les
+    balises soient sur une ou plusieurs lignes.
+    """
+    buffer = ""
+    current: Optional[Dict[str, str]] = None
+    while True:
+        block = text.read(block_size)
+        buffer += block
+        parts = buffer.split("<")
+        # Le dernier morceau peut être incomplet tant que le fichier n'est pas fini
+        buffer = parts.pop() if block else ""
+        for part in parts:
+            tag, _, value = part.partition(">")
+            tag = tag.strip().upper()
+            if tag == "STMTTRN":
+                current = {}
+            elif tag == "/STMTTRN":
+                if current is not None:
+                    yield current
+                current = None
+            elif current is not None and tag and not tag.startswith("/"):
+                current[tag] = value.strip()
+        if not block:
+            break
+
+
+def map_ofx_record(record: Dict[str, str], options: ImportOptions) -> Any:
+    """Transforme un bloc STMTTRN en champs de TransactionCreate."""
+    try:
+        amount = parse_amount(record.get("TRNAMT", ""))
+        transaction_date = parse_date(record.get("DTPOSTED", "")[:8], "%Y%m%d")
+    except ValueError as e:
+        return str(e)
+
+    values = _defaults(options)
+    values.update({
+        "amount": amount.copy_abs() if amount < 0 else amount,
+        "transaction_type": "expense" if amount < 0 else "income",
+        "date": transaction_date,
+        "payee": (record.get("NAME") or None) and record["NAME"][:100],
+        "description": (record.get("MEMO") or None) and record["MEMO"][:255],
+    })
+    return values
+
+
+# === Conversions ===
+
+def parse_amount(value: str) -> Decimal:
+    """Convertit un montant au format français ou anglais ("1 234,56", "-1,234.56")."""
+    cleaned = value.strip()
+    for character in (" ", "\u00a0", "\u202f", "€"):
+        cleaned = cleaned.replace(character, "")
+    if "," in cleaned and "." in cleaned:
+        # Le dernier séparateur est le séparateur décimal
+        if cleaned.rfind(",") > cleaned.rfind("."):
+            cleaned = cleaned.replace(".", "").replace(",", ".")
+        else:
+            cleaned = cleaned.replace(",", "")
+    else:
+        cleaned = cleaned.replace(",", ".")
+    try:
+        return Decimal(cleaned).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {value!r}")
+
+
+def parse_date(value: str, date_format: Optional[str] = None) -> date:
+    """Convertit une date ISO ou jour/mois/année."""
+    value = value.strip()
+    if date_format:
+        formats = (date_format,)
+    else:
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            formats = _DATE_FORMATS
+    for candidate in formats:
+        try:
+            return datetime.strptime(value, candidate).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {value!r}")
+
+
+def _defaults(options: ImportOptions) -> Dict[str, Any]:
+    return {
+        "bank_account_id": options.bank_account_id,
+        "category_id": options.category_id,
+        "envelope_id": options.envelope_id,
+    }
+
+
+def _normalize_header(name: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).strip().lower()
@@ -0,0 +1,176 @@
+"""
+Effets des transactions sur les soldes matérialisés
+
+Chaque écriture de transaction (création, modification, suppression) applique
+un delta signé au solde du compte bancaire et de l'enveloppe concernés, le
+note dans le journal des mouvements, met à jour les agrégats mensuels et
+supprime les snapshots de solde que rend faux une date passée, dans la même
+transaction SQL que l'écriture elle-même.
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.balance_snapshot import BalanceSnapshot
+from app.models.bank_account import BankAccount
+from app.models.envelope import Envelope
+from app.models.transaction import Transaction
+from app.schemas.balance_movement import BalanceEntity, MovementKind
+from app.services.balance_ledger import movement, record_movements
+from app.services.monthly_rollups import RollupKey, apply_rollup_deltas, rollup_key
+
+# Réponses en cache (voir app/utils/response_cache.py) qui affichent des soldes,
+# à invalider après le commit d'une écriture de transactions
+BALANCE_SCOPES = ("bank_accounts.list", "envelopes.list")
+
+
+class TransactionSnapshot(NamedTuple):
+    """Valeurs d'une transaction nécessaires au calcul de ses effets"""
+    user_id: int
+    bank_account_id: int
+    envelope_id: Optional[int]
+    category_id: int
+    transaction_type: str
+    amount: Decimal
+    date: date
+
+
+def snapshot(transaction) -> TransactionSnapshot:
+    """
+    Capture l'état d'une transaction (modèle ORM ou dictionnaire)
+
+    Args:
+        transaction: Instance Transaction ou dict de ses colonnes
+
+    Returns:
+        Snapshot immuable de la transaction
+    """
+    get = transaction.get if isinstance(transaction, dict) else partial(getattr, transaction)
+    return TransactionSnapshot(
+        user_id=get("user_id"),
+        bank_account_id=get("bank_account_id"),
+        envelope_id=get("envelope_id"),
+        category_id=get("category_id"),
+        transaction_type=getattr(get("transaction_type"), "value", get("transaction_type")),
+        amount=Decimal(str(get("amount"))),
+        date=get("date"),
+    )
+
+
+def signed_amount(transaction_type: str, amount: Decimal) -> Decimal:
+    """
+    Retourne l'effet d'une transaction sur un solde
+
+    Les dépenses sont saisies en positif et débitent le solde. Les revenus
+    créditent le solde. Les virements et ajustements sont pris tels que saisis
+    (montant signé).
+    """
+    if transaction_type == "expense":
+        return -amount
+    return amount
+
+
+# Équivalent SQL de signed_amount sur les colonnes de Transaction
+SIGNED_AMOUNT = case(
+    (Transaction.transaction_type == "expense", -Transaction.amount),
+    else_=Transaction.amount
+)
+
+
+async def apply_transaction_effects(
+    db: AsyncSession,
+    added: Iterable[TransactionSnapshot] = (),
+    removed: Iterable[TransactionSnapshot] = ()
+) -> None:
+    """
+    Applique aux soldes l'effet de transactions ajoutées et/ou retirées
+
+    Les deltas sont agrégés par compte et par enveloppe : une modification qui
+    ne change que le montant ne produit qu'un UPDATE par solde concerné.
+    Les mises à jour sont relatives (solde = solde + delta) et ne perdent donc
+    pas les écritures concurrentes.
+
+    Args:
+        db: Session de base de données (non commitée)
+        added: Transactions créées (ou état après modification)
+        removed: Transactions supprimées (ou état avant modification)
+    """
+    account_deltas: Dict[int, Decimal] = defaultdict(Decimal)
+    envelope_deltas: Dict[int, Decimal] = defaultdict(Decimal)
+    owners: Dict[Tuple[BalanceEntity, int], int] = {}
+    earliest: Dict[Tuple[BalanceEntity, int], date] = {}
+    rollup_deltas: Dict[RollupKey, Tuple[Decimal, int]] = {}
+
+    for sign, transactions in ((1, added), (-1, removed)):
+        for transaction in transactions:
+            delta = signed_amount(transaction.transaction_type, transaction.amount) * sign
+            account_deltas[transaction.bank_account_id] += delta
+            entities = [(BalanceEntity.BANK_ACCOUNT, transaction.bank_account_id)]
+            if transaction.envelope_id is not None:
+                envelope_deltas[transaction.envelope_id] += delta
+                entities.append((BalanceEntity.ENVELOPE, transaction.envelope_id))
+            for entity in entities:
+                owners[entity] = transaction.user_id
+                earliest[entity] = min(earliest.get(entity, transaction.date), transaction.date)
+
+            key = rollup_key(transaction)
+            amount, count = rollup_deltas.get(key, (Decimal("0"), 0))
+            rollup_deltas[key] = (amount + transaction.amount * sign, count + sign)
+
+    await _apply_balance_deltas(db, BankAccount, account_deltas)
+    await _apply_balance_deltas(db, Envelope, envelope_deltas)
+    await record_movements(db, (
+        movement(owners[(entity_type, entity_id)], entity_type, entity_id, delta, MovementKind.TRANSACTION)
+        for entity_type, deltas in (
+            (BalanceEntity.BANK_ACCOUNT, account_deltas), (BalanceEntity.ENVELOPE, envelope_deltas)
+        )
+        for entity_id, delta in deltas.items()
+    ))
+    await apply_rollup_deltas(db, rollup_deltas)
+    await invalidate_snapshots(db, {
+        (owners[entity], *entity): since for entity, since in earliest.items()
+    })
+
+
+async def _apply_balance_deltas(db: AsyncSession, model, deltas: Dict[int, Decimal]) -> None:
+    for entity_id, delta in deltas.items():
+        if not delta:
+            continue
+        await db.execute(
+            update(model)
+            .where(model.id == entity_id)
+            .values(current_balance=model.current_balance + delta)
+            .execution_options(synchronize_session="fetch")
+        )
+
+
+async def invalidate_snapshots(
+    db: AsyncSession,
+    stale: Dict[Tuple[int, BalanceEntity, int], date]
+) -> None:
+    """
+    Supprime les snapshots rendus faux par des transactions écrites à des dates passées
+
+    Args:
+        db: Session de base de données (non commitée)
+        stale: Date la plus ancienne touchée par (user_id, entité, ID)
+    """
+    month_start = date.today().replace(day=1)
+    conditions = [
+        and_(
+            BalanceSnapshot.user_id == user_id,
+            BalanceSnapshot.entity_type == entity_type.value,
+            BalanceSnapshot.entity_id == entity_id,
+            BalanceSnapshot.snapshot_date >= since
+        )
+        for (user_id, entity_type, entity_id), since in stale.items()
+        # Les snapshots ne couvrent que des mois écoulés
+        if since < month_start
+    ]
+    if conditions:
+        await db.execute(delete(BalanceSnapshot).where(or_(*conditions)))
@@ -0,0 +1,87 @@
+"""
+Export des transactions en flux continu (CSV, NDJSON)
+
+Les lignes sont lues par lots depuis un curseur côté serveur et encodées au fil
+de l'eau : la mémoire utilisée ne dépend pas du nombre de transactions exportées.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.transaction import Transaction
+from app.schemas.transaction import ExportFormat
+
+
+# Colonnes exportées, dans l'ordre des colonnes CSV
+EXPORT_COLUMNS = (
+    Transaction.id,
+    Transaction.date,
+    Transaction.amount,
+    Transaction.transaction_type,
+    Transaction.bank_account_id,
+    Transaction.envelope_id,
+    Transaction.category_id,
+    Transaction.description,
+    Transaction.payee,
+    Transaction.priority,
+    Transaction.is_recurring,
+    Transaction.created_at,
+)
+
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+async def stream_export(
+    session_factory: async_sessionmaker,
+    query: Select,
+    export_format: ExportFormat,
+    batch_size: int = 5000
+) -> AsyncIterator[bytes]:
+    """
+    Exécute la requête et produit le fichier d'export morceau par morceau
+
+    La session est ouverte par le générateur lui-même : elle reste valide
+    pendant toute la durée de la réponse, après la fin du traitement de la
+    requête.
+
+    Args:
+        session_factory: Fabrique de sessions de base de données
+        query: Requête sélectionnant EXPORT_COLUMNS
+        export_format: Format de sortie
+        batch_size: Nombre de lignes lues (et encodées) par lot
+
+    Yields:
+        Un morceau encodé en UTF-8 par lot de lignes
+    """
+    encode = _encode_csv if export_format == ExportFormat.CSV else _encode_ndjson
+
+    async with session_factory() as session:
+        # Exécution Core sur la connexion : pas de passage par le chargement ORM
+        connection = await session.connection()
+        result = await connection.stream(query.execution_options(yield_per=batch_size))
+        if export_format == ExportFormat.CSV:
+            yield _encode_csv([EXPORT_FIELDS])
+        async for rows in result.partitions():
+            yield encode(rows)
+
+
+def _encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _encode_ndjson(rows) -> bytes:
+    dumps = json.JSONEncoder(ensure_ascii=False, default=str).encode
+    return "".join(
+        dumps(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in rows
+    ).encode()
@@ -0,0 +1,71 @@
+"""
+Recherche plein texte dans les transactions (description / payee)
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import Select, column, literal_column, or_, table
+
+from app.models.transaction import Transaction
+
+
+# Table virtuelle FTS5 maintenue par triggers (voir app/models/transaction.py)
+transactions_fts = table("transactions_fts", column("rowid"), column("rank"))
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_expression(search: str) -> Optional[str]:
+    """
+    Construit une requête FTS5 à partir de la saisie utilisateur
+
+    Chaque mot est cité (neutralise la syntaxe FTS5) et recherché par préfixe.
+
+    Args:
+        search: Texte saisi par l'utilisateur
+
+    Returns:
+        Expression MATCH, None si la saisie ne contient aucun mot
+    """
+    tokens = _TOKEN_PATTERN.findall(search)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def apply_search(query: Select, search: str, dialect_name: str, by_relevance: bool = False) -> Select:
+    """
+    Ajoute le filtre de recherche textuelle à une requête sur Transaction
+
+    Args:
+        query: Requête à filtrer
+        search: Texte recherché
+        dialect_name: Dialecte de la base (l'index FTS5 n'existe que sous SQLite)
+        by_relevance: Trier d'abord par pertinence (bm25)
+
+    Returns:
+        Requête filtrée
+    """
+    match = build_match_expression(search) if dialect_name == "sqlite" else None
+
+    if match is None:
+        # Repli pour les autres bases : recherche par sous-chaîne insensible à la
+        # casse (ILIKE sous PostgreSQL), les caractères % et _ saisis étant échappés
+        search_pattern = f"%{_escape_like(search)}%"
+        return query.where(
+            or_(
+                Transaction.description.ilike(search_pattern, escape="\\"),
+                Transaction.payee.ilike(search_pattern, escape="\\")
+            )
+        )
+
+    query = query.join(transactions_fts, transactions_fts.c.rowid == Transaction.id).where(
+        literal_column("transactions_fts").op("MATCH")(match)
+    )
+    if by_relevance:
+        query = query.order_by(transactions_fts.c.rank)
+    return query
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
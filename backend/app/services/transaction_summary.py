@@ -0,0 +1,33 @@
+"""
+Mise en forme des totaux revenus / dépenses (résumés et rapports)
+"""
+from decimal import Decimal
+
+
+def empty_summary() -> dict:
+    """Totaux vides (revenus, dépenses, nombre de transactions)."""
+    return {"income": Decimal("0"), "expense": Decimal("0"), "count": 0}
+
+
+def add_to_summary(summary: dict, transaction_type: str, amount, count: int) -> None:
+    """Ajoute le total d'un type de transaction aux totaux."""
+    if transaction_type == "income":
+        summary["income"] += Decimal(str(amount or 0))
+    elif transaction_type == "expense":
+        summary["expense"] += Decimal(str(amount or 0))
+    summary["count"] += count
+
+
+def format_summary(summary: dict) -> dict:
+    """Totaux au format de réponse de l'API."""
+    return {
+        "total_income": float(summary["income"]),
+        "total_expense": float(summary["expense"]),
+        "balance": float(summary["income"] - summary["expense"]),
+        "transaction_count": summary["count"]
+    }
+
+
+def summary_sort_key(key: tuple) -> tuple:
+    """Clé de tri des groupes, les valeurs NULL (ex: sans enveloppe) en premier."""
+    return tuple((value is not None, value if value is not None else 0) for value in key)
@@ -4,6 +4,9 @@ Utils package - Export des utilitaires
 from app.utils.auth import (
     hash_password,
     verify_password,
+    hash_password_async,
+    verify_password_async,
+    PasswordHashingBusy,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -12,13 +15,30 @@ from app.utils.auth import (
 from app.utils.dependencies import (
     get_current_user,
     get_current_active_user,
+    get_read_db,
+    get_read_session_factory,
+    resource_etag,
     verify_refresh_token,
 )
+from app.utils.etag import (
+    compute_etag,
+    version_etag,
+    etag_matches,
+    etag_response,
+)
+from app.utils.user_cache import (
+    CachedUser,
+    user_cache,
+    invalidate_user,
+)
 
 __all__ = [
     # Auth
     "hash_password",
     "verify_password",
+    "hash_password_async",
+    "verify_password_async",
+    "PasswordHashingBusy",
     "create_access_token",
     "create_refresh_token",
     "decode_token",
@@ -26,5 +46,17 @@ __all__ = [
     # Dependencies
     "get_current_user",
     "get_current_active_user",
+    "get_read_db",
+    "get_read_session_factory",
+    "resource_etag",
     "verify_refresh_token",
+    # ETag
+    "compute_etag",
+    "version_etag",
+    "etag_matches",
+    "etag_response",
+    # Cache utilisateurs
+    "CachedUser",
+    "user_cache",
+    "invalidate_user",
 ]
@@ -1,6 +1,8 @@
 """
 Utilitaires d'authentification - JWT et hash de mots de passe
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 import bcrypt
@@ -27,8 +29,8 @@ def hash_password(password: str) -> str:
     """
     # Convertir en bytes et limiter à 72 bytes
     password_bytes = password.encode('utf-8')[:72]
-    # Générer le hash avec bcrypt
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+    # Générer le hash avec bcrypt (coût configurable)
+    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS))
     # Retourner en string
     return hashed.decode('utf-8')
 
@@ -49,6 +51,70 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+# === Hash asynchrone (pool de threads) ===
+# bcrypt libère le GIL : un pool de threads suffit pour ne pas bloquer la
+# boucle d'événements. La taille du pool borne le nombre de cœurs occupés par
+# les hash, et le nombre d'opérations en attente est plafonné pour qu'une rafale
+# de connexions ne s'accumule pas indéfiniment.
+
+class PasswordHashingBusy(Exception):
+    """Trop d'opérations de hash en attente"""
+
+
+_password_executor: Optional[ThreadPoolExecutor] = None
+_pending_password_operations = 0
+
+
+def _get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash"
+        )
+    return _password_executor
+
+
+async def _run_password_operation(func, *args):
+    global _pending_password_operations
+    if _pending_password_operations >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHashingBusy()
+    _pending_password_operations += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_password_executor(), func, *args)
+    finally:
+        _pending_password_operations -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash un mot de passe sans bloquer la boucle d'événements
+    
+    Raises:
+        PasswordHashingBusy: Si PASSWORD_HASH_MAX_PENDING opérations sont déjà en cours
+    """
+    return await _run_password_operation(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Vérifie un mot de passe sans bloquer la boucle d'événements
+    
+    Raises:
+        PasswordHashingBusy: Si PASSWORD_HASH_MAX_PENDING opérations sont déjà en cours
+    """
+    return await _run_password_operation(verify_password, plain_password, hashed_password)
+
+
+def shutdown_password_executor() -> None:
+    """Arrête le pool de threads de hash (arrêt de l'application)."""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+
+
 # === JWT Tokens ===
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -74,6 +140,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     
     to_encode.update({
         "exp": expire,
+        "iat": datetime.now(timezone.utc),
         "type": "access"
     })
     
@@ -105,6 +172,7 @@ def create_refresh_token(data: dict) -> str:
     
     to_encode.update({
         "exp": expire,
+        "iat": datetime.now(timezone.utc),
         "type": "refresh"
     })
     
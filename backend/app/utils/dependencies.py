@@ -1,15 +1,21 @@
 """
 Dépendances FastAPI pour l'authentification
 """
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.database import get_db
+from app.database import get_db, get_session_factory, replica_router
 from app.models.user import User
 from app.schemas.user import TokenData
+from app.services.resource_versions import get_version
 from app.utils.auth import decode_token, verify_token_type
+from app.utils.etag import CACHE_CONTROL, etag_matches, version_etag
+from app.utils.response_cache import CacheKey, RouteCache, cache_scope, request_params, response_cache
+from app.utils.user_cache import CachedUser, user_cache
 
 # Configuration du schéma de sécurité Bearer
 security = HTTPBearer()
@@ -18,16 +24,20 @@ security = HTTPBearer()
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> CachedUser:
     """
     Récupère l'utilisateur courant depuis le token JWT
     
+    L'utilisateur est mis en cache pour la durée USER_CACHE_TTL_SECONDS,
+    indexé par (id, iat du token) : les requêtes suivantes avec le même token
+    ne relisent pas la table users.
+    
     Args:
         credentials: Token Bearer depuis le header Authorization
         db: Session de base de données
         
     Returns:
-        L'utilisateur authentifié
+        Projection de l'utilisateur authentifié (id, email, is_active, dates)
         
     Raises:
         HTTPException 401: Si le token est invalide ou l'utilisateur n'existe pas
@@ -65,12 +75,20 @@ async def get_current_user(
     except (ValueError, TypeError):
         raise credentials_exception
     
-    # Récupérer l'utilisateur en base
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Récupérer l'utilisateur depuis le cache, sinon en base
+    issued_at = payload.get("iat")
+    user = user_cache.get(user_id, issued_at) if issued_at is not None else None
     
     if user is None:
-        raise credentials_exception
+        result = await db.execute(select(User).where(User.id == user_id))
+        db_user = result.scalar_one_or_none()
+        
+        if db_user is None:
+            raise credentials_exception
+        
+        user = CachedUser.from_user(db_user)
+        if issued_at is not None:
+            user_cache.set(issued_at, user)
     
     if not user.is_active:
         raise HTTPException(
@@ -78,12 +96,135 @@ async def get_current_user(
             detail="Inactive user"
         )
     
+    # Les écritures commitées par cette session ouvrent la fenêtre de lecture
+    # sur le primaire (voir get_read_db)
+    db.info["user_id"] = user.id
+    
     return user
 
 
+async def get_read_db(
+    current_user: CachedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Session de base de données pour les routes en lecture seule
+    
+    Utilise un réplica (à tour de rôle parmi ceux en bonne santé) si
+    DATABASE_REPLICA_URLS est configuré. Reste sur le primaire sans réplica
+    disponible ou si l'utilisateur a écrit il y a moins de
+    REPLICA_STICKY_SECONDS.
+    
+    Args:
+        current_user: Utilisateur authentifié
+        db: Session sur le primaire (aucune connexion n'est ouverte si elle n'est pas utilisée)
+        
+    Yields:
+        Session en lecture
+    """
+    session_factory = await replica_router.pick(current_user.id)
+    if session_factory is None:
+        yield db
+        return
+    
+    async with session_factory() as session:
+        session.info["replica"] = True
+        yield session
+
+
+async def get_read_session_factory(
+    current_user: CachedUser = Depends(get_current_user),
+    session_factory = Depends(get_session_factory)
+):
+    """
+    Fabrique de sessions en lecture (requêtes exécutées en parallèle)
+    
+    Même choix de base que get_read_db, pour les routes qui ouvrent plusieurs
+    sessions afin de lancer leurs requêtes simultanément.
+    
+    Args:
+        current_user: Utilisateur authentifié
+        session_factory: Fabrique de sessions du primaire
+        
+    Returns:
+        Fabrique de sessions du réplica choisi, ou du primaire
+    """
+    return await replica_router.pick(current_user.id) or session_factory
+
+
+def resource_etag(resource: str):
+    """
+    Dépendance de GET conditionnel pour une liste versionnée
+    
+    Lit la version de la ressource (une ligne par clé primaire) et en dérive
+    un ETag fort. Si le client présente cet ETag dans If-None-Match, la
+    requête s'arrête sur un 304 : ni la requête de liste ni la sérialisation
+    ne sont exécutées. Sinon l'ETag est ajouté à la réponse.
+    
+    Args:
+        resource: Nom de la ressource (voir app/services/resource_versions.py)
+        
+    Usage:
+        etag: str = Depends(resource_etag("categories"))
+    """
+    async def check_resource_etag(
+        request: Request,
+        response: Response,
+        current_user: CachedUser = Depends(get_current_user),
+        db: AsyncSession = Depends(get_read_db)
+    ) -> str:
+        version = await get_version(db, current_user.id, resource)
+        etag = version_etag(resource, version, current_user.id, request.url.query)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        
+        if etag_matches(request, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        response.headers.update(headers)
+        return etag
+    
+    return check_resource_etag
+
+
+def cached_route(route: str, path_param: Optional[str] = None):
+    """
+    Dépendance de cache de réponse pour une route GET
+    
+    La clé est (id utilisateur, portée, paramètres de requête), la portée
+    étant le nom de la route suivi de la valeur de path_param s'il est donné.
+    Les routes d'écriture invalident la portée via response_cache.invalidate.
+    
+    Seules les lectures sur le primaire alimentent le cache : un réplica en
+    retard y mettrait pour tout le TTL une version antérieure à la dernière
+    invalidation. Après une écriture, la lecture suivante (sur le primaire,
+    voir get_read_db) remplit le cache.
+    
+    Args:
+        route: Nom de la route ("categories.tree", "wish_lists.detail"...)
+        path_param: Paramètre de chemin identifiant la ressource
+        
+    Usage:
+        cache: RouteCache = Depends(cached_route("wish_lists.detail", "wish_list_id"))
+    """
+    async def load_cached_response(
+        request: Request,
+        response: Response,
+        current_user: CachedUser = Depends(get_current_user),
+        db: AsyncSession = Depends(get_read_db)
+    ) -> RouteCache:
+        resource_id = request.path_params.get(path_param) if path_param else None
+        key = CacheKey(current_user.id, cache_scope(route, resource_id), request_params(request))
+        return RouteCache(
+            response_cache, key, await response_cache.get(key), response,
+            writable=not db.info.get("replica", False)
+        )
+    
+    return load_cached_response
+
+
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CachedUser = Depends(get_current_user)
+) -> CachedUser:
     """
     Alias pour get_current_user (pour compatibilité future)
     Vérifie que l'utilisateur est actif
@@ -0,0 +1,66 @@
+"""
+Réponses JSON validables par ETag
+
+Le client renvoie l'ETag reçu dans If-None-Match : si le contenu n'a pas
+changé, la réponse est un 304 sans corps.
+"""
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+
+# Le navigateur garde la réponse mais la revalide à chaque affichage
+CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(content: bytes) -> str:
+    """ETag fort dérivé du contenu de la réponse."""
+    return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def version_etag(resource: str, version: int, user_id: int, query: str = "") -> str:
+    """
+    ETag fort d'une liste versionnée
+    
+    Dérivé de la version de la ressource, de l'utilisateur et des paramètres
+    de la requête (deux filtres différents donnent deux représentations).
+    """
+    digest = hashlib.sha256(f"{user_id}:{query}".encode("utf-8")).hexdigest()[:16]
+    return f'"{resource}-{version}-{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Indique si l'en-tête If-None-Match de la requête désigne cet ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # Comparaison faible : W/"x" et "x" désignent la même représentation
+    return "*" in candidates or etag in (
+        candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates
+    )
+
+
+def etag_response(request: Request, payload: Any, etag: Optional[str] = None) -> Response:
+    """
+    Sérialise payload en JSON avec son ETag
+    
+    Args:
+        request: Requête (lecture de If-None-Match)
+        payload: Contenu de la réponse (modèles Pydantic acceptés)
+        etag: ETag à utiliser, calculé sur le contenu par défaut
+        
+    Returns:
+        304 si le client a déjà cette version, sinon 200 avec le JSON
+    """
+    content = json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    etag = etag or compute_etag(content)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
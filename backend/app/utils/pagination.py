@@ -0,0 +1,56 @@
+"""
+Utilitaires de pagination par curseur (keyset pagination)
+"""
+import base64
+import json
+from typing import Any, List, Optional
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode une clé de tri en curseur opaque
+
+    Args:
+        values: Valeurs de la clé de tri de la dernière ligne renvoyée
+
+    Returns:
+        Curseur encodé en base64 (URL-safe)
+    """
+    raw = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> Optional[List[str]]:
+    """
+    Décode un curseur opaque
+
+    Args:
+        cursor: Curseur reçu du client
+        size: Nombre de valeurs attendues dans la clé de tri
+
+    Returns:
+        Liste des valeurs de la clé de tri, None si le curseur est invalide
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        return None
+
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+
+def decode_id_cursor(cursor: str) -> Optional[int]:
+    """
+    Décode un curseur ne contenant que l'ID de la dernière ligne renvoyée
+
+    Returns:
+        ID, None si le curseur est invalide
+    """
+    values = decode_cursor(cursor, 1)
+    try:
+        return int(values[0])
+    except (TypeError, ValueError):
+        return None
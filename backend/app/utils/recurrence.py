@@ -0,0 +1,76 @@
+"""
+Règles de récurrence (sous-ensemble de RRULE, RFC 5545)
+
+Parties acceptées : FREQ (DAILY, WEEKLY, MONTHLY, YEARLY), INTERVAL, COUNT,
+UNTIL, BYDAY, BYMONTHDAY, BYMONTH. Exemples :
+
+    FREQ=MONTHLY;BYMONTHDAY=1
+    FREQ=WEEKLY;INTERVAL=2;BYDAY=FR
+    FREQ=YEARLY;BYMONTH=12;BYMONTHDAY=24;COUNT=5
+
+Les occurrences sont des dates (les heures ne sont pas gérées).
+"""
+from datetime import date, datetime, time
+from typing import List, Optional
+
+from dateutil.rrule import rrule, rrulestr
+
+ALLOWED_PARTS = {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY", "BYMONTHDAY", "BYMONTH"}
+ALLOWED_FREQUENCIES = {"DAILY", "WEEKLY", "MONTHLY", "YEARLY"}
+
+
+def normalize_rule(rule: str) -> str:
+    """
+    Valide une règle et la renvoie sous forme canonique (majuscules, sans préfixe RRULE:)
+
+    Raises:
+        ValueError: Règle invalide ou hors du sous-ensemble accepté
+    """
+    text = rule.strip().upper()
+    if text.startswith("RRULE:"):
+        text = text[len("RRULE:"):]
+    parts = {}
+    for part in filter(None, text.split(";")):
+        name, separator, value = part.partition("=")
+        if not separator or not value:
+            raise ValueError(f"Invalid RRULE part: {part!r}")
+        if name not in ALLOWED_PARTS:
+            raise ValueError(f"Unsupported RRULE part: {name}")
+        parts[name] = value
+    if parts.get("FREQ") not in ALLOWED_FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(sorted(ALLOWED_FREQUENCIES))}")
+    if "INTERVAL" in parts and (not parts["INTERVAL"].isdigit() or int(parts["INTERVAL"]) < 1):
+        raise ValueError("INTERVAL must be a positive integer")
+    if "COUNT" in parts and "UNTIL" in parts:
+        raise ValueError("COUNT and UNTIL cannot be combined")
+
+    # dateutil valide les valeurs (BYDAY=XX, UNTIL mal formé...)
+    parse_rule(text, date(2000, 1, 1))
+    return text
+
+
+def parse_rule(rule: str, start: date) -> rrule:
+    """Règle dateutil à partir d'une règle texte et de sa date de début."""
+    try:
+        return rrulestr(rule, dtstart=datetime.combine(start, time.min))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid RRULE: {e}") from e
+
+
+def first_occurrence(rule: rrule, after: Optional[date] = None) -> Optional[date]:
+    """Première occurrence (strictement après `after` si fourni), ou None si la règle est terminée."""
+    if after is None:
+        occurrence = next(iter(rule), None)
+    else:
+        occurrence = rule.after(datetime.combine(after, time.min))
+    return occurrence.date() if occurrence is not None else None
+
+
+def occurrences_between(rule: rrule, start: date, end: date) -> List[date]:
+    """Occurrences comprises entre start et end (inclus)."""
+    return [
+        occurrence.date()
+        for occurrence in rule.between(
+            datetime.combine(start, time.min), datetime.combine(end, time.min), inc=True
+        )
+    ]
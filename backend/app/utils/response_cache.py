@@ -0,0 +1,273 @@
+"""
+Cache des réponses GET par utilisateur
+
+Les listes (catégories, comptes, enveloppes, listes de souhaits) ne dépendent
+que des données de l'utilisateur : leur corps JSON est mis en cache, indexé
+par (id utilisateur, portée, paramètres de requête). La portée est le nom de
+la route, suivi de l'identifiant de la ressource pour les routes de détail
+("wish_lists.detail:12").
+
+Les routes d'écriture invalident, après leur commit, les portées qu'elles
+modifient (invalidate). Une lecture concurrente d'une écriture peut remettre
+en cache l'ancienne version : elle expire au plus tard après le TTL.
+
+Deux implémentations : en mémoire (LRU borné, local au processus) et Redis
+(partagé entre workers, dépendance optionnelle `redis`).
+"""
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Set
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.config import Settings, get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class CacheKey(NamedTuple):
+    """Clé d'une réponse en cache"""
+    user_id: int
+    scope: str
+    params: str
+
+
+def cache_scope(route: str, resource_id: Any = None) -> str:
+    """Portée d'une route, éventuellement restreinte à une ressource."""
+    return route if resource_id is None else f"{route}:{resource_id}"
+
+
+def request_params(request: Request) -> str:
+    """Paramètres de requête sous forme canonique (ordre indifférent)."""
+    return "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+
+
+class MemoryResponseCache:
+    """Cache TTL borné (LRU) de réponses, local au processus"""
+
+    backend = "memory"
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[CacheKey, tuple]" = OrderedDict()
+        # (user_id, portée) -> clés en cache, pour une invalidation ciblée
+        self._scopes: Dict[tuple, Set[CacheKey]] = {}
+
+    async def get(self, key: CacheKey) -> Optional[bytes]:
+        """Retourne le corps en cache, ou None."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, key: CacheKey, body: bytes) -> None:
+        """Met en cache le corps d'une réponse."""
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, body)
+        self._entries.move_to_end(key)
+        self._scopes.setdefault((key.user_id, key.scope), set()).add(key)
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def invalidate(self, user_id: int, *scopes: str) -> None:
+        """Supprime les réponses en cache d'un utilisateur pour ces portées."""
+        for scope in scopes:
+            for key in self._scopes.pop((user_id, scope), ()):
+                self._entries.pop(key, None)
+        self.invalidations += 1
+
+    async def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro."""
+        self._entries.clear()
+        self._scopes.clear()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def _remove(self, key: CacheKey) -> None:
+        del self._entries[key]
+        keys = self._scopes.get((key.user_id, key.scope))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._scopes[(key.user_id, key.scope)]
+
+    def stats(self) -> dict:
+        """Compteurs d'utilisation du cache."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class RedisResponseCache:
+    """
+    Cache de réponses dans Redis (ou un serveur compatible), partagé entre workers
+
+    Chaque portée a un ensemble Redis listant ses clés : l'invalidation ne
+    supprime que celles-ci. La taille est bornée par la politique d'éviction
+    du serveur (maxmemory), les compteurs de hits/misses sont ceux du processus.
+    Une erreur Redis est traitée comme un cache manquant.
+    """
+
+    backend = "redis"
+
+    def __init__(self, url: str, ttl_seconds: float, prefix: str = "cash:responses"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package") from e
+
+        self.client = redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+
+    def _scope_key(self, user_id: int, scope: str) -> str:
+        return f"{self.prefix}:{user_id}:{scope}"
+
+    def _entry_key(self, key: CacheKey) -> str:
+        digest = hashlib.sha256(key.params.encode("utf-8")).hexdigest()[:16]
+        return f"{self._scope_key(key.user_id, key.scope)}:{digest}"
+
+    async def get(self, key: CacheKey) -> Optional[bytes]:
+        try:
+            body = await self.client.get(self._entry_key(key))
+        except Exception as e:
+            logger.warning("Response cache unavailable: %s", e)
+            self.errors += 1
+            body = None
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    async def set(self, key: CacheKey, body: bytes) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        entry_key = self._entry_key(key)
+        scope_key = self._scope_key(key.user_id, key.scope)
+        ttl = int(self.ttl_seconds)
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.set(entry_key, body, ex=ttl)
+                pipe.sadd(scope_key, entry_key)
+                pipe.expire(scope_key, ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Response cache unavailable: %s", e)
+            self.errors += 1
+
+    async def invalidate(self, user_id: int, *scopes: str) -> None:
+        try:
+            for scope in scopes:
+                scope_key = self._scope_key(user_id, scope)
+                entry_keys = await self.client.smembers(scope_key)
+                await self.client.delete(scope_key, *entry_keys)
+        except Exception as e:
+            logger.error("Response cache invalidation failed: %s", e)
+            self.errors += 1
+        self.invalidations += 1
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=f"{self.prefix}:*"):
+            await self.client.delete(key)
+        self.hits = self.misses = self.errors = self.invalidations = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": None,  # gérées par Redis (INFO stats, evicted_keys)
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+
+def create_response_cache(config: Settings):
+    """Instancie le cache de réponses configuré (RESPONSE_CACHE_BACKEND)."""
+    if config.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisResponseCache(config.RESPONSE_CACHE_REDIS_URL, config.RESPONSE_CACHE_TTL_SECONDS)
+    if config.RESPONSE_CACHE_BACKEND != "memory":
+        raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {config.RESPONSE_CACHE_BACKEND!r}")
+    return MemoryResponseCache(config.RESPONSE_CACHE_TTL_SECONDS, config.RESPONSE_CACHE_MAX_SIZE)
+
+
+response_cache = create_response_cache(settings)
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+class RouteCache:
+    """
+    Réponse en cache d'une route pour la requête courante
+
+    Usage dans une route :
+        if cache.hit is not None:
+            return cache.hit
+        ...
+        return await cache.store(List[CategoryRead], categories)
+    """
+
+    def __init__(
+        self, cache, key: CacheKey, body: Optional[bytes], response: Response, writable: bool = True
+    ):
+        self.cache = cache
+        self.key = key
+        self.body = body
+        self.response = response
+        self.writable = writable  # False : la réponse est servie sans être mise en cache
+
+    @property
+    def hit(self) -> Optional[Response]:
+        """Réponse servie depuis le cache, ou None."""
+        return self._response(self.body, "HIT") if self.body is not None else None
+
+    def _response(self, body: bytes, status: str) -> Response:
+        # En-têtes déjà posés par les autres dépendances (ETag...)
+        headers = {**self.response.headers, "X-Cache": status}
+        headers.pop("content-length", None)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def store(self, response_type, content: Any) -> Response:
+        """Sérialise le contenu selon le modèle de réponse, le met en cache et le renvoie."""
+        adapter = _adapter(response_type)
+        body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+        if self.writable:
+            await self.cache.set(self.key, body)
+        return self._response(body, "MISS")
@@ -0,0 +1,28 @@
+"""
+Expressions SQL portables entre SQLite et PostgreSQL
+"""
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import String
+
+
+class year_month(FunctionElement):
+    """
+    Mois d'une date au format 'YYYY-MM'
+
+    Compilé en strftime() sous SQLite et en to_char() sous PostgreSQL.
+    """
+    type = String()
+    name = "year_month"
+    inherit_cache = True
+
+
+@compiles(year_month, "sqlite")
+def _year_month_sqlite(element, compiler, **kw):
+    return "strftime('%%Y-%%m', %s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(year_month, "postgresql")
+def _year_month_postgresql(element, compiler, **kw):
+    return "to_char(%s, 'YYYY-MM')" % compiler.process(element.clauses, **kw)
+
@@ -0,0 +1,160 @@
+"""
+Cache en mémoire des utilisateurs authentifiés
+
+get_current_user est appelé à chaque requête de l'API : le cache évite de
+relire l'utilisateur en base tant que le même access token est présenté.
+Les entrées sont indexées par (id utilisateur, iat du token), expirent après
+un TTL et sont évincées par ordre d'utilisation (LRU) au-delà d'une taille
+maximale. Le cache est local au processus.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user import User
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Projection de l'utilisateur nécessaire aux routes (sans le hash du mot de passe)"""
+    id: int
+    email: str
+    is_active: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+class UserCache:
+    """Cache TTL borné (LRU) de projections utilisateur"""
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Tuple[int, int], Tuple[float, CachedUser]]" = OrderedDict()
+
+    def get(self, user_id: int, issued_at: int) -> Optional[CachedUser]:
+        """Retourne l'utilisateur en cache pour ce token, ou None."""
+        key = (user_id, issued_at)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, issued_at: int, user: CachedUser) -> None:
+        """Met en cache l'utilisateur pour ce token."""
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        key = (user.id, issued_at)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, user)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        """Supprime toutes les entrées d'un utilisateur (tous tokens confondus)."""
+        keys = [key for key in self._entries if key[0] == user_id]
+        for key in keys:
+            del self._entries[key]
+        if keys:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        """Compteurs d'utilisation du cache."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+user_cache = UserCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_SIZE)
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Invalide le cache d'un utilisateur
+
+    Appelé automatiquement après le commit d'une modification ou d'une
+    suppression d'utilisateur via l'ORM. À appeler explicitement après le
+    commit d'une mise à jour en masse (update(User)...) qui ne passe pas par
+    les événements ORM.
+    """
+    user_cache.invalidate(user_id)
+
+
+# Désactivation, changement de mot de passe ou d'email : le cache ne doit plus
+# servir l'ancienne version de l'utilisateur
+_WATCHED_ATTRIBUTES = ("is_active", "password_hash", "email")
+
+# Utilisateurs modifiés pendant la transaction, invalidés après le commit : une
+# requête concurrente lirait sinon, entre le flush et le commit, l'ancienne
+# ligne encore commitée et la remettrait en cache
+_CHANGED_USERS_KEY = "changed_users"
+
+
+def _mark_changed(target: User) -> None:
+    session = inspect(target).session
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS_KEY, set()).add(target.id)
+
+
+@event.listens_for(User, "after_update")
+def _track_updated_user(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in _WATCHED_ATTRIBUTES):
+        _mark_changed(target)
+
+
+@event.listens_for(User, "after_delete")
+def _track_deleted_user(mapper, connection, target: User) -> None:
+    _mark_changed(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    for user_id in session.info.pop(_CHANGED_USERS_KEY, ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(_CHANGED_USERS_KEY, None)
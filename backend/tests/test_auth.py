@@ -1,10 +1,16 @@
 """Tests for authentication routes."""
 
+import asyncio
 import pytest
+from datetime import datetime
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import User
+from app.utils.auth import (
+    hash_password, hash_password_async, verify_password_async, settings as auth_settings
+)
+from app.utils.user_cache import CachedUser, UserCache, user_cache
 
 
 class TestUserRegistration:
@@ -217,3 +223,157 @@ class TestCurrentUser:
             headers={"Authorization": "Bearer invalid.token.here"}
         )
         assert response.status_code == 401
+
+
+class TestCurrentUserCache:
+    """Tests for the authenticated user cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_requests_hit_cache(
+        self, client: AsyncClient, auth_headers: dict, test_user: User
+    ):
+        """Test that the same token is resolved from the cache after the first request."""
+        for _ in range(3):
+            response = await client.get("/api/auth/me", headers=auth_headers)
+            assert response.status_code == 200
+        
+        response = await client.get("/health/cache")
+        assert response.status_code == 200
+        stats = response.json()["user_cache"]
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+        assert stats["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_deactivation_invalidates_cache(
+        self, client: AsyncClient, auth_headers: dict,
+        test_user: User, db_session: AsyncSession
+    ):
+        """Test that a deactivated user is rejected despite a cached entry."""
+        response = await client.get("/api/auth/me", headers=auth_headers)
+        assert response.status_code == 200
+        
+        test_user.is_active = False
+        await db_session.commit()
+        
+        response = await client.get("/api/auth/me", headers=auth_headers)
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_password_change_invalidates_cache(
+        self, client: AsyncClient, auth_headers: dict,
+        test_user: User, db_session: AsyncSession
+    ):
+        """Test that changing the password drops the cached entry."""
+        await client.get("/api/auth/me", headers=auth_headers)
+        assert user_cache.stats()["size"] == 1
+        
+        test_user.password_hash = hash_password("newpassword123")
+        await db_session.commit()
+        
+        assert user_cache.stats()["size"] == 0
+        assert user_cache.stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_waits_for_commit(
+        self, client: AsyncClient, auth_headers: dict,
+        test_user: User, db_session: AsyncSession
+    ):
+        """Test that the cached entry is only dropped once the change is committed."""
+        await client.get("/api/auth/me", headers=auth_headers)
+        
+        test_user.is_active = False
+        await db_session.flush()
+        assert user_cache.stats()["size"] == 1
+        
+        await db_session.commit()
+        assert user_cache.stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rollback_keeps_cache(
+        self, client: AsyncClient, auth_headers: dict,
+        test_user: User, db_session: AsyncSession
+    ):
+        """Test that a rolled back change does not empty the cache."""
+        await client.get("/api/auth/me", headers=auth_headers)
+        
+        test_user.is_active = False
+        await db_session.flush()
+        await db_session.rollback()
+        
+        assert user_cache.stats()["size"] == 1
+        assert user_cache.stats()["invalidations"] == 0
+        response = await client.get("/api/auth/me", headers=auth_headers)
+        assert response.status_code == 200
+
+    def test_invalidate_counts_removed_entries_only(self):
+        """Test that invalidating an uncached user is not counted."""
+        cache = UserCache(ttl_seconds=60, max_size=2)
+        cache.invalidate(1)
+        assert cache.invalidations == 0
+        
+        cache.set(100, CachedUser(id=1, email="u1@example.com", is_active=True, created_at=datetime.now()))
+        cache.invalidate(1)
+        assert cache.invalidations == 1
+
+    def test_lru_eviction_and_ttl(self):
+        """Test the size bound and the expiry of entries."""
+        cache = UserCache(ttl_seconds=60, max_size=2)
+        users = [
+            CachedUser(id=i, email=f"u{i}@example.com", is_active=True, created_at=datetime.now())
+            for i in range(3)
+        ]
+        for user in users:
+            cache.set(100, user)
+        
+        assert cache.get(0, 100) is None
+        assert cache.get(2, 100) == users[2]
+        assert cache.get(2, 101) is None
+        assert cache.evictions == 1
+        
+        expired = UserCache(ttl_seconds=60, max_size=2)
+        expired.set(100, users[0])
+        expired._entries[(0, 100)] = (0.0, users[0])
+        assert expired.get(0, 100) is None
+
+
+class TestPasswordHashing:
+    """Tests for the password hashing worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_async_hash_roundtrip(self):
+        """Test hashing and verifying off the event loop with the configured cost."""
+        hashed = await hash_password_async("secretpassword")
+        assert hashed.startswith(f"$2b${auth_settings.BCRYPT_ROUNDS:02d}$")
+        assert await verify_password_async("secretpassword", hashed) is True
+        assert await verify_password_async("wrongpassword", hashed) is False
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self, monkeypatch):
+        """Test that other coroutines keep running while a hash is computed."""
+        monkeypatch.setattr(auth_settings, "BCRYPT_ROUNDS", 10)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await hash_password_async("secretpassword")
+        task.cancel()
+        assert ticks > 0
+
+    @pytest.mark.asyncio
+    async def test_login_rejected_when_pool_saturated(
+        self, client: AsyncClient, test_user: User, monkeypatch
+    ):
+        """Test that logins beyond the pending limit get a 503."""
+        monkeypatch.setattr(auth_settings, "PASSWORD_HASH_MAX_PENDING", 0)
+        response = await client.post(
+            "/api/auth/login",
+            json={"email": "test@example.com", "password": "testpassword123"}
+        )
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
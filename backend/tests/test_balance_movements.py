@@ -0,0 +1,277 @@
+"""Tests for the balance movements ledger and the /history endpoints."""
+
+import pytest
+from decimal import Decimal
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import Settings
+from app.models import User, BankAccount, Category, Envelope, BalanceMovement
+from app.scheduler import create_scheduler
+from app.services.balance_ledger import run_checkpoints
+from app.services.envelope_rollover import run_rollover
+
+
+async def _create_account(client: AsyncClient, auth_headers: dict, initial_balance: str = "1000.00"):
+    response = await client.post("/api/bank-accounts", headers=auth_headers, json={
+        "name": "Checking", "account_type": "checking", "initial_balance": initial_balance, "currency": "EUR"
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def _create_envelope(db_session: AsyncSession, user: User, account_id: int, balance: str):
+    envelope = Envelope(
+        user_id=user.id, name=f"Envelope {balance}", bank_account_id=account_id,
+        monthly_budget=Decimal("100"), current_balance=Decimal(balance)
+    )
+    db_session.add(envelope)
+    await db_session.commit()
+    return envelope.id
+
+
+async def _create_category(db_session: AsyncSession, user: User):
+    category = Category(user_id=user.id, name="Food")
+    db_session.add(category)
+    await db_session.commit()
+    return category.id
+
+
+async def _seed_envelope_checkpoints(db_session: AsyncSession):
+    # Enveloppes créées directement en base : pas de mouvement d'ouverture
+    for envelope in (await db_session.execute(select(Envelope))).scalars().all():
+        db_session.add(BalanceMovement(
+            user_id=envelope.user_id, entity_type="envelope", entity_id=envelope.id,
+            kind="checkpoint", amount=Decimal("0"), balance=envelope.current_balance
+        ))
+    await db_session.commit()
+
+
+async def _history(client: AsyncClient, auth_headers: dict, path: str, **params):
+    response = await client.get(f"/api/{path}/history", headers=auth_headers, params=params)
+    assert response.status_code == 200
+    return response
+
+
+class TestBalanceLedger:
+    """Tests for the movements written by the balance paths."""
+
+    @pytest.mark.asyncio
+    async def test_transaction_movements_and_running_balance(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test that transaction writes are journaled with the balance after each movement."""
+        account_id = await _create_account(client, auth_headers)
+        category_id = await _create_category(db_session, test_user)
+
+        response = await client.post("/api/transactions", headers=auth_headers, json={
+            "bank_account_id": account_id, "category_id": category_id,
+            "amount": "40.00", "transaction_type": "expense", "date": "2025-01-10"
+        })
+        transaction_id = response.json()["id"]
+        await client.put(f"/api/transactions/{transaction_id}", headers=auth_headers, json={"amount": "55.00"})
+        await client.delete(f"/api/transactions/{transaction_id}", headers=auth_headers)
+
+        movements = (await _history(client, auth_headers, f"bank-accounts/{account_id}")).json()
+        assert [(row["kind"], row["amount"], row["balance_after"]) for row in movements] == [
+            ("transaction", "55.00", "1000.00"),
+            ("transaction", "-15.00", "945.00"),
+            ("transaction", "-40.00", "960.00"),
+            ("opening", "1000.00", "1000.00"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_adjustment_is_journaled(
+        self, client: AsyncClient, auth_headers: dict, test_user: User
+    ):
+        """Test that a manual adjustment records the difference and its reason."""
+        account_id = await _create_account(client, auth_headers)
+
+        response = await client.post(
+            f"/api/bank-accounts/{account_id}/adjust", headers=auth_headers,
+            json={"new_balance": "987.65", "reason": "Bank fees"}
+        )
+        assert response.status_code == 200
+
+        latest = (await _history(client, auth_headers, f"bank-accounts/{account_id}")).json()[0]
+        assert (latest["kind"], latest["amount"], latest["balance_after"]) == ("adjustment", "-12.35", "987.65")
+        assert latest["description"] == "Bank fees"
+
+    @pytest.mark.asyncio
+    async def test_reconcile_does_not_cancel_adjustment(
+        self, client: AsyncClient, auth_headers: dict, test_user: User
+    ):
+        """Test that reconciling after an adjustment records no offsetting movement."""
+        account_id = await _create_account(client, auth_headers)
+        await client.post(
+            f"/api/bank-accounts/{account_id}/adjust", headers=auth_headers, json={"new_balance": "900"}
+        )
+
+        response = await client.post(f"/api/bank-accounts/{account_id}/reconcile?apply=true", headers=auth_headers)
+        assert response.json()["applied"] is False
+
+        movements = (await _history(client, auth_headers, f"bank-accounts/{account_id}")).json()
+        assert [(row["kind"], row["balance_after"]) for row in movements] == [
+            ("adjustment", "900.00"), ("opening", "1000.00")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reallocation_is_journaled(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test that both sides of a reallocation appear in the envelope histories."""
+        account_id = await _create_account(client, auth_headers)
+        source = await _create_envelope(db_session, test_user, account_id, "100")
+        destination = await _create_envelope(db_session, test_user, account_id, "0")
+        await _seed_envelope_checkpoints(db_session)
+
+        response = await client.post(f"/api/envelopes/{source}/reallocate", headers=auth_headers, json={
+            "from_envelope_id": source, "to_envelope_id": destination, "amount": "30", "description": "Groceries"
+        })
+        assert response.status_code == 200
+
+        latest = (await _history(client, auth_headers, f"envelopes/{source}")).json()[0]
+        assert (latest["kind"], latest["amount"], latest["balance_after"]) == ("reallocation", "-30.00", "70.00")
+        assert latest["description"] == "Groceries"
+        latest = (await _history(client, auth_headers, f"envelopes/{destination}")).json()[0]
+        assert (latest["kind"], latest["amount"], latest["balance_after"]) == ("reallocation", "30.00", "30.00")
+
+    @pytest.mark.asyncio
+    async def test_rollover_is_journaled(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that the monthly rollover records the amount credited to each envelope."""
+        account_id = await _create_account(client, auth_headers)
+        envelope_id = await _create_envelope(db_session, test_user, account_id, "0")
+
+        await run_rollover(session_factory, "2025-01")
+
+        movements = (await _history(client, auth_headers, f"envelopes/{envelope_id}")).json()
+        assert [(row["kind"], row["amount"], row["description"]) for row in movements] == [
+            ("rollover", "100.00", "2025-01")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_ledger_is_append_only(self, db_session: AsyncSession, test_user: User):
+        """Test that ORM updates of a movement are refused."""
+        movement = BalanceMovement(
+            user_id=test_user.id, entity_type="bank_account", entity_id=1, kind="adjustment", amount=Decimal("1")
+        )
+        db_session.add(movement)
+        await db_session.commit()
+
+        movement.amount = Decimal("2")
+        with pytest.raises(ValueError):
+            await db_session.commit()
+        await db_session.rollback()
+
+
+class TestBalanceHistory:
+    """Tests for the /history endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_keyset_pagination(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test that following X-Next-Cursor walks the whole history once."""
+        account_id = await _create_account(client, auth_headers)
+        category_id = await _create_category(db_session, test_user)
+        for amount in ("1.00", "2.00", "3.00", "4.00"):
+            await client.post("/api/transactions", headers=auth_headers, json={
+                "bank_account_id": account_id, "category_id": category_id,
+                "amount": amount, "transaction_type": "income", "date": "2025-01-10"
+            })
+
+        seen, params = [], {"limit": 2}
+        while True:
+            response = await _history(client, auth_headers, f"bank-accounts/{account_id}", **params)
+            seen.extend(response.json())
+            if "x-next-cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["x-next-cursor"]
+
+        assert [row["amount"] for row in seen] == ["4.00", "3.00", "2.00", "1.00", "1000.00"]
+        assert [row["balance_after"] for row in seen] == ["1010.00", "1006.00", "1003.00", "1001.00", "1000.00"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, client: AsyncClient, auth_headers: dict, test_user: User):
+        """Test that a malformed cursor is rejected."""
+        account_id = await _create_account(client, auth_headers)
+        response = await client.get(
+            f"/api/bank-accounts/{account_id}/history", headers=auth_headers, params={"cursor": "bad"}
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_history_of_other_user(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, second_user: User
+    ):
+        """Test that another user's account history is not visible."""
+        account = BankAccount(
+            user_id=second_user.id, name="Other", account_type="checking",
+            initial_balance=Decimal("0"), current_balance=Decimal("0"), currency="EUR"
+        )
+        db_session.add(account)
+        await db_session.commit()
+
+        response = await client.get(f"/api/bank-accounts/{account.id}/history", headers=auth_headers)
+        assert response.status_code == 404
+
+
+class TestBalanceCheckpoints:
+    """Tests for run_checkpoints."""
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_only_for_moved_entities(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that a checkpoint is written once per entity that moved since the last one."""
+        account_id = await _create_account(client, auth_headers)
+        await _create_envelope(db_session, test_user, account_id, "0")
+
+        outcome = await run_checkpoints(session_factory)
+        assert (outcome.users, outcome.checkpoints) == (1, 1)
+        outcome = await run_checkpoints(session_factory)
+        assert outcome.checkpoints == 0
+
+        await client.post(
+            f"/api/bank-accounts/{account_id}/adjust", headers=auth_headers, json={"new_balance": "900"}
+        )
+        outcome = await run_checkpoints(session_factory)
+        assert outcome.checkpoints == 1
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_resets_running_balance(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that balances after a checkpoint start from the recorded balance, drift included."""
+        account_id = await _create_account(client, auth_headers)
+        category_id = await _create_category(db_session, test_user)
+
+        # Écart hors journal (écriture directe en base)
+        await db_session.execute(
+            update(BankAccount).where(BankAccount.id == account_id).values(current_balance=Decimal("1500"))
+        )
+        await db_session.commit()
+        await run_checkpoints(session_factory)
+
+        await client.post("/api/transactions", headers=auth_headers, json={
+            "bank_account_id": account_id, "category_id": category_id,
+            "amount": "100.00", "transaction_type": "expense", "date": "2025-01-10"
+        })
+
+        movements = (await _history(client, auth_headers, f"bank-accounts/{account_id}")).json()
+        assert [(row["kind"], row["balance_after"]) for row in movements] == [
+            ("transaction", "1400.00"), ("checkpoint", "1500.00"), ("opening", "1000.00")
+        ]
+
+    def test_job_registered(self):
+        """Test that the checkpoint job follows the configured crontab."""
+        scheduler = create_scheduler(Settings(SECRET_KEY="test", BALANCE_CHECKPOINT_CRON="0 4 * * 0"))
+        job = scheduler.get_job("balance_checkpoints")
+        assert job is not None
+        assert "hour='4'" in str(job.trigger)
@@ -0,0 +1,204 @@
+"""Tests for point-in-time balances and the balance snapshots compaction."""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import Settings
+from app.models import User, BankAccount, Category, Envelope, BalanceSnapshot
+from app.scheduler import create_scheduler
+from app.services.balance_snapshots import closed_period_end, compact_snapshots
+
+TODAY = date(2025, 4, 10)
+
+
+async def _create_account_with_transactions(
+    client: AsyncClient, auth_headers: dict, db_session: AsyncSession, user: User
+):
+    response = await client.post("/api/bank-accounts", headers=auth_headers, json={
+        "name": "Checking", "account_type": "checking", "initial_balance": "1000.00", "currency": "EUR"
+    })
+    account_id = response.json()["id"]
+    category = Category(user_id=user.id, name="Food")
+    db_session.add(category)
+    await db_session.commit()
+
+    for amount, transaction_type, day in (
+        ("100.00", "expense", "2025-01-10"), ("50.00", "income", "2025-02-15"), ("20.00", "expense", "2025-03-05")
+    ):
+        await _add_transaction(client, auth_headers, account_id, category.id, amount, transaction_type, day)
+    return account_id, category.id
+
+
+async def _add_transaction(client, auth_headers, account_id, category_id, amount, transaction_type, day, **values):
+    response = await client.post("/api/transactions", headers=auth_headers, json={
+        "bank_account_id": account_id, "category_id": category_id,
+        "amount": amount, "transaction_type": transaction_type, "date": day, **values
+    })
+    assert response.status_code == 201
+
+
+async def _balance(client: AsyncClient, auth_headers: dict, path: str, as_of=None):
+    params = {"as_of": as_of} if as_of else {}
+    response = await client.get(f"/api/{path}/balance", headers=auth_headers, params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def _snapshots(db_session: AsyncSession, entity_id: int):
+    result = await db_session.execute(
+        select(BalanceSnapshot.snapshot_date, BalanceSnapshot.balance)
+        .where(BalanceSnapshot.entity_type == "bank_account", BalanceSnapshot.entity_id == entity_id)
+        .order_by(BalanceSnapshot.snapshot_date)
+    )
+    return [(snapshot_date, str(balance)) for snapshot_date, balance in result.all()]
+
+
+class TestBalanceAsOf:
+    """Tests for the /balance endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_account_balance_without_snapshots(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test balances computed back from the current balance by transaction date."""
+        account_id, _ = await _create_account_with_transactions(client, auth_headers, db_session, test_user)
+        path = f"bank-accounts/{account_id}"
+
+        assert (await _balance(client, auth_headers, path, "2024-12-31"))["balance"] == "1000.00"
+        assert (await _balance(client, auth_headers, path, "2025-01-31"))["balance"] == "900.00"
+        assert (await _balance(client, auth_headers, path, "2025-02-20"))["balance"] == "950.00"
+        data = await _balance(client, auth_headers, path)
+        assert (data["balance"], data["snapshot_date"]) == ("930.00", None)
+
+    @pytest.mark.asyncio
+    async def test_adjustment_counts_from_its_recording_date(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test that a manual adjustment only affects balances from the day it was made."""
+        account_id, _ = await _create_account_with_transactions(client, auth_headers, db_session, test_user)
+        await client.post(f"/api/bank-accounts/{account_id}/adjust", headers=auth_headers, json={"new_balance": "1000"})
+
+        path = f"bank-accounts/{account_id}"
+        assert (await _balance(client, auth_headers, path, "2025-03-31"))["balance"] == "930.00"
+        assert (await _balance(client, auth_headers, path))["balance"] == "1000.00"
+
+    @pytest.mark.asyncio
+    async def test_envelope_balance(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test envelope balances with transactions and a reallocation, before and after compaction."""
+        account_id, category_id = await _create_account_with_transactions(client, auth_headers, db_session, test_user)
+        groceries = Envelope(
+            user_id=test_user.id, name="Groceries", bank_account_id=account_id, current_balance=Decimal("100")
+        )
+        savings = Envelope(
+            user_id=test_user.id, name="Savings", bank_account_id=account_id, current_balance=Decimal("0")
+        )
+        db_session.add_all([groceries, savings])
+        await db_session.commit()
+        groceries_id, savings_id = groceries.id, savings.id
+
+        await _add_transaction(
+            client, auth_headers, account_id, category_id, "30.00", "expense", "2025-01-10", envelope_id=groceries_id
+        )
+        await client.post(f"/api/envelopes/{groceries_id}/reallocate", headers=auth_headers, json={
+            "from_envelope_id": groceries_id, "to_envelope_id": savings_id, "amount": "20"
+        })
+
+        path = f"envelopes/{groceries_id}"
+        expected = {"2025-01-05": "100.00", "2025-01-31": "70.00", None: "50.00"}
+        for as_of, balance in expected.items():
+            assert (await _balance(client, auth_headers, path, as_of))["balance"] == balance
+
+        await compact_snapshots(session_factory, TODAY)
+        for as_of, balance in expected.items():
+            assert (await _balance(client, auth_headers, path, as_of))["balance"] == balance
+
+    @pytest.mark.asyncio
+    async def test_other_user_account(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, second_user: User
+    ):
+        """Test that another user's account balance is not visible."""
+        account = BankAccount(
+            user_id=second_user.id, name="Other", account_type="checking",
+            initial_balance=Decimal("0"), current_balance=Decimal("0"), currency="EUR"
+        )
+        db_session.add(account)
+        await db_session.commit()
+
+        response = await client.get(f"/api/bank-accounts/{account.id}/balance", headers=auth_headers)
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_invalid_date(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test that a malformed as_of is rejected."""
+        account_id, _ = await _create_account_with_transactions(client, auth_headers, db_session, test_user)
+        response = await client.get(
+            f"/api/bank-accounts/{account_id}/balance", headers=auth_headers, params={"as_of": "2025-13-01"}
+        )
+        assert response.status_code == 422
+
+
+class TestBalanceSnapshots:
+    """Tests for compact_snapshots."""
+
+    def test_closed_period_end(self):
+        """Test that a month is compacted from the 2nd of the next month."""
+        assert closed_period_end(date(2025, 4, 10)) == date(2025, 3, 31)
+        assert closed_period_end(date(2025, 4, 2)) == date(2025, 3, 31)
+        assert closed_period_end(date(2025, 4, 1)) == date(2025, 2, 28)
+        assert closed_period_end(date(2025, 1, 1)) == date(2024, 11, 30)
+
+    @pytest.mark.asyncio
+    async def test_monthly_snapshots(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that one snapshot per elapsed month is written once and used by the endpoint."""
+        account_id, _ = await _create_account_with_transactions(client, auth_headers, db_session, test_user)
+
+        outcome = await compact_snapshots(session_factory, TODAY)
+        assert (outcome.period_end, outcome.users, outcome.snapshots) == (date(2025, 3, 31), 1, 3)
+        assert await _snapshots(db_session, account_id) == [
+            (date(2025, 1, 31), "900.00"), (date(2025, 2, 28), "950.00"), (date(2025, 3, 31), "930.00")
+        ]
+        assert (await compact_snapshots(session_factory, TODAY)).snapshots == 0
+
+        data = await _balance(client, auth_headers, f"bank-accounts/{account_id}", "2025-02-20")
+        assert (data["balance"], data["snapshot_date"]) == ("950.00", "2025-01-31")
+
+        outcome = await compact_snapshots(session_factory, date(2025, 5, 2))
+        assert outcome.snapshots == 1
+        assert (await _snapshots(db_session, account_id))[-1] == (date(2025, 4, 30), "930.00")
+
+    @pytest.mark.asyncio
+    async def test_backdated_transaction_invalidates_snapshots(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that a write in a compacted month drops the later snapshots until the next run."""
+        account_id, category_id = await _create_account_with_transactions(client, auth_headers, db_session, test_user)
+        await compact_snapshots(session_factory, TODAY)
+
+        await _add_transaction(client, auth_headers, account_id, category_id, "10.00", "expense", "2025-02-10")
+        assert await _snapshots(db_session, account_id) == [(date(2025, 1, 31), "900.00")]
+        data = await _balance(client, auth_headers, f"bank-accounts/{account_id}", "2025-03-31")
+        assert (data["balance"], data["snapshot_date"]) == ("920.00", "2025-01-31")
+
+        assert (await compact_snapshots(session_factory, TODAY)).snapshots == 2
+        data = await _balance(client, auth_headers, f"bank-accounts/{account_id}", "2025-03-31")
+        assert (data["balance"], data["snapshot_date"]) == ("920.00", "2025-03-31")
+
+    def test_job_registered(self):
+        """Test that the compaction job follows the configured crontab."""
+        scheduler = create_scheduler(Settings(SECRET_KEY="test", BALANCE_SNAPSHOT_CRON="0 3 * * *"))
+        job = scheduler.get_job("balance_snapshots")
+        assert job is not None
+        assert "hour='3'" in str(job.trigger)
@@ -1,11 +1,12 @@
 """Tests for bank accounts routes."""
 
 import pytest
+from datetime import date
 from decimal import Decimal
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import User, BankAccount
+from app.models import User, BankAccount, Category, Transaction
 
 
 class TestBankAccountCRUD:
@@ -270,6 +271,108 @@ class TestBankAccountAdjustBalance:
         assert float(data["current_balance"]) == -150.00
 
 
+class TestBankAccountReconcile:
+    """Tests pour la réconciliation des soldes."""
+
+    @pytest.mark.asyncio
+    async def test_reconcile_reports_and_fixes_drift(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that reconcile recomputes the balance from transactions."""
+        account = BankAccount(
+            user_id=test_user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        category = Category(user_id=test_user.id, name="Misc")
+        db_session.add_all([account, category])
+        await db_session.commit()
+        
+        # Transactions insérées sans passer par l'API : le solde n'est pas à jour
+        db_session.add_all([
+            Transaction(
+                user_id=test_user.id, bank_account_id=account.id, category_id=category.id,
+                amount=Decimal("120"), transaction_type="expense", date=date.today()
+            ),
+            Transaction(
+                user_id=test_user.id, bank_account_id=account.id, category_id=category.id,
+                amount=Decimal("20"), transaction_type="income", date=date.today()
+            ),
+        ])
+        await db_session.commit()
+
+        response = await client.post(
+            f"/api/bank-accounts/{account.id}/reconcile", headers=auth_headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert Decimal(data["recorded_balance"]) == Decimal("1000")
+        assert Decimal(data["computed_balance"]) == Decimal("900")
+        assert Decimal(data["drift"]) == Decimal("100")
+        assert data["transaction_count"] == 2
+        assert data["applied"] is False
+
+        response = await client.post(
+            f"/api/bank-accounts/{account.id}/reconcile?apply=true", headers=auth_headers
+        )
+        assert response.json()["applied"] is True
+        
+        response = await client.post(
+            f"/api/bank-accounts/{account.id}/reconcile", headers=auth_headers
+        )
+        data = response.json()
+        assert Decimal(data["drift"]) == Decimal("0")
+        assert Decimal(data["recorded_balance"]) == Decimal("900")
+
+    @pytest.mark.asyncio
+    async def test_reconcile_keeps_manual_adjustment(
+        self, client: AsyncClient, auth_headers: dict, test_user: User
+    ):
+        """Test that a manual adjustment is not reported as drift nor undone by apply."""
+        response = await client.post("/api/bank-accounts", headers=auth_headers, json={
+            "name": "Account", "account_type": "checking", "initial_balance": "1000.00", "currency": "EUR"
+        })
+        account_id = response.json()["id"]
+        
+        await client.post(
+            f"/api/bank-accounts/{account_id}/adjust", headers=auth_headers,
+            json={"new_balance": "950.00", "reason": "Bank fees"}
+        )
+        
+        response = await client.post(
+            f"/api/bank-accounts/{account_id}/reconcile", headers=auth_headers
+        )
+        data = response.json()
+        assert Decimal(data["computed_balance"]) == Decimal("950")
+        assert Decimal(data["drift"]) == Decimal("0")
+        
+        response = await client.post(
+            f"/api/bank-accounts/{account_id}/reconcile?apply=true", headers=auth_headers
+        )
+        assert response.json()["applied"] is False
+        
+        response = await client.get(f"/api/bank-accounts/{account_id}", headers=auth_headers)
+        assert Decimal(response.json()["current_balance"]) == Decimal("950")
+
+    @pytest.mark.asyncio
+    async def test_cannot_reconcile_other_user_account(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, second_user: User
+    ):
+        """Test that users cannot reconcile other users' accounts."""
+        account = BankAccount(
+            user_id=second_user.id, name="Other", account_type="checking",
+            initial_balance=Decimal("10"), current_balance=Decimal("10"), currency="EUR"
+        )
+        db_session.add(account)
+        await db_session.commit()
+
+        response = await client.post(
+            f"/api/bank-accounts/{account.id}/reconcile", headers=auth_headers
+        )
+        assert response.status_code == 404
+
+
 class TestBankAccountFilters:
     """Tests for bank account filtering."""
 
@@ -2,9 +2,11 @@
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import User, Category
+from app.models import User, Category, CategoryClosure
+from app.services.category_closure import rebuild_category_closure
 
 
 class TestCategoryCRUD:
@@ -212,6 +214,200 @@ class TestCategoryTree:
         assert len(data[0]["children"]) == 2
         assert data[1]["children"] == []
 
+    async def _create_chain(self, db_session: AsyncSession, test_user: User):
+        """Crée Root > Level 1 > Level 2 et retourne les catégories."""
+        root = Category(user_id=test_user.id, name="Root")
+        db_session.add(root)
+        await db_session.commit()
+        level1 = Category(user_id=test_user.id, name="Level 1", parent_id=root.id)
+        db_session.add(level1)
+        await db_session.commit()
+        level2 = Category(user_id=test_user.id, name="Level 2", parent_id=level1.id)
+        db_session.add(level2)
+        await db_session.commit()
+        return root, level1, level2
+
+    @pytest.mark.asyncio
+    async def test_tree_nests_all_levels(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test that grandchildren are nested under their parent."""
+        await self._create_chain(db_session, test_user)
+
+        response = await client.get("/api/categories/tree", headers=auth_headers)
+        assert response.status_code == 200
+        root = response.json()[0]
+        assert root["children"][0]["name"] == "Level 1"
+        assert root["children"][0]["children"][0]["name"] == "Level 2"
+
+    @pytest.mark.asyncio
+    async def test_tree_depth(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test limiting the number of levels returned."""
+        await self._create_chain(db_session, test_user)
+
+        response = await client.get("/api/categories/tree?depth=0", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()[0]["children"] == []
+
+        response = await client.get("/api/categories/tree?depth=1", headers=auth_headers)
+        level1 = response.json()[0]["children"][0]
+        assert level1["name"] == "Level 1"
+        assert level1["children"] == []
+
+        response = await client.get("/api/categories/tree?depth=-1", headers=auth_headers)
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_tree_root_id(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test fetching the subtree of one category."""
+        _, level1, _ = await self._create_chain(db_session, test_user)
+
+        response = await client.get(f"/api/categories/tree?root_id={level1.id}", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["name"] == "Level 1"
+        assert data[0]["children"][0]["name"] == "Level 2"
+
+        response = await client.get("/api/categories/tree?root_id=99999", headers=auth_headers)
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_tree_keeps_sort_order(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test that siblings keep the sort_order, name ordering in a large tree."""
+        roots = [Category(user_id=test_user.id, name=f"Root {i:02d}", sort_order=20 - i) for i in range(20)]
+        db_session.add_all(roots)
+        await db_session.commit()
+        db_session.add_all([
+            Category(user_id=test_user.id, name=f"Child {j:02d}", parent_id=root.id, sort_order=j % 3)
+            for root in roots for j in range(10)
+        ])
+        await db_session.commit()
+
+        response = await client.get("/api/categories/tree", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert [node["name"] for node in data] == [f"Root {i:02d}" for i in reversed(range(20))]
+        expected_children = [f"Child {j:02d}" for j in sorted(range(10), key=lambda j: (j % 3, j))]
+        for node in data:
+            assert [child["name"] for child in node["children"]] == expected_children
+
+
+class TestCategoryClosure:
+    """Tests for the category closure table."""
+
+    async def _closure(self, db_session: AsyncSession):
+        result = await db_session.execute(
+            select(CategoryClosure.ancestor_id, CategoryClosure.descendant_id, CategoryClosure.depth)
+            .order_by(CategoryClosure.ancestor_id, CategoryClosure.descendant_id)
+        )
+        return [tuple(row) for row in result]
+
+    async def _create(self, client: AsyncClient, auth_headers: dict, name: str, parent_id=None) -> int:
+        response = await client.post(
+            "/api/categories", headers=auth_headers, json={"name": name, "parent_id": parent_id}
+        )
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    @pytest.mark.asyncio
+    async def test_closure_maintained_by_writes(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession
+    ):
+        """Test closure rows after create, re-parent and delete."""
+        food = await self._create(client, auth_headers, "Food")
+        restaurant = await self._create(client, auth_headers, "Restaurant", food)
+        fast_food = await self._create(client, auth_headers, "Fast food", restaurant)
+        leisure = await self._create(client, auth_headers, "Leisure")
+        
+        assert await self._closure(db_session) == sorted([
+            (food, food, 0), (food, restaurant, 1), (food, fast_food, 2),
+            (restaurant, restaurant, 0), (restaurant, fast_food, 1),
+            (fast_food, fast_food, 0), (leisure, leisure, 0),
+        ])
+        
+        # Déplacer Restaurant (et son sous-arbre) sous Leisure
+        response = await client.put(
+            f"/api/categories/{restaurant}", headers=auth_headers, json={"parent_id": leisure}
+        )
+        assert response.status_code == 200
+        assert await self._closure(db_session) == sorted([
+            (food, food, 0),
+            (restaurant, restaurant, 0), (restaurant, fast_food, 1),
+            (fast_food, fast_food, 0),
+            (leisure, leisure, 0), (leisure, restaurant, 1), (leisure, fast_food, 2),
+        ])
+        
+        response = await client.get(f"/api/categories/{fast_food}/path", headers=auth_headers)
+        assert response.status_code == 200
+        assert [c["name"] for c in response.json()] == ["Leisure", "Restaurant", "Fast food"]
+        
+        response = await client.delete(f"/api/categories/{fast_food}", headers=auth_headers)
+        assert response.status_code == 204
+        assert (fast_food, fast_food, 0) not in await self._closure(db_session)
+        assert all(fast_food not in row[:2] for row in await self._closure(db_session))
+        
+        # La table reconstruite est identique à la table maintenue
+        maintained = await self._closure(db_session)
+        await rebuild_category_closure(db_session)
+        await db_session.commit()
+        assert await self._closure(db_session) == maintained
+
+    @pytest.mark.asyncio
+    async def test_cannot_move_under_descendant(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test that re-parenting under a subcategory is rejected."""
+        food = await self._create(client, auth_headers, "Food")
+        restaurant = await self._create(client, auth_headers, "Restaurant", food)
+        fast_food = await self._create(client, auth_headers, "Fast food", restaurant)
+        
+        response = await client.put(
+            f"/api/categories/{food}", headers=auth_headers, json={"parent_id": fast_food}
+        )
+        assert response.status_code == 400
+        
+        response = await client.get(f"/api/categories/{food}", headers=auth_headers)
+        assert response.json()["parent_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_rebuild_closure(
+        self, db_session: AsyncSession, test_user: User, second_user: User
+    ):
+        """Test rebuilding the closure table, for all users or one."""
+        parent = Category(user_id=test_user.id, name="Parent")
+        other = Category(user_id=second_user.id, name="Other")
+        db_session.add_all([parent, other])
+        await db_session.commit()
+        child = Category(user_id=test_user.id, name="Child", parent_id=parent.id)
+        db_session.add(child)
+        await db_session.commit()
+        maintained = await self._closure(db_session)
+        
+        await db_session.execute(CategoryClosure.__table__.delete())
+        assert await rebuild_category_closure(db_session, test_user.id) == 3
+        assert await rebuild_category_closure(db_session) == 4
+        await db_session.commit()
+        assert await self._closure(db_session) == maintained
+
+    @pytest.mark.asyncio
+    async def test_path_of_other_user_category(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, second_user: User
+    ):
+        """Test that the path of another user's category is not found."""
+        other = Category(user_id=second_user.id, name="Other")
+        db_session.add(other)
+        await db_session.commit()
+        
+        response = await client.get(f"/api/categories/{other.id}/path", headers=auth_headers)
+        assert response.status_code == 404
+
 
 class TestCategoryFilters:
     """Tests for category filtering."""
@@ -307,3 +503,88 @@ class TestCategoryIsolation:
         # Doit voir seulement sa propre catégorie
         assert len(data) == 1
         assert data[0]["name"] == "Own Category"
+
+
+class TestCategoryConditionalGet:
+    """Tests for ETag / If-None-Match on category lists."""
+
+    @pytest.mark.asyncio
+    async def test_not_modified_skips_list_query(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that a matching ETag returns 304 without querying categories."""
+        db_session.add(Category(user_id=test_user.id, name="Food"))
+        await db_session.commit()
+        
+        response = await client.get("/api/categories", headers=auth_headers)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert etag.startswith('"categories-')
+        
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = await client.get(
+                "/api/categories", headers={**auth_headers, "If-None-Match": etag}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert not any("FROM categories" in statement for statement in statements)
+
+    @pytest.mark.asyncio
+    async def test_write_changes_etag(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that creating, updating and deleting a category changes the ETag."""
+        response = await client.get("/api/categories", headers=auth_headers)
+        etags = [response.headers["etag"]]
+        
+        response = await client.post("/api/categories", headers=auth_headers, json={"name": "Food"})
+        category_id = response.json()["id"]
+        response = await client.get("/api/categories", headers=auth_headers)
+        etags.append(response.headers["etag"])
+        
+        await client.put(f"/api/categories/{category_id}", headers=auth_headers, json={"name": "Groceries"})
+        response = await client.get(
+            "/api/categories", headers={**auth_headers, "If-None-Match": etags[-1]}
+        )
+        assert response.status_code == 200
+        assert response.json()[0]["name"] == "Groceries"
+        etags.append(response.headers["etag"])
+        
+        await client.delete(f"/api/categories/{category_id}", headers=auth_headers)
+        response = await client.get("/api/categories/tree", headers=auth_headers)
+        assert response.json() == []
+        
+        assert len(set(etags)) == 3
+
+    @pytest.mark.asyncio
+    async def test_etag_depends_on_query_and_user(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User, second_user: User
+    ):
+        """Test that filters and other users' writes are taken into account."""
+        response = await client.get("/api/categories", headers=auth_headers)
+        etag = response.headers["etag"]
+        
+        response = await client.get("/api/categories?search=foo", headers=auth_headers)
+        assert response.headers["etag"] != etag
+        
+        # Une écriture d'un autre utilisateur ne change pas la version
+        db_session.add(Category(user_id=second_user.id, name="Other"))
+        await db_session.commit()
+        response = await client.get(
+            "/api/categories", headers={**auth_headers, "If-None-Match": f'W/{etag}'}
+        )
+        assert response.status_code == 304
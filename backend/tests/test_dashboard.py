@@ -0,0 +1,147 @@
+"""Tests for the dashboard route."""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User, BankAccount, Category, Envelope, WishList, WishListItem
+
+
+async def _create_data(db_session: AsyncSession, user: User):
+    checking = BankAccount(
+        user_id=user.id, name="Checking", account_type="checking",
+        initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+    )
+    closed = BankAccount(
+        user_id=user.id, name="Closed", account_type="savings",
+        initial_balance=Decimal("50"), current_balance=Decimal("50"), currency="EUR", is_active=False
+    )
+    food = Category(user_id=user.id, name="Food")
+    salary = Category(user_id=user.id, name="Salary")
+    wish_list = WishList(user_id=user.id, name="Noël", list_type="to_give")
+    db_session.add_all([checking, closed, food, salary, wish_list])
+    await db_session.commit()
+    
+    db_session.add_all([
+        Envelope(
+            user_id=user.id, name="Groceries", bank_account_id=checking.id,
+            monthly_budget=Decimal("400"), current_balance=Decimal("100")
+        ),
+        WishListItem(wish_list_id=wish_list.id, name="Livre", price=Decimal("20"), quantity=2, status="purchased"),
+        WishListItem(wish_list_id=wish_list.id, name="Jeu", price=Decimal("60")),
+    ])
+    await db_session.commit()
+    return checking, food, salary
+
+
+class TestDashboard:
+    """Tests for GET /api/dashboard."""
+
+    @pytest.mark.asyncio
+    async def test_dashboard(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that the dashboard gathers every section in one response."""
+        checking, food, salary = await _create_data(db_session, test_user)
+        month = date.today().strftime("%Y-%m")
+        
+        for day, amount, category, kind in [
+            ("01", 2000, salary, "income"),
+            ("02", 30, food, "expense"),
+            ("03", 12.5, food, "expense"),
+        ]:
+            await client.post("/api/transactions", headers=auth_headers, json={
+                "bank_account_id": checking.id, "category_id": category.id,
+                "amount": amount, "transaction_type": kind, "date": f"{month}-{day}",
+                "description": f"Opération {day}"
+            })
+        
+        response = await client.get("/api/dashboard", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["email"] == "test@example.com"
+        assert data["totals"]["account_count"] == 1
+        assert float(data["totals"]["total_balance"]) == 1000 + 2000 - 30 - 12.5
+        assert data["totals"]["active_envelopes"] == 1
+        assert data["totals"]["wish_list_count"] == 1
+        
+        assert [account["name"] for account in data["accounts"]] == ["Checking"]
+        assert data["envelopes"][0]["fill_percent"] == 25.0
+        
+        assert data["month"]["year_month"] == month
+        assert data["month"]["total_income"] == 2000.0
+        assert data["month"]["total_expense"] == 42.5
+        assert data["month"]["transaction_count"] == 3
+        assert data["month"]["categories"][0] == {
+            "category_id": food.id, "name": "Food", "total_income": 0.0, "total_expense": 42.5
+        }
+        
+        assert [t["description"] for t in data["recent_transactions"]] == [
+            "Opération 03", "Opération 02", "Opération 01"
+        ]
+        assert data["recent_transactions"][0]["category_name"] == "Food"
+        
+        wish_list = data["wish_lists"][0]
+        assert wish_list["total_items"] == 2
+        assert wish_list["purchased_items"] == 1
+        assert float(wish_list["total_cost"]) == 100.0
+        assert float(wish_list["purchased_cost"]) == 40.0
+        assert wish_list["completion_percent"] == 50.0
+
+    @pytest.mark.asyncio
+    async def test_dashboard_etag(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that an unchanged dashboard is revalidated with 304."""
+        checking, food, salary = await _create_data(db_session, test_user)
+        
+        response = await client.get("/api/dashboard", headers=auth_headers)
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == "private, no-cache"
+        
+        response = await client.get(
+            "/api/dashboard", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        
+        # Une écriture change le contenu, donc l'ETag
+        await client.post("/api/transactions", headers=auth_headers, json={
+            "bank_account_id": checking.id, "category_id": food.id,
+            "amount": 10, "transaction_type": "expense", "date": date.today().isoformat()
+        })
+        response = await client.get(
+            "/api/dashboard", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_dashboard_empty_and_isolated(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, second_user: User
+    ):
+        """Test an empty dashboard does not show other users' data."""
+        await _create_data(db_session, second_user)
+        
+        response = await client.get("/api/dashboard", headers=auth_headers, params={"month": "2025-01"})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["totals"]["account_count"] == 0
+        assert float(data["totals"]["total_balance"]) == 0
+        assert data["accounts"] == data["envelopes"] == data["wish_lists"] == []
+        assert data["recent_transactions"] == []
+        assert data["month"]["year_month"] == "2025-01"
+        assert data["month"]["transaction_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_dashboard_requires_auth(self, client: AsyncClient):
+        """Test that the dashboard requires authentication."""
+        response = await client.get("/api/dashboard")
+        assert response.status_code in (401, 403)
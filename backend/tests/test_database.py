@@ -0,0 +1,184 @@
+"""
+Tests pour la configuration de l'engine de base de données
+"""
+import pytest
+import pytest_asyncio
+from decimal import Decimal
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import get_settings
+from app.database import (
+    Base, ReplicaRouter, async_database_url, configure_engine, describe_engine,
+    engine_options, replica_router, sqlite_pragmas
+)
+from app.models.bank_account import BankAccount
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.utils.sql import year_month
+
+
+settings = get_settings()
+
+
+class TestEngineProfile:
+    """Tests pour le profil de l'engine."""
+
+    def test_pool_options_for_server_databases(self):
+        """Test that pool settings only apply to server databases."""
+        options = engine_options("postgresql+asyncpg://user:pwd@db/cash", settings)
+        assert options["pool_size"] == settings.DB_POOL_SIZE
+        assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+        assert options["pool_recycle"] == settings.DB_POOL_RECYCLE
+        assert options["echo"] is settings.DB_ECHO
+        
+        options = engine_options("sqlite+aiosqlite:///./cash.db", settings)
+        assert "pool_size" not in options
+
+    def test_no_wal_for_memory_database(self):
+        """Test that the journal mode is left alone for in-memory SQLite."""
+        assert "journal_mode" not in sqlite_pragmas("sqlite+aiosqlite:///:memory:", settings)
+        assert "journal_mode" in sqlite_pragmas("sqlite+aiosqlite:///./cash.db", settings)
+
+    @pytest.mark.asyncio
+    async def test_sqlite_pragmas_applied_on_connect(self, tmp_path):
+        """Test that WAL and the other pragmas are set on each connection."""
+        url = f"sqlite+aiosqlite:///{tmp_path / 'cash.db'}"
+        test_engine = configure_engine(create_async_engine(url), settings)
+        try:
+            summary = await describe_engine(test_engine)
+        finally:
+            await test_engine.dispose()
+        
+        assert "journal_mode=wal" in summary
+        assert "synchronous=1" in summary
+        assert f"busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}" in summary
+        assert f"cache_size={settings.SQLITE_CACHE_SIZE}" in summary
+
+
+class TestDialectPortability:
+    """Tests pour la portabilité SQLite / PostgreSQL."""
+
+    def test_async_driver_added_to_url(self):
+        """Test that driverless URLs get the async driver."""
+        assert async_database_url("sqlite:///./cash.db") == "sqlite+aiosqlite:///./cash.db"
+        assert async_database_url("postgresql://u:p@db/cash") == "postgresql+asyncpg://u:p@db/cash"
+        assert async_database_url("postgres://u:p@db/cash") == "postgresql+asyncpg://u:p@db/cash"
+        assert async_database_url("postgresql+asyncpg://db/cash") == "postgresql+asyncpg://db/cash"
+
+    def test_year_month_per_dialect(self):
+        """Test that the month grouping compiles for both databases."""
+        query = select(year_month(Transaction.date))
+        assert "strftime('%Y-%m', transactions.date)" in str(query.compile(dialect=sqlite.dialect()))
+        assert "to_char(transactions.date, 'YYYY-MM')" in str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest_asyncio.fixture
+async def replica(tmp_path, monkeypatch):
+    """Réplica SQLite sur fichier, vide, branché sur le routeur de l'application."""
+    router = ReplicaRouter()
+    router.configure([f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"], settings)
+    async with router.replicas[0].engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    monkeypatch.setattr(replica_router, "replicas", router.replicas)
+    monkeypatch.setattr(replica_router, "_last_writes", {})
+    yield router.replicas[0]
+    await router.dispose()
+
+
+class TestReplicaRouting:
+    """Tests pour le routage des lectures vers les réplicas."""
+
+    @pytest.mark.asyncio
+    async def test_round_robin_skips_unhealthy_replicas(self, tmp_path):
+        """Test that reads rotate over healthy replicas only."""
+        router = ReplicaRouter(health_check_seconds=30)
+        router.configure([
+            f"sqlite+aiosqlite:///{tmp_path / 'a.db'}",
+            f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'b.db'}",
+            f"sqlite+aiosqlite:///{tmp_path / 'c.db'}",
+        ], settings)
+        try:
+            a, b, c = router.replicas
+            picks = [await router.pick() for _ in range(4)]
+            assert picks == [a.session_factory, c.session_factory, a.session_factory, c.session_factory]
+            assert b.healthy is False
+        finally:
+            await router.dispose()
+
+    @pytest.mark.asyncio
+    async def test_primary_when_no_replica_available(self, tmp_path):
+        """Test the fallback to the primary."""
+        router = ReplicaRouter()
+        assert await router.pick() is None
+        
+        router.configure([f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'a.db'}"], settings)
+        try:
+            assert await router.pick() is None
+        finally:
+            await router.dispose()
+
+    @pytest.mark.asyncio
+    async def test_sticky_window_after_write(self, tmp_path):
+        """Test that a user reads from the primary right after a write."""
+        router = ReplicaRouter(sticky_seconds=60)
+        router.configure([f"sqlite+aiosqlite:///{tmp_path / 'a.db'}"], settings)
+        try:
+            router.record_write(1)
+            assert await router.pick(1) is None
+            assert await router.pick(2) is router.replicas[0].session_factory
+            
+            router.sticky_seconds = 0
+            assert await router.pick(1) is router.replicas[0].session_factory
+        finally:
+            await router.dispose()
+
+    @pytest.mark.asyncio
+    async def test_get_endpoints_read_from_replica(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session, test_user: User, replica
+    ):
+        """Test that list endpoints use the replica until the user writes."""
+        db_session.add(BankAccount(
+            user_id=test_user.id, name="Primary only", account_type="checking",
+            initial_balance=Decimal("0"), current_balance=Decimal("0"), currency="EUR"
+        ))
+        await db_session.commit()
+        
+        # Le réplica (vide) sert la lecture
+        response = await client.get("/api/bank-accounts", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json() == []
+        
+        # Après une écriture, l'utilisateur lit sur le primaire
+        response = await client.post(
+            "/api/bank-accounts", headers=auth_headers,
+            json={"name": "New", "account_type": "savings", "initial_balance": 10}
+        )
+        assert response.status_code == 201
+        
+        response = await client.get("/api/bank-accounts", headers=auth_headers)
+        assert {account["name"] for account in response.json()} == {"Primary only", "New"}
+
+    @pytest.mark.asyncio
+    async def test_replica_reads_are_not_cached(
+        self, client: AsyncClient, auth_headers: dict, test_user: User, replica
+    ):
+        """Test that only primary reads populate the response cache."""
+        for _ in range(2):
+            response = await client.get("/api/bank-accounts", headers=auth_headers)
+            assert (response.json(), response.headers["X-Cache"]) == ([], "MISS")
+        
+        await client.post(
+            "/api/bank-accounts", headers=auth_headers,
+            json={"name": "New", "account_type": "savings", "initial_balance": 10}
+        )
+        
+        response = await client.get("/api/bank-accounts", headers=auth_headers)
+        assert response.headers["X-Cache"] == "MISS"
+        response = await client.get("/api/bank-accounts", headers=auth_headers)
+        assert response.headers["X-Cache"] == "HIT"
+        assert [account["name"] for account in response.json()] == ["New"]
@@ -0,0 +1,154 @@
+"""Tests for the monthly envelope rollover."""
+
+import pytest
+from decimal import Decimal
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import Settings
+from app.models import User, BankAccount, Envelope, EnvelopeRolloverRun
+from app.scheduler import create_scheduler
+from app.services.envelope_rollover import run_rollover
+
+
+async def _create_envelopes(db_session: AsyncSession, user: User):
+    account = BankAccount(
+        user_id=user.id, name="Checking", account_type="checking",
+        initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+    )
+    db_session.add(account)
+    await db_session.commit()
+
+    carry_over = Envelope(
+        user_id=user.id, name="Groceries", bank_account_id=account.id,
+        monthly_budget=Decimal("400"), current_balance=Decimal("50")
+    )
+    reset = Envelope(
+        user_id=user.id, name="Leisure", bank_account_id=account.id,
+        monthly_budget=Decimal("100"), current_balance=Decimal("30"), rollover_policy="reset"
+    )
+    inactive = Envelope(
+        user_id=user.id, name="Old", bank_account_id=account.id,
+        monthly_budget=Decimal("200"), current_balance=Decimal("10"), is_active=False
+    )
+    db_session.add_all([carry_over, reset, inactive])
+    await db_session.commit()
+    return carry_over, reset, inactive
+
+
+async def _balances(db_session: AsyncSession, user: User):
+    result = await db_session.execute(
+        select(Envelope.name, Envelope.current_balance)
+        .where(Envelope.user_id == user.id)
+        .order_by(Envelope.name)
+        .execution_options(populate_existing=True)
+    )
+    return dict(result.all())
+
+
+class TestEnvelopeRollover:
+    """Tests for run_rollover."""
+
+    @pytest.mark.asyncio
+    async def test_rollover_policies(
+        self, db_session: AsyncSession, session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test carry-over and reset policies; inactive envelopes are untouched."""
+        await _create_envelopes(db_session, test_user)
+
+        outcome = await run_rollover(session_factory, "2025-01")
+        assert (outcome.users, outcome.envelopes, outcome.batches) == (1, 2, 1)
+        assert await _balances(db_session, test_user) == {
+            "Groceries": Decimal("450.00"), "Leisure": Decimal("100.00"), "Old": Decimal("10.00")
+        }
+
+        run = (await db_session.execute(select(EnvelopeRolloverRun))).scalar_one()
+        assert (run.user_id, run.year_month, run.envelope_count) == (test_user.id, "2025-01", 2)
+        assert run.total_budget == Decimal("500")
+
+    @pytest.mark.asyncio
+    async def test_rollover_is_idempotent(
+        self, db_session: AsyncSession, session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that running twice for the same month funds once."""
+        await _create_envelopes(db_session, test_user)
+
+        await run_rollover(session_factory, "2025-01")
+        outcome = await run_rollover(session_factory, "2025-01")
+        assert (outcome.users, outcome.envelopes) == (0, 0)
+        assert (await _balances(db_session, test_user))["Groceries"] == Decimal("450.00")
+
+        await run_rollover(session_factory, "2025-02")
+        assert (await _balances(db_session, test_user))["Groceries"] == Decimal("850.00")
+
+    @pytest.mark.asyncio
+    async def test_rollover_batches(
+        self, db_session: AsyncSession, session_factory: async_sessionmaker,
+        test_user: User, second_user: User
+    ):
+        """Test that users are processed in several batches."""
+        await _create_envelopes(db_session, test_user)
+        await _create_envelopes(db_session, second_user)
+
+        outcome = await run_rollover(session_factory, "2025-01", batch_size=1)
+        assert (outcome.users, outcome.envelopes, outcome.batches) == (2, 4, 2)
+        for user in (test_user, second_user):
+            assert (await _balances(db_session, user))["Leisure"] == Decimal("100.00")
+
+    @pytest.mark.asyncio
+    async def test_rollover_refreshes_envelope_list(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that the cached list and its ETag change after a rollover."""
+        await _create_envelopes(db_session, test_user)
+
+        response = await client.get("/api/envelopes", headers=auth_headers)
+        etag = response.headers["etag"]
+
+        await run_rollover(session_factory, "2025-01")
+
+        response = await client.get("/api/envelopes", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["x-cache"] == "MISS"
+        balances = {envelope["name"]: envelope["current_balance"] for envelope in response.json()}
+        assert balances["Groceries"] == "450.00"
+
+    @pytest.mark.asyncio
+    async def test_envelope_rollover_policy_field(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test setting the rollover policy through the API."""
+        carry_over, _, _ = await _create_envelopes(db_session, test_user)
+
+        response = await client.put(
+            f"/api/envelopes/{carry_over.id}", headers=auth_headers, json={"rollover_policy": "reset"}
+        )
+        assert response.status_code == 200
+        assert response.json()["rollover_policy"] == "reset"
+
+        response = await client.put(
+            f"/api/envelopes/{carry_over.id}", headers=auth_headers, json={"rollover_policy": "keep"}
+        )
+        assert response.status_code == 422
+
+
+class TestScheduler:
+    """Tests for the scheduled jobs."""
+
+    def test_rollover_job_registered(self):
+        """Test that the rollover job follows the configured crontab."""
+        scheduler = create_scheduler(Settings(SECRET_KEY="test", ENVELOPE_ROLLOVER_CRON="0 3 1 * *"))
+        job = scheduler.get_job("envelope_rollover")
+        assert job is not None
+        assert "hour='3'" in str(job.trigger)
+        assert "day='1'" in str(job.trigger)
+
+    def test_jobs_wait_for_crontab(self):
+        """Test that jobs only run at startup when catch-up is enabled."""
+        scheduler = create_scheduler(Settings(SECRET_KEY="test"))
+        assert all(getattr(job, "next_run_time", None) is None for job in scheduler.get_jobs())
+
+        scheduler = create_scheduler(Settings(SECRET_KEY="test", SCHEDULER_CATCH_UP=True))
+        assert all(getattr(job, "next_run_time", None) is not None for job in scheduler.get_jobs())
@@ -1,11 +1,17 @@
 """Tests for envelopes routes."""
 
+import asyncio
 import pytest
+import pytest_asyncio
 from decimal import Decimal
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.config import Settings
+from app.database import Base, configure_engine
 from app.models import User, Envelope, BankAccount, Category
+from app.services.envelope_transfers import InsufficientFunds, transfer_funds
 
 
 class TestEnvelopeCRUD:
@@ -355,6 +361,254 @@ class TestEnvelopeReallocation:
         assert "different" in response.json()["detail"].lower()
 
 
+@pytest_asyncio.fixture
+async def file_session_factory(tmp_path):
+    """Sessions on a file database: one connection per session, real write locks."""
+    engine = configure_engine(
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cash.db'}"),
+        Settings(SECRET_KEY="test", SQLITE_BUSY_TIMEOUT_MS=30000)
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _create_transfer_envelopes(session_factory: async_sessionmaker, balances):
+    async with session_factory() as session:
+        user = User(email="stress@example.com", password_hash="x", is_active=True)
+        session.add(user)
+        await session.flush()
+        account = BankAccount(
+            user_id=user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        session.add(account)
+        await session.flush()
+        envelopes = [
+            Envelope(
+                user_id=user.id, name=f"Envelope {index}", bank_account_id=account.id,
+                monthly_budget=Decimal("100"), current_balance=balance
+            )
+            for index, balance in enumerate(balances)
+        ]
+        session.add_all(envelopes)
+        await session.commit()
+        return user.id, [envelope.id for envelope in envelopes]
+
+
+async def _transfer(session_factory: async_sessionmaker, user_id: int, from_id: int, to_id: int, amount):
+    async with session_factory() as session:
+        try:
+            await transfer_funds(session, user_id, from_id, to_id, Decimal(amount))
+        except InsufficientFunds:
+            await session.rollback()
+            return False
+        await session.commit()
+        return True
+
+
+async def _envelope_balances(session_factory: async_sessionmaker, ids):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(Envelope.id, Envelope.current_balance).where(Envelope.id.in_(ids))
+        )
+        balances = dict(result.all())
+    return [balances[envelope_id] for envelope_id in ids]
+
+
+class TestEnvelopeReallocationConcurrency:
+    """Stress tests: parallel reallocations on separate connections."""
+
+    @pytest.mark.asyncio
+    async def test_parallel_transfers_never_overdraw(self, file_session_factory: async_sessionmaker):
+        """Test that 100 parallel transfers out of a 50.00 envelope succeed exactly 50 times."""
+        user_id, (source, destination) = await _create_transfer_envelopes(
+            file_session_factory, [Decimal("50"), Decimal("0")]
+        )
+
+        outcomes = await asyncio.gather(*(
+            _transfer(file_session_factory, user_id, source, destination, "1.00")
+            for _ in range(100)
+        ))
+
+        assert outcomes.count(True) == 50
+        assert await _envelope_balances(file_session_factory, [source, destination]) == [
+            Decimal("0.00"), Decimal("50.00")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_parallel_crossed_transfers_lose_no_update(self, file_session_factory: async_sessionmaker):
+        """Test that 100 parallel transfers in both directions keep every update."""
+        user_id, (first, second, third) = await _create_transfer_envelopes(
+            file_session_factory, [Decimal("500"), Decimal("500"), Decimal("0")]
+        )
+        moves = [(first, second, "2.00"), (second, first, "1.00"), (first, third, "1.50"), (second, third, "0.50")]
+
+        outcomes = await asyncio.gather(*(
+            _transfer(file_session_factory, user_id, *moves[index % len(moves)])
+            for index in range(100)
+        ))
+
+        assert all(outcomes)
+        # 25 transferts de chaque sorte, sommes conservées
+        assert await _envelope_balances(file_session_factory, [first, second, third]) == [
+            Decimal("500") - 25 * Decimal("2.00") + 25 * Decimal("1.00") - 25 * Decimal("1.50"),
+            Decimal("500") + 25 * Decimal("2.00") - 25 * Decimal("1.00") - 25 * Decimal("0.50"),
+            25 * Decimal("1.50") + 25 * Decimal("0.50"),
+        ]
+
+
+async def _create_funding_envelopes(db_session: AsyncSession, user: User):
+    account = BankAccount(
+        user_id=user.id, name="Account", account_type="checking",
+        initial_balance=Decimal("3000"), current_balance=Decimal("3000"), currency="EUR"
+    )
+    db_session.add(account)
+    await db_session.commit()
+    
+    income = Envelope(
+        user_id=user.id, name="Income", bank_account_id=account.id,
+        monthly_budget=Decimal("0"), current_balance=Decimal("2000")
+    )
+    rent = Envelope(
+        user_id=user.id, name="Rent", bank_account_id=account.id,
+        monthly_budget=Decimal("800"), current_balance=Decimal("0")
+    )
+    food = Envelope(
+        user_id=user.id, name="Food", bank_account_id=account.id,
+        monthly_budget=Decimal("400"), current_balance=Decimal("10")
+    )
+    leisure = Envelope(
+        user_id=user.id, name="Leisure", bank_account_id=account.id,
+        monthly_budget=Decimal("100"), current_balance=Decimal("5"), is_active=False
+    )
+    db_session.add_all([income, rent, food, leisure])
+    await db_session.commit()
+    return income, rent, food, leisure
+
+
+class TestEnvelopeAllocateBatch:
+    """Tests for POST /envelopes/allocate-batch."""
+
+    @pytest.mark.asyncio
+    async def test_moves_in_one_update(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that several moves are netted and applied with a single UPDATE."""
+        income, rent, food, _ = await _create_funding_envelopes(db_session, test_user)
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("UPDATE ENVELOPES"):
+                statements.append(statement)
+        
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = await client.post("/api/envelopes/allocate-batch", headers=auth_headers, json={
+                "moves": [
+                    {"from_envelope_id": income.id, "to_envelope_id": rent.id, "amount": "800"},
+                    {"from_envelope_id": income.id, "to_envelope_id": food.id, "amount": "300"},
+                    {"from_envelope_id": food.id, "to_envelope_id": rent.id, "amount": "10"},
+                ]
+            })
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        assert response.status_code == 200
+        balances = {envelope["name"]: envelope["current_balance"] for envelope in response.json()}
+        assert balances == {"Food": "300.00", "Income": "900.00", "Rent": "810.00"}
+        assert len(statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_distribute_by_monthly_budget(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test distributing an amount across active envelopes by monthly budget."""
+        income, _, _, _ = await _create_funding_envelopes(db_session, test_user)
+        
+        response = await client.post("/api/envelopes/allocate-batch", headers=auth_headers, json={
+            "distribute": {"amount": "1000.00", "from_envelope_id": income.id}
+        })
+        assert response.status_code == 200
+        balances = {envelope["name"]: envelope["current_balance"] for envelope in response.json()}
+        assert balances == {"Food": "343.33", "Income": "1000.00", "Rent": "666.67"}
+
+    @pytest.mark.asyncio
+    async def test_insufficient_funds_applies_nothing(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that one uncovered debit rejects the whole batch."""
+        income, rent, food, _ = await _create_funding_envelopes(db_session, test_user)
+        food_id = food.id
+        
+        response = await client.post("/api/envelopes/allocate-batch", headers=auth_headers, json={
+            "moves": [
+                {"from_envelope_id": income.id, "to_envelope_id": rent.id, "amount": "500"},
+                {"from_envelope_id": food_id, "to_envelope_id": rent.id, "amount": "50"},
+            ]
+        })
+        assert response.status_code == 400
+        assert f"envelope {food_id}" in response.json()["detail"]
+        
+        response = await client.get("/api/envelopes", headers=auth_headers)
+        balances = {envelope["name"]: envelope["current_balance"] for envelope in response.json()}
+        assert (balances["Income"], balances["Rent"], balances["Food"]) == ("2000.00", "0.00", "10.00")
+
+    @pytest.mark.asyncio
+    async def test_foreign_envelope(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User, second_user: User
+    ):
+        """Test that another user's envelope cannot be credited."""
+        income, _, _, _ = await _create_funding_envelopes(db_session, test_user)
+        _, other_rent, _, _ = await _create_funding_envelopes(db_session, second_user)
+        
+        response = await client.post("/api/envelopes/allocate-batch", headers=auth_headers, json={
+            "moves": [{"from_envelope_id": income.id, "to_envelope_id": other_rent.id, "amount": "10"}]
+        })
+        assert response.status_code == 404
+        await db_session.refresh(income)
+        assert income.current_balance == Decimal("2000.00")
+
+    @pytest.mark.asyncio
+    async def test_netted_out_envelopes_are_not_returned(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that envelopes whose moves cancel out are left untouched."""
+        income, rent, food, _ = await _create_funding_envelopes(db_session, test_user)
+        etag = (await client.get("/api/envelopes", headers=auth_headers)).headers["ETag"]
+        
+        response = await client.post("/api/envelopes/allocate-batch", headers=auth_headers, json={
+            "moves": [
+                {"from_envelope_id": income.id, "to_envelope_id": rent.id, "amount": "100"},
+                {"from_envelope_id": rent.id, "to_envelope_id": income.id, "amount": "100"},
+            ]
+        })
+        assert response.status_code == 200
+        assert response.json() == []
+        assert (await client.get("/api/envelopes", headers=auth_headers)).headers["ETag"] == etag
+        
+        response = await client.post("/api/envelopes/allocate-batch", headers=auth_headers, json={
+            "moves": [
+                {"from_envelope_id": income.id, "to_envelope_id": rent.id, "amount": "100"},
+                {"from_envelope_id": rent.id, "to_envelope_id": food.id, "amount": "100"},
+            ]
+        })
+        assert [envelope["name"] for envelope in response.json()] == ["Food", "Income"]
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, client: AsyncClient, auth_headers: dict):
+        """Test that an empty batch is rejected."""
+        response = await client.post("/api/envelopes/allocate-batch", headers=auth_headers, json={})
+        assert response.status_code == 400
+
+
 class TestEnvelopeFilters:
     """Tests for envelope filtering."""
 
@@ -499,3 +753,57 @@ class TestEnvelopeIsolation:
         data = response.json()
         assert len(data) == 1
         assert data[0]["name"] == "My Envelope"
+
+
+class TestEnvelopeConditionalGet:
+    """Tests for ETag / If-None-Match on the envelope list."""
+
+    @pytest.mark.asyncio
+    async def test_balance_updates_change_etag(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that balance updates made by transactions invalidate the ETags."""
+        account = BankAccount(
+            user_id=test_user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        category = Category(user_id=test_user.id, name="Food")
+        db_session.add_all([account, category])
+        await db_session.commit()
+        envelope = Envelope(
+            user_id=test_user.id, name="Groceries", bank_account_id=account.id,
+            monthly_budget=Decimal("300"), current_balance=Decimal("300")
+        )
+        db_session.add(envelope)
+        await db_session.commit()
+        
+        envelopes_etag = (await client.get("/api/envelopes", headers=auth_headers)).headers["etag"]
+        accounts_etag = (await client.get("/api/bank-accounts", headers=auth_headers)).headers["etag"]
+        
+        response = await client.post("/api/transactions", headers=auth_headers, json={
+            "bank_account_id": account.id, "envelope_id": envelope.id, "category_id": category.id,
+            "amount": 50, "transaction_type": "expense", "date": "2025-01-10"
+        })
+        assert response.status_code == 201
+        
+        response = await client.get(
+            "/api/envelopes", headers={**auth_headers, "If-None-Match": envelopes_etag}
+        )
+        assert response.status_code == 200
+        assert float(response.json()[0]["current_balance"]) == 250.0
+        
+        response = await client.get(
+            "/api/bank-accounts", headers={**auth_headers, "If-None-Match": accounts_etag}
+        )
+        assert response.status_code == 200
+        assert float(response.json()[0]["current_balance"]) == 950.0
+        
+        # Supprimer le compte supprime ses enveloppes
+        envelopes_etag = (await client.get("/api/envelopes", headers=auth_headers)).headers["etag"]
+        await client.delete(f"/api/bank-accounts/{account.id}", headers=auth_headers)
+        response = await client.get(
+            "/api/envelopes", headers={**auth_headers, "If-None-Match": envelopes_etag}
+        )
+        assert response.status_code == 200
+        assert response.json() == []
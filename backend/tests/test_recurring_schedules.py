@@ -0,0 +1,269 @@
+"""Tests for recurring schedules and the recurring transactions generator."""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import Settings
+from app.models import User, BankAccount, Category, Envelope, Transaction, RecurringSchedule
+from app.scheduler import create_scheduler
+from app.services.recurring_transactions import generate_due_transactions
+
+
+async def _create_dependencies(db_session: AsyncSession, user: User):
+    account = BankAccount(
+        user_id=user.id, name="Checking", account_type="checking",
+        initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+    )
+    category = Category(user_id=user.id, name="Housing")
+    db_session.add_all([account, category])
+    await db_session.commit()
+
+    envelope = Envelope(
+        user_id=user.id, name="Rent", bank_account_id=account.id, category_id=category.id,
+        monthly_budget=Decimal("800"), current_balance=Decimal("800")
+    )
+    db_session.add(envelope)
+    await db_session.commit()
+    return account, category, envelope
+
+
+async def _create_schedule(db_session: AsyncSession, user: User, rrule: str, start: date, **values):
+    account, category, envelope = await _create_dependencies(db_session, user)
+    schedule = RecurringSchedule(
+        user_id=user.id, bank_account_id=account.id, category_id=category.id,
+        envelope_id=envelope.id, amount=Decimal("700"), transaction_type="expense",
+        description="Rent", rrule=rrule, start_date=start, next_occurrence=start, **values
+    )
+    db_session.add(schedule)
+    await db_session.commit()
+    return schedule, account, envelope
+
+
+async def _generated_dates(db_session: AsyncSession, schedule: RecurringSchedule):
+    result = await db_session.execute(
+        select(Transaction.date)
+        .where(Transaction.recurring_schedule_id == schedule.id)
+        .order_by(Transaction.date)
+    )
+    return list(result.scalars().all())
+
+
+class TestRecurringScheduleRoutes:
+    """Tests for the recurring schedule endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_create_schedule(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test creating a schedule computes its first occurrence."""
+        account, category, _ = await _create_dependencies(db_session, test_user)
+
+        response = await client.post("/api/recurring-schedules", headers=auth_headers, json={
+            "bank_account_id": account.id, "category_id": category.id,
+            "amount": "700.00", "transaction_type": "expense",
+            "rrule": "rrule:freq=monthly;bymonthday=5", "start_date": "2025-01-10"
+        })
+        assert response.status_code == 201
+        data = response.json()
+        assert data["rrule"] == "FREQ=MONTHLY;BYMONTHDAY=5"
+        assert data["next_occurrence"] == "2025-02-05"
+
+        response = await client.get("/api/recurring-schedules", headers=auth_headers)
+        assert [schedule["id"] for schedule in response.json()] == [data["id"]]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("rrule", [
+        "FREQ=HOURLY", "FREQ=DAILY;BYHOUR=8", "FREQ=WEEKLY;INTERVAL=0",
+        "FREQ=DAILY;COUNT=2;UNTIL=20250101", "FREQ=WEEKLY;BYDAY=XX", "BYDAY=MO",
+    ])
+    async def test_invalid_rule(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        test_user: User, rrule: str
+    ):
+        """Test that rules outside the supported subset are rejected."""
+        account, category, _ = await _create_dependencies(db_session, test_user)
+
+        response = await client.post("/api/recurring-schedules", headers=auth_headers, json={
+            "bank_account_id": account.id, "category_id": category.id,
+            "amount": "10.00", "transaction_type": "expense",
+            "rrule": rrule, "start_date": "2025-01-01"
+        })
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_create_schedule_foreign_account(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        test_user: User, second_user: User
+    ):
+        """Test that another user's bank account is refused."""
+        account, _, _ = await _create_dependencies(db_session, second_user)
+        _, category, _ = await _create_dependencies(db_session, test_user)
+
+        response = await client.post("/api/recurring-schedules", headers=auth_headers, json={
+            "bank_account_id": account.id, "category_id": category.id,
+            "amount": "10.00", "transaction_type": "expense",
+            "rrule": "FREQ=DAILY", "start_date": "2025-01-01"
+        })
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_update_rule_recomputes_next_occurrence(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test that changing the rule moves the next occurrence after the last generated one."""
+        schedule, _, _ = await _create_schedule(
+            db_session, test_user, "FREQ=MONTHLY;BYMONTHDAY=1", date(2025, 1, 1),
+            last_occurrence=date(2025, 3, 1)
+        )
+
+        response = await client.put(
+            f"/api/recurring-schedules/{schedule.id}", headers=auth_headers,
+            json={"rrule": "FREQ=WEEKLY;BYDAY=MO"}
+        )
+        assert response.status_code == 200
+        assert response.json()["next_occurrence"] == "2025-03-03"
+
+    @pytest.mark.asyncio
+    async def test_schedule_from_transaction(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User
+    ):
+        """Test turning an existing transaction into the first occurrence of a schedule."""
+        account, category, envelope = await _create_dependencies(db_session, test_user)
+        transaction = Transaction(
+            user_id=test_user.id, bank_account_id=account.id, category_id=category.id,
+            envelope_id=envelope.id, amount=Decimal("9.99"), transaction_type="expense",
+            date=date(2025, 1, 15), payee="Streaming"
+        )
+        db_session.add(transaction)
+        await db_session.commit()
+
+        url = f"/api/recurring-schedules/from-transaction/{transaction.id}"
+        response = await client.post(url, headers=auth_headers, json={"rrule": "FREQ=MONTHLY"})
+        assert response.status_code == 201
+        data = response.json()
+        assert (data["payee"], data["amount"], data["envelope_id"]) == ("Streaming", "9.99", envelope.id)
+        assert (data["start_date"], data["last_occurrence"]) == ("2025-01-15", "2025-01-15")
+        assert data["next_occurrence"] == "2025-02-15"
+
+        await db_session.refresh(transaction)
+        assert transaction.is_recurring is True
+        assert transaction.recurring_schedule_id == data["id"]
+
+        response = await client.post(url, headers=auth_headers, json={"rrule": "FREQ=MONTHLY"})
+        assert response.status_code == 400
+
+
+class TestRecurringGenerator:
+    """Tests for generate_due_transactions."""
+
+    @pytest.mark.asyncio
+    async def test_generates_due_occurrences(
+        self, db_session: AsyncSession, session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that every due occurrence is created and applied to the balances."""
+        schedule, account, envelope = await _create_schedule(
+            db_session, test_user, "FREQ=MONTHLY;BYMONTHDAY=1", date(2025, 1, 1)
+        )
+
+        outcome = await generate_due_transactions(session_factory, date(2025, 3, 15))
+        assert (outcome.schedules, outcome.transactions, outcome.batches) == (1, 3, 1)
+        assert await _generated_dates(db_session, schedule) == [
+            date(2025, 1, 1), date(2025, 2, 1), date(2025, 3, 1)
+        ]
+
+        for entity in (schedule, account, envelope):
+            await db_session.refresh(entity)
+        assert (schedule.last_occurrence, schedule.next_occurrence) == (date(2025, 3, 1), date(2025, 4, 1))
+        assert account.current_balance == Decimal("-1100.00")
+        assert envelope.current_balance == Decimal("-1300.00")
+
+    @pytest.mark.asyncio
+    async def test_watermark_skips_up_to_date_schedules(
+        self, db_session: AsyncSession, session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that a second run only picks up occurrences due since the previous one."""
+        schedule, _, _ = await _create_schedule(
+            db_session, test_user, "FREQ=WEEKLY;BYDAY=FR", date(2025, 1, 1)
+        )
+
+        await generate_due_transactions(session_factory, date(2025, 1, 10))
+        outcome = await generate_due_transactions(session_factory, date(2025, 1, 10))
+        assert (outcome.schedules, outcome.transactions, outcome.batches) == (0, 0, 0)
+
+        outcome = await generate_due_transactions(session_factory, date(2025, 1, 17))
+        assert (outcome.schedules, outcome.transactions) == (1, 1)
+        assert await _generated_dates(db_session, schedule) == [
+            date(2025, 1, 3), date(2025, 1, 10), date(2025, 1, 17)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_finished_rule(
+        self, db_session: AsyncSession, session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that a rule ending with COUNT stops being due."""
+        schedule, _, _ = await _create_schedule(
+            db_session, test_user, "FREQ=DAILY;COUNT=2", date(2025, 1, 1)
+        )
+
+        outcome = await generate_due_transactions(session_factory, date(2025, 1, 31))
+        assert outcome.transactions == 2
+        await db_session.refresh(schedule)
+        assert schedule.next_occurrence is None
+
+    @pytest.mark.asyncio
+    async def test_inactive_schedule_is_skipped(
+        self, db_session: AsyncSession, session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that paused schedules generate nothing."""
+        schedule, _, _ = await _create_schedule(
+            db_session, test_user, "FREQ=DAILY", date(2025, 1, 1), is_active=False
+        )
+
+        outcome = await generate_due_transactions(session_factory, date(2025, 1, 31))
+        assert outcome.transactions == 0
+        assert await _generated_dates(db_session, schedule) == []
+
+    @pytest.mark.asyncio
+    async def test_batches_across_users(
+        self, db_session: AsyncSession, session_factory: async_sessionmaker,
+        test_user: User, second_user: User
+    ):
+        """Test that schedules of several users are processed in batches with one INSERT each."""
+        for user in (test_user, second_user):
+            await _create_schedule(db_session, user, "FREQ=MONTHLY;BYMONTHDAY=1", date(2025, 1, 1))
+
+        outcome = await generate_due_transactions(session_factory, date(2025, 2, 1), batch_size=1)
+        assert (outcome.schedules, outcome.transactions, outcome.batches) == (2, 4, 2)
+
+        result = await db_session.execute(
+            select(Transaction.user_id, func.count()).group_by(Transaction.user_id)
+        )
+        assert dict(result.all()) == {test_user.id: 2, second_user.id: 2}
+
+    @pytest.mark.asyncio
+    async def test_generated_transactions_refresh_account_list(
+        self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession,
+        session_factory: async_sessionmaker, test_user: User
+    ):
+        """Test that the cached account list and its ETag change after a run."""
+        await _create_schedule(db_session, test_user, "FREQ=DAILY", date(2025, 1, 1))
+
+        response = await client.get("/api/bank-accounts", headers=auth_headers)
+        etag = response.headers["etag"]
+
+        await generate_due_transactions(session_factory, date(2025, 1, 2))
+
+        response = await client.get("/api/bank-accounts", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()[0]["current_balance"] == "-400.00"
+
+    def test_job_registered(self):
+        """Test that the generator job follows the configured crontab."""
+        scheduler = create_scheduler(Settings(SECRET_KEY="test", RECURRING_TRANSACTIONS_CRON="30 2 * * *"))
+        job = scheduler.get_job("recurring_transactions")
+        assert job is not None
+        assert "hour='2'" in str(job.trigger)
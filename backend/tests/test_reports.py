@@ -0,0 +1,293 @@
+"""
+Tests pour les routes API des rapports
+"""
+import pytest
+from decimal import Decimal
+from datetime import date
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.bank_account import BankAccount
+from app.models.category import Category
+from app.models.envelope import Envelope
+from app.models.transaction import Transaction
+from app.models.transaction_monthly_rollup import TransactionMonthlyRollup
+from app.services.monthly_rollups import rebuild_monthly_rollups
+
+
+async def _create_dependencies(db_session: AsyncSession, user: User):
+    account = BankAccount(
+        user_id=user.id, name="Account", account_type="checking",
+        initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+    )
+    food = Category(user_id=user.id, name="Food")
+    salary = Category(user_id=user.id, name="Salary")
+    db_session.add_all([account, food, salary])
+    await db_session.commit()
+    
+    envelope = Envelope(
+        user_id=user.id, name="Groceries", bank_account_id=account.id,
+        monthly_budget=Decimal("300"), current_balance=Decimal("300")
+    )
+    db_session.add(envelope)
+    await db_session.commit()
+    return account, envelope, food, salary
+
+
+async def _rollups(db_session: AsyncSession):
+    result = await db_session.execute(
+        select(
+            TransactionMonthlyRollup.year_month,
+            TransactionMonthlyRollup.bank_account_id,
+            TransactionMonthlyRollup.envelope_id,
+            TransactionMonthlyRollup.category_id,
+            TransactionMonthlyRollup.transaction_type,
+            TransactionMonthlyRollup.total_amount,
+            TransactionMonthlyRollup.transaction_count
+        ).order_by(*TransactionMonthlyRollup.__table__.primary_key.columns)
+    )
+    return [tuple(row) for row in result]
+
+
+class TestMonthlyRollups:
+    """Tests pour la maintenance des agrégats mensuels."""
+
+    @pytest.mark.asyncio
+    async def test_rollups_follow_transaction_writes(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that create, update and delete keep the rollups in sync."""
+        account, envelope, food, salary = await _create_dependencies(db_session, test_user)
+        
+        payload = {
+            "bank_account_id": account.id, "envelope_id": envelope.id, "category_id": food.id,
+            "amount": 40, "transaction_type": "expense", "date": "2025-01-10"
+        }
+        first = (await client.post("/api/transactions", headers=auth_headers, json=payload)).json()
+        await client.post("/api/transactions", headers=auth_headers, json={**payload, "amount": 10})
+        
+        assert await _rollups(db_session) == [
+            ("2025-01", account.id, envelope.id, food.id, "expense", Decimal("50.00"), 2)
+        ]
+        
+        # Sortir une transaction de l'enveloppe en changeant son montant
+        response = await client.put(
+            f"/api/transactions/{first['id']}", headers=auth_headers,
+            json={"amount": 45, "envelope_id": None}
+        )
+        assert response.status_code == 200
+        assert await _rollups(db_session) == [
+            ("2025-01", account.id, 0, food.id, "expense", Decimal("45.00"), 1),
+            ("2025-01", account.id, envelope.id, food.id, "expense", Decimal("10.00"), 1),
+        ]
+        
+        # La ligne d'un agrégat vidé disparaît
+        response = await client.delete(f"/api/transactions/{first['id']}", headers=auth_headers)
+        assert response.status_code == 204
+        assert await _rollups(db_session) == [
+            ("2025-01", account.id, envelope.id, food.id, "expense", Decimal("10.00"), 1)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_bulk_import_updates_rollups(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that bulk inserts are aggregated too."""
+        account, envelope, food, salary = await _create_dependencies(db_session, test_user)
+        
+        rows = [
+            {
+                "bank_account_id": account.id, "category_id": food.id,
+                "amount": 5, "transaction_type": "expense", "date": f"2025-0{1 + i % 3}-15"
+            }
+            for i in range(30)
+        ]
+        response = await client.post("/api/transactions/bulk", headers=auth_headers, json=rows)
+        assert response.json()["created"] == 30
+        
+        assert [(row[0], row[5], row[6]) for row in await _rollups(db_session)] == [
+            ("2025-01", Decimal("50.00"), 10),
+            ("2025-02", Decimal("50.00"), 10),
+            ("2025-03", Decimal("50.00"), 10),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental_rollups(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that a rebuild from the transactions table gives the same rollups."""
+        account, envelope, food, salary = await _create_dependencies(db_session, test_user)
+        
+        for month, amount, category, envelope_id, kind in [
+            (1, 12.5, food, envelope.id, "expense"),
+            (1, 2000, salary, None, "income"),
+            (2, 30, food, None, "expense"),
+            (2, 7.25, food, envelope.id, "expense"),
+        ]:
+            await client.post("/api/transactions", headers=auth_headers, json={
+                "bank_account_id": account.id, "envelope_id": envelope_id, "category_id": category.id,
+                "amount": amount, "transaction_type": kind, "date": f"2025-0{month}-01"
+            })
+        incremental = await _rollups(db_session)
+        
+        # Transaction insérée sans passer par l'API : seule la reconstruction la voit
+        db_session.add(Transaction(
+            user_id=test_user.id, bank_account_id=account.id, category_id=food.id,
+            amount=Decimal("1"), transaction_type="expense", date=date(2025, 3, 1)
+        ))
+        await db_session.commit()
+        
+        rows = await rebuild_monthly_rollups(db_session, test_user.id)
+        await db_session.commit()
+        
+        rebuilt = await _rollups(db_session)
+        assert rows == len(incremental) + 1
+        assert rebuilt[:-1] == incremental
+        assert rebuilt[-1] == ("2025-03", account.id, 0, food.id, "expense", Decimal("1.00"), 1)
+
+
+class TestMonthlyReport:
+    """Tests pour GET /api/reports/monthly."""
+
+    @pytest.mark.asyncio
+    async def test_monthly_report(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test the monthly trend, filters and grouping."""
+        account, envelope, food, salary = await _create_dependencies(db_session, test_user)
+        
+        for day, amount, category, envelope_id, kind in [
+            ("2025-01-05", 2000, salary, None, "income"),
+            ("2025-01-10", 40, food, envelope.id, "expense"),
+            ("2025-01-20", 15, food, None, "expense"),
+            ("2025-02-05", 2000, salary, None, "income"),
+            ("2025-03-10", 60, food, envelope.id, "expense"),
+        ]:
+            await client.post("/api/transactions", headers=auth_headers, json={
+                "bank_account_id": account.id, "envelope_id": envelope_id, "category_id": category.id,
+                "amount": amount, "transaction_type": kind, "date": day
+            })
+        
+        response = await client.get("/api/reports/monthly", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert [row["year_month"] for row in data] == ["2025-01", "2025-02", "2025-03"]
+        assert data[0]["total_income"] == 2000.0
+        assert data[0]["total_expense"] == 55.0
+        assert data[0]["balance"] == 1945.0
+        assert data[0]["transaction_count"] == 3
+        assert data[0]["envelope_id"] is None
+        
+        response = await client.get(
+            "/api/reports/monthly", headers=auth_headers,
+            params={"from_month": "2025-01", "to_month": "2025-01", "group_by": "envelope_id"}
+        )
+        data = response.json()
+        assert [(row["envelope_id"], row["total_expense"]) for row in data] == [
+            (None, 15.0), (envelope.id, 40.0)
+        ]
+        
+        response = await client.get(
+            "/api/reports/monthly", headers=auth_headers,
+            params={"category_id": food.id, "group_by": "category_id"}
+        )
+        data = response.json()
+        assert [(row["year_month"], row["total_expense"]) for row in data] == [
+            ("2025-01", 55.0), ("2025-03", 60.0)
+        ]
+        assert all(row["category_id"] == food.id for row in data)
+
+    @pytest.mark.asyncio
+    async def test_monthly_report_after_deletions(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that deleting an envelope or an account removes its transactions from the report."""
+        account, envelope, food, salary = await _create_dependencies(db_session, test_user)
+        other = BankAccount(
+            user_id=test_user.id, name="Other", account_type="savings",
+            initial_balance=Decimal("0"), current_balance=Decimal("0"), currency="EUR"
+        )
+        db_session.add(other)
+        await db_session.commit()
+        
+        for account_id, envelope_id, amount in [
+            (account.id, envelope.id, 40), (account.id, None, 15), (other.id, envelope.id, 5), (other.id, None, 20)
+        ]:
+            await client.post("/api/transactions", headers=auth_headers, json={
+                "bank_account_id": account_id, "envelope_id": envelope_id, "category_id": food.id,
+                "amount": amount, "transaction_type": "expense", "date": "2025-01-10"
+            })
+        
+        async def _report():
+            response = await client.get("/api/reports/monthly", headers=auth_headers)
+            return [(row["total_expense"], row["transaction_count"]) for row in response.json()]
+        
+        assert await _report() == [(80.0, 4)]
+        
+        response = await client.delete(f"/api/envelopes/{envelope.id}", headers=auth_headers)
+        assert response.status_code == 204
+        assert await _report() == [(35.0, 2)]
+        
+        response = await client.delete(f"/api/bank-accounts/{account.id}", headers=auth_headers)
+        assert response.status_code == 204
+        assert await _report() == [(20.0, 1)]
+        
+        rebuilt = await _rollups(db_session)
+        await rebuild_monthly_rollups(db_session, test_user.id)
+        await db_session.commit()
+        assert await _rollups(db_session) == rebuilt
+
+    @pytest.mark.asyncio
+    async def test_monthly_report_category_subtree(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that include_descendants rolls subcategories into the parent."""
+        account, _, food, _ = await _create_dependencies(db_session, test_user)
+        restaurant = Category(user_id=test_user.id, name="Restaurant", parent_id=food.id)
+        db_session.add(restaurant)
+        await db_session.commit()
+        
+        for category, amount in [(food, 40), (restaurant, 25)]:
+            await client.post("/api/transactions", headers=auth_headers, json={
+                "bank_account_id": account.id, "category_id": category.id,
+                "amount": amount, "transaction_type": "expense", "date": "2025-01-10"
+            })
+        
+        response = await client.get(
+            "/api/reports/monthly", headers=auth_headers, params={"category_id": food.id}
+        )
+        assert response.json()[0]["total_expense"] == 40.0
+        
+        response = await client.get(
+            "/api/reports/monthly", headers=auth_headers,
+            params={"category_id": food.id, "include_descendants": "true"}
+        )
+        assert response.json()[0]["total_expense"] == 65.0
+
+    @pytest.mark.asyncio
+    async def test_monthly_report_validation_and_isolation(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User, second_user: User
+    ):
+        """Test month validation and that other users' rollups are not visible."""
+        response = await client.get(
+            "/api/reports/monthly", headers=auth_headers, params={"from_month": "2025-13"}
+        )
+        assert response.status_code == 422
+        
+        db_session.add(TransactionMonthlyRollup(
+            user_id=second_user.id, year_month="2025-01", bank_account_id=1, envelope_id=0,
+            category_id=1, transaction_type="expense", total_amount=Decimal("10"), transaction_count=1
+        ))
+        await db_session.commit()
+        
+        response = await client.get("/api/reports/monthly", headers=auth_headers)
+        assert response.json() == []
@@ -0,0 +1,226 @@
+"""Tests for the per-user response cache."""
+
+import os
+import time
+import pytest
+from decimal import Decimal
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User, BankAccount, Category, WishList
+from app.utils.response_cache import CacheKey, MemoryResponseCache, RedisResponseCache, response_cache
+
+
+class TestMemoryResponseCache:
+    """Tests for the in-memory LRU backend."""
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_and_stats(self):
+        """Test that the least recently used entry is evicted."""
+        cache = MemoryResponseCache(ttl_seconds=60, max_size=2)
+        first, second, third = (CacheKey(1, "categories.list", str(i)) for i in range(3))
+        
+        await cache.set(first, b"1")
+        await cache.set(second, b"2")
+        assert await cache.get(first) == b"1"
+        await cache.set(third, b"3")
+        
+        assert await cache.get(second) is None
+        assert await cache.get(first) == b"1"
+        assert await cache.get(third) == b"3"
+        
+        stats = cache.stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 3
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.75
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, monkeypatch):
+        """Test that entries expire after the TTL."""
+        cache = MemoryResponseCache(ttl_seconds=10, max_size=10)
+        key = CacheKey(1, "envelopes.list", "")
+        await cache.set(key, b"[]")
+        
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+        assert await cache.get(key) is None
+        assert cache.stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidation_is_scoped(self):
+        """Test that invalidation only drops the given user's scopes."""
+        cache = MemoryResponseCache(ttl_seconds=60, max_size=10)
+        keys = [
+            CacheKey(1, "categories.list", ""),
+            CacheKey(1, "categories.list", "search=foo"),
+            CacheKey(1, "envelopes.list", ""),
+            CacheKey(2, "categories.list", ""),
+        ]
+        for key in keys:
+            await cache.set(key, b"[]")
+        
+        await cache.invalidate(1, "categories.list")
+        
+        assert [await cache.get(key) for key in keys] == [None, None, b"[]", b"[]"]
+        assert cache.stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """Test that a zero size disables the cache."""
+        cache = MemoryResponseCache(ttl_seconds=60, max_size=0)
+        key = CacheKey(1, "categories.list", "")
+        await cache.set(key, b"[]")
+        assert await cache.get(key) is None
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_REDIS_URL"), reason="TEST_REDIS_URL non défini")
+class TestRedisResponseCache:
+    """Tests for the Redis backend (requires a Redis server)."""
+
+    @pytest.mark.asyncio
+    async def test_set_get_invalidate(self):
+        """Test the Redis backend round trip and scoped invalidation."""
+        cache = RedisResponseCache(os.environ["TEST_REDIS_URL"], ttl_seconds=60, prefix="cash:test")
+        await cache.clear()
+        try:
+            listed = CacheKey(1, "categories.list", "")
+            tree = CacheKey(1, "categories.tree", "")
+            await cache.set(listed, b"[1]")
+            await cache.set(tree, b"[2]")
+            assert await cache.get(listed) == b"[1]"
+            
+            await cache.invalidate(1, "categories.list")
+            assert await cache.get(listed) is None
+            assert await cache.get(tree) == b"[2]"
+            assert cache.stats()["hits"] == 2
+        finally:
+            await cache.clear()
+            await cache.client.aclose()
+
+
+class TestCachedRoutes:
+    """Tests for cached GET routes and write-through invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_category_tree_hit_and_invalidation(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that the tree is served from cache until a category is written."""
+        db_session.add(Category(user_id=test_user.id, name="Food"))
+        await db_session.commit()
+        
+        first = await client.get("/api/categories/tree", headers=auth_headers)
+        second = await client.get("/api/categories/tree", headers=auth_headers)
+        assert first.headers["x-cache"] == "MISS"
+        assert second.headers["x-cache"] == "HIT"
+        assert second.json() == first.json()
+        assert second.headers["etag"] == first.headers["etag"]
+        
+        response = await client.post("/api/categories", headers=auth_headers, json={"name": "Rent"})
+        assert response.status_code == 201
+        
+        response = await client.get("/api/categories/tree", headers=auth_headers)
+        assert response.headers["x-cache"] == "MISS"
+        assert sorted(category["name"] for category in response.json()) == ["Food", "Rent"]
+
+    @pytest.mark.asyncio
+    async def test_query_params_and_users_are_separate(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User, second_user: User
+    ):
+        """Test that the key includes the query parameters and the user."""
+        db_session.add_all([
+            Category(user_id=test_user.id, name="Food"),
+            Category(user_id=second_user.id, name="Other"),
+        ])
+        await db_session.commit()
+        
+        await client.get("/api/categories", headers=auth_headers)
+        response = await client.get("/api/categories?search=zzz", headers=auth_headers)
+        assert response.headers["x-cache"] == "MISS"
+        assert response.json() == []
+        
+        response = await client.post(
+            "/api/auth/login", json={"email": "other@example.com", "password": "otherpassword123"}
+        )
+        other_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        response = await client.get("/api/categories", headers=other_headers)
+        assert response.headers["x-cache"] == "MISS"
+        assert [category["name"] for category in response.json()] == ["Other"]
+
+    @pytest.mark.asyncio
+    async def test_transaction_invalidates_balances(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that a transaction invalidates the cached account list only."""
+        account = BankAccount(
+            user_id=test_user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("100"), current_balance=Decimal("100"), currency="EUR"
+        )
+        category = Category(user_id=test_user.id, name="Food")
+        db_session.add_all([account, category])
+        await db_session.commit()
+        
+        await client.get("/api/bank-accounts", headers=auth_headers)
+        await client.get("/api/categories", headers=auth_headers)
+        
+        await client.post("/api/transactions", headers=auth_headers, json={
+            "bank_account_id": account.id, "category_id": category.id,
+            "amount": 30, "transaction_type": "expense", "date": "2025-01-10"
+        })
+        
+        response = await client.get("/api/bank-accounts", headers=auth_headers)
+        assert response.headers["x-cache"] == "MISS"
+        assert float(response.json()[0]["current_balance"]) == 70.0
+        
+        response = await client.get("/api/categories", headers=auth_headers)
+        assert response.headers["x-cache"] == "HIT"
+
+    @pytest.mark.asyncio
+    async def test_wish_list_detail_invalidated_by_item(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that adding an item invalidates only that wish list's detail."""
+        wish_list = WishList(user_id=test_user.id, name="Gifts", list_type="to_give", status="active")
+        other = WishList(user_id=test_user.id, name="Books", list_type="to_receive", status="active")
+        db_session.add_all([wish_list, other])
+        await db_session.commit()
+        
+        wish_list_id, other_id = wish_list.id, other.id
+        
+        await client.get(f"/api/wish-lists/{wish_list_id}", headers=auth_headers)
+        await client.get(f"/api/wish-lists/{other_id}", headers=auth_headers)
+        
+        await client.post(
+            f"/api/wish-lists/{wish_list_id}/items", headers=auth_headers,
+            json={"wish_list_id": wish_list_id, "name": "Scarf", "price": 25.0}
+        )
+        
+        # Les requêtes du test partagent la session : recharger la collection items
+        db_session.expire_all()
+        
+        response = await client.get(f"/api/wish-lists/{wish_list_id}", headers=auth_headers)
+        assert response.headers["x-cache"] == "MISS"
+        assert [item["name"] for item in response.json()["items"]] == ["Scarf"]
+        
+        response = await client.get(f"/api/wish-lists/{other_id}", headers=auth_headers)
+        assert response.headers["x-cache"] == "HIT"
+
+    @pytest.mark.asyncio
+    async def test_health_cache_stats(self, client: AsyncClient, auth_headers: dict):
+        """Test that response cache counters are exposed."""
+        await client.get("/api/envelopes", headers=auth_headers)
+        await client.get("/api/envelopes", headers=auth_headers)
+        
+        response = await client.get("/health/cache")
+        stats = response.json()["response_cache"]
+        assert stats["backend"] == response_cache.backend
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert "evictions" in stats
@@ -1,10 +1,12 @@
 """
 Tests pour les routes API des transactions
 """
+import json
 import pytest
 from decimal import Decimal
 from datetime import date, timedelta
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
@@ -324,6 +326,319 @@ class TestTransactionCRUD:
         assert get_response.status_code == 404
 
 
+class TestTransactionBalances:
+    """Tests pour la mise à jour incrémentale des soldes."""
+
+    @pytest.mark.asyncio
+    async def test_balances_follow_transaction_writes(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that create, update and delete apply signed deltas to balances."""
+        checking = BankAccount(
+            user_id=test_user.id, name="Checking", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        savings = BankAccount(
+            user_id=test_user.id, name="Savings", account_type="savings",
+            initial_balance=Decimal("500"), current_balance=Decimal("500"), currency="EUR"
+        )
+        category = Category(user_id=test_user.id, name="Food")
+        db_session.add_all([checking, savings, category])
+        await db_session.commit()
+        
+        envelope = Envelope(
+            user_id=test_user.id, name="Groceries", bank_account_id=checking.id,
+            monthly_budget=Decimal("300"), current_balance=Decimal("200")
+        )
+        db_session.add(envelope)
+        await db_session.commit()
+
+        response = await client.post(
+            "/api/transactions",
+            headers=auth_headers,
+            json={
+                "bank_account_id": checking.id,
+                "envelope_id": envelope.id,
+                "category_id": category.id,
+                "amount": 45.50,
+                "transaction_type": "expense",
+                "date": str(date.today())
+            }
+        )
+        assert response.status_code == 201
+        transaction_id = response.json()["id"]
+        
+        await db_session.refresh(checking)
+        await db_session.refresh(envelope)
+        assert checking.current_balance == Decimal("954.50")
+        assert envelope.current_balance == Decimal("154.50")
+        
+        # Modifier le montant et changer de compte, sans enveloppe
+        response = await client.put(
+            f"/api/transactions/{transaction_id}",
+            headers=auth_headers,
+            json={"amount": 20, "bank_account_id": savings.id, "envelope_id": None}
+        )
+        assert response.status_code == 200
+        
+        await db_session.refresh(checking)
+        await db_session.refresh(savings)
+        await db_session.refresh(envelope)
+        assert checking.current_balance == Decimal("1000.00")
+        assert savings.current_balance == Decimal("480.00")
+        assert envelope.current_balance == Decimal("200.00")
+        
+        response = await client.delete(f"/api/transactions/{transaction_id}", headers=auth_headers)
+        assert response.status_code == 204
+        
+        await db_session.refresh(savings)
+        assert savings.current_balance == Decimal("500.00")
+
+    @pytest.mark.asyncio
+    async def test_income_credits_balance(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that an income transaction credits the account."""
+        account = BankAccount(
+            user_id=test_user.id, name="Checking", account_type="checking",
+            initial_balance=Decimal("0"), current_balance=Decimal("0"), currency="EUR"
+        )
+        category = Category(user_id=test_user.id, name="Salary")
+        db_session.add_all([account, category])
+        await db_session.commit()
+
+        response = await client.post(
+            "/api/transactions",
+            headers=auth_headers,
+            json={
+                "bank_account_id": account.id,
+                "category_id": category.id,
+                "amount": 2100,
+                "transaction_type": "income",
+                "date": str(date.today())
+            }
+        )
+        assert response.status_code == 201
+        
+        await db_session.refresh(account)
+        assert account.current_balance == Decimal("2100.00")
+
+
+class TestTransactionBulk:
+    """Tests pour l'import en masse."""
+
+    async def _create_dependencies(self, db_session: AsyncSession, user: User):
+        account = BankAccount(
+            user_id=user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        category = Category(user_id=user.id, name="Food")
+        db_session.add_all([account, category])
+        await db_session.commit()
+        return account, category
+
+    @pytest.mark.asyncio
+    async def test_bulk_json_array(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User, second_user: User
+    ):
+        """Test bulk import from a JSON array with per-row errors."""
+        account, category = await self._create_dependencies(db_session, test_user)
+        other_account, _ = await self._create_dependencies(db_session, second_user)
+        
+        row = {
+            "bank_account_id": account.id,
+            "category_id": category.id,
+            "amount": 10,
+            "transaction_type": "expense",
+            "date": "2025-03-01"
+        }
+        response = await client.post(
+            "/api/transactions/bulk",
+            headers=auth_headers,
+            json=[
+                row,
+                {**row, "amount": 25, "description": "Second"},
+                {**row, "transaction_type": "gift"},
+                {**row, "bank_account_id": other_account.id},
+                {**row, "amount": 100, "transaction_type": "income"},
+            ]
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 3
+        assert data["failed"] == 2
+        assert [error["index"] for error in data["errors"]] == [2, 3]
+        assert "transaction_type" in data["errors"][0]["detail"]
+        assert data["errors"][1]["detail"] == "Bank account not found"
+        assert data["rows_per_second"] > 0
+        
+        response = await client.get("/api/transactions", headers=auth_headers)
+        assert len(response.json()) == 3
+        
+        await db_session.refresh(account)
+        assert account.current_balance == Decimal("1065.00")
+
+    @pytest.mark.asyncio
+    async def test_bulk_ndjson_stream(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test bulk import from an NDJSON body."""
+        account, category = await self._create_dependencies(db_session, test_user)
+        
+        line = (
+            f'{{"bank_account_id": {account.id}, "category_id": {category.id}, '
+            f'"amount": 1.5, "transaction_type": "expense", "date": "2025-03-01"}}'
+        )
+        body = "\n".join([line] * 4 + ["{not json", "", line]) + "\n"
+        response = await client.post(
+            "/api/transactions/bulk",
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+            content=body
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 5
+        assert data["errors"] == [{"index": 4, "detail": "Invalid JSON"}]
+
+    @pytest.mark.asyncio
+    async def test_bulk_rejects_non_array(self, client: AsyncClient, auth_headers: dict):
+        """Test that a JSON object body is rejected."""
+        response = await client.post(
+            "/api/transactions/bulk", headers=auth_headers, json={"amount": 1}
+        )
+        assert response.status_code == 400
+
+
+class TestStatementImport:
+    """Tests pour l'import de relevés CSV/OFX."""
+
+    async def _create_dependencies(self, db_session: AsyncSession, user: User):
+        account = BankAccount(
+            user_id=user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        category = Category(user_id=user.id, name="Imported")
+        db_session.add_all([account, category])
+        await db_session.commit()
+        return account, category
+
+    @pytest.mark.asyncio
+    async def test_import_csv(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test importing a French bank CSV export."""
+        account, category = await self._create_dependencies(db_session, test_user)
+        
+        csv_body = (
+            "Date opération;Libellé;Débit;Crédit\n"
+            "03/02/2025;CARTE BOULANGERIE;12,40;\n"
+            "05/02/2025;VIREMENT SALAIRE;;2 150,00\n"
+            "not a date;BROKEN;1,00;\n"
+        )
+        response = await client.post(
+            "/api/transactions/import",
+            headers={**auth_headers, "Content-Type": "text/csv"},
+            params={"bank_account_id": account.id, "category_id": category.id, "delimiter": ";"},
+            content=csv_body.encode("utf-8")
+        )
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+        
+        response = await client.get(f"/api/transactions/import/{job_id}", headers=auth_headers)
+        assert response.status_code == 200
+        job = response.json()
+        assert job["status"] == "completed"
+        assert job["rows_processed"] == 3
+        assert job["created"] == 2
+        assert job["failed"] == 1
+        assert job["errors"][0]["index"] == 2
+        assert job["progress_percent"] == 100.0
+        
+        response = await client.get("/api/transactions", headers=auth_headers)
+        transactions = {t["description"]: t for t in response.json()}
+        assert transactions["CARTE BOULANGERIE"]["transaction_type"] == "expense"
+        assert transactions["CARTE BOULANGERIE"]["amount"] == "12.40"
+        assert transactions["VIREMENT SALAIRE"]["transaction_type"] == "income"
+        assert transactions["VIREMENT SALAIRE"]["date"] == "2025-02-05"
+        
+        await db_session.refresh(account)
+        assert account.current_balance == Decimal("3137.60")
+
+    @pytest.mark.asyncio
+    async def test_import_ofx(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test importing an SGML OFX statement."""
+        account, category = await self._create_dependencies(db_session, test_user)
+        
+        ofx_body = (
+            "OFXHEADER:100\nDATA:OFXSGML\n\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS>"
+            "<BANKTRANLIST>\n"
+            "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250301120000[+1:CET]<TRNAMT>-42.50"
+            "<FITID>1<NAME>GARAGE DU CENTRE<MEMO>Vidange</STMTTRN>\n"
+            "<STMTTRN>\n<TRNTYPE>CREDIT\n<DTPOSTED>20250302\n<TRNAMT>10.00\n"
+            "<FITID>2\n<NAME>REMBOURSEMENT\n</STMTTRN>\n"
+            "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>"
+        )
+        response = await client.post(
+            "/api/transactions/import",
+            headers=auth_headers,
+            params={"format": "ofx", "bank_account_id": account.id, "category_id": category.id},
+            content=ofx_body.encode("latin-1")
+        )
+        assert response.status_code == 202
+        job = (await client.get(
+            f"/api/transactions/import/{response.json()['id']}", headers=auth_headers
+        )).json()
+        assert job["status"] == "completed"
+        assert job["created"] == 2
+        
+        response = await client.get("/api/transactions", headers=auth_headers)
+        transactions = {t["payee"]: t for t in response.json()}
+        assert transactions["GARAGE DU CENTRE"]["amount"] == "42.50"
+        assert transactions["GARAGE DU CENTRE"]["transaction_type"] == "expense"
+        assert transactions["GARAGE DU CENTRE"]["description"] == "Vidange"
+        assert transactions["REMBOURSEMENT"]["date"] == "2025-03-02"
+
+    @pytest.mark.asyncio
+    async def test_import_rejects_foreign_defaults(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User, second_user: User
+    ):
+        """Test that default references are checked before the job is created."""
+        account, category = await self._create_dependencies(db_session, test_user)
+        other_category = Category(user_id=second_user.id, name="Other")
+        db_session.add(other_category)
+        await db_session.commit()
+        
+        for params, detail in [
+            ({"bank_account_id": 999999, "category_id": category.id}, "Bank account not found"),
+            ({"bank_account_id": account.id, "category_id": other_category.id}, "Category not found"),
+            ({"bank_account_id": account.id, "envelope_id": 999999}, "Envelope not found"),
+        ]:
+            response = await client.post(
+                "/api/transactions/import", headers=auth_headers, params=params,
+                content=b"date,amount\n2025-01-01,-5\n"
+            )
+            assert response.status_code == 404
+            assert response.json()["detail"] == detail
+        
+        response = await client.get("/api/transactions", headers=auth_headers)
+        assert response.json() == []
+
+    @pytest.mark.asyncio
+    async def test_import_job_not_found(self, client: AsyncClient, auth_headers: dict):
+        """Test fetching an unknown import job."""
+        response = await client.get("/api/transactions/import/unknown", headers=auth_headers)
+        assert response.status_code == 404
+
+
 class TestTransactionFilters:
     """Tests pour les filtres de transactions."""
 
@@ -498,6 +813,305 @@ class TestTransactionFilters:
         assert len(data) == 1
         assert "supermarket" in data[0]["description"].lower()
 
+    @pytest.mark.asyncio
+    @pytest.mark.sqlite_only
+    async def test_search_prefix_and_relevance(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test full-text search with prefix matching and relevance ranking."""
+        account = BankAccount(
+            user_id=test_user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        category = Category(user_id=test_user.id, name="Food")
+        db_session.add_all([account, category])
+        await db_session.commit()
+        
+        weak = Transaction(
+            user_id=test_user.id, bank_account_id=account.id, category_id=category.id,
+            amount=Decimal("12"), transaction_type="expense", date=date.today(),
+            description="Café du coin, boulangerie et journal du matin"
+        )
+        strong = Transaction(
+            user_id=test_user.id, bank_account_id=account.id, category_id=category.id,
+            amount=Decimal("8"), transaction_type="expense", date=date.today() - timedelta(days=3),
+            description="Boulangerie", payee="Boulangerie Paul"
+        )
+        other = Transaction(
+            user_id=test_user.id, bank_account_id=account.id, category_id=category.id,
+            amount=Decimal("30"), transaction_type="expense", date=date.today(),
+            payee="Restaurant"
+        )
+        db_session.add_all([weak, strong, other])
+        await db_session.commit()
+
+        # Préfixe et insensibilité aux accents
+        response = await client.get(
+            "/api/transactions", headers=auth_headers, params={"search": "cafe"}
+        )
+        assert [t["id"] for t in response.json()] == [weak.id]
+        
+        response = await client.get(
+            "/api/transactions", headers=auth_headers,
+            params={"search": "boulang", "sort": "relevance"}
+        )
+        assert response.status_code == 200
+        assert [t["id"] for t in response.json()] == [strong.id, weak.id]
+
+    @pytest.mark.asyncio
+    async def test_search_index_follows_updates(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that the search index is kept in sync on update and delete."""
+        account = BankAccount(
+            user_id=test_user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        category = Category(user_id=test_user.id, name="Food")
+        db_session.add_all([account, category])
+        await db_session.commit()
+        
+        transaction = Transaction(
+            user_id=test_user.id, bank_account_id=account.id, category_id=category.id,
+            amount=Decimal("12"), transaction_type="expense", date=date.today(),
+            description="Pharmacy"
+        )
+        db_session.add(transaction)
+        await db_session.commit()
+        
+        response = await client.put(
+            f"/api/transactions/{transaction.id}",
+            headers=auth_headers,
+            json={"description": "Bookstore"}
+        )
+        assert response.status_code == 200
+        
+        response = await client.get(
+            "/api/transactions", headers=auth_headers, params={"search": "pharmacy"}
+        )
+        assert response.json() == []
+        response = await client.get(
+            "/api/transactions", headers=auth_headers, params={"search": "book"}
+        )
+        assert len(response.json()) == 1
+        
+        await client.delete(f"/api/transactions/{transaction.id}", headers=auth_headers)
+        response = await client.get(
+            "/api/transactions", headers=auth_headers, params={"search": "book"}
+        )
+        assert response.json() == []
+
+    @pytest.mark.asyncio
+    async def test_filter_by_category_subtree(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test include_descendants on the list and the summary (one query per request)."""
+        account = BankAccount(
+            user_id=test_user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        food = Category(user_id=test_user.id, name="Food")
+        other = Category(user_id=test_user.id, name="Other")
+        db_session.add_all([account, food, other])
+        await db_session.commit()
+        restaurant = Category(user_id=test_user.id, name="Restaurant", parent_id=food.id)
+        db_session.add(restaurant)
+        await db_session.commit()
+        fast_food = Category(user_id=test_user.id, name="Fast food", parent_id=restaurant.id)
+        db_session.add(fast_food)
+        await db_session.commit()
+        
+        for category, amount in [(food, 10), (restaurant, 20), (fast_food, 40), (other, 80)]:
+            db_session.add(Transaction(
+                user_id=test_user.id, bank_account_id=account.id, category_id=category.id,
+                amount=Decimal(amount), transaction_type="expense", date=date.today()
+            ))
+        await db_session.commit()
+        
+        response = await client.get(
+            "/api/transactions", headers=auth_headers, params={"category_id": food.id}
+        )
+        assert [t["amount"] for t in response.json()] == ["10.00"]
+        
+        response = await client.get(
+            "/api/transactions", headers=auth_headers,
+            params={"category_id": food.id, "include_descendants": "true"}
+        )
+        assert sorted(float(t["amount"]) for t in response.json()) == [10, 20, 40]
+        
+        response = await client.get(
+            "/api/transactions", headers=auth_headers,
+            params={"category_id": restaurant.id, "include_descendants": "true"}
+        )
+        assert sorted(float(t["amount"]) for t in response.json()) == [20, 40]
+        
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "FROM transactions" in statement:
+                statements.append(statement)
+        
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = await client.get(
+                "/api/transactions/stats/summary", headers=auth_headers,
+                params={"category_id": food.id, "include_descendants": "true"}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        assert response.status_code == 200
+        assert response.json()["total_expense"] == 70.0
+        assert response.json()["transaction_count"] == 3
+        assert len(statements) == 1
+        assert "category_closure" in statements[0]
+
+
+class TestTransactionPagination:
+    """Tests pour la pagination des transactions."""
+
+    async def _create_transactions(self, db_session: AsyncSession, user: User, count: int):
+        account = BankAccount(
+            user_id=user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        category = Category(user_id=user.id, name="Food")
+        db_session.add_all([account, category])
+        await db_session.commit()
+        
+        transactions = [
+            Transaction(
+                user_id=user.id, bank_account_id=account.id, category_id=category.id,
+                amount=Decimal(i + 1), transaction_type="expense",
+                date=date(2025, 1, 1) + timedelta(days=i // 2)
+            )
+            for i in range(count)
+        ]
+        db_session.add_all(transactions)
+        await db_session.commit()
+        return sorted(transactions, key=lambda t: (t.date, t.id), reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_cursor_pagination(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test walking all pages with the keyset cursor."""
+        expected = await self._create_transactions(db_session, test_user, 7)
+        
+        seen = []
+        params = {"limit": 3}
+        while True:
+            response = await client.get("/api/transactions", headers=auth_headers, params=params)
+            assert response.status_code == 200
+            seen.extend(t["id"] for t in response.json())
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if next_cursor is None:
+                break
+            params = {"limit": 3, "cursor": next_cursor}
+        
+        assert seen == [t.id for t in expected]
+
+    @pytest.mark.asyncio
+    async def test_skip_pagination_still_supported(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that offset pagination keeps working."""
+        expected = await self._create_transactions(db_session, test_user, 5)
+        
+        response = await client.get(
+            "/api/transactions", headers=auth_headers, params={"skip": 2, "limit": 2}
+        )
+        assert response.status_code == 200
+        assert [t["id"] for t in response.json()] == [t.id for t in expected[2:4]]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, client: AsyncClient, auth_headers: dict):
+        """Test that a malformed cursor is rejected."""
+        response = await client.get(
+            "/api/transactions", headers=auth_headers, params={"cursor": "not-a-cursor"}
+        )
+        assert response.status_code == 400
+
+
+class TestTransactionExport:
+    """Tests pour l'export des transactions."""
+
+    async def _create_transactions(self, db_session: AsyncSession, user: User):
+        account = BankAccount(
+            user_id=user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        category = Category(user_id=user.id, name="Food")
+        db_session.add_all([account, category])
+        await db_session.commit()
+        
+        db_session.add_all([
+            Transaction(
+                user_id=user.id, bank_account_id=account.id, category_id=category.id,
+                amount=Decimal("12.50"), transaction_type="expense",
+                date=date(2025, 1, 1), payee="Boulangerie, centre"
+            ),
+            Transaction(
+                user_id=user.id, bank_account_id=account.id, category_id=category.id,
+                amount=Decimal("2000.00"), transaction_type="income",
+                date=date(2025, 1, 5), description="Salaire"
+            ),
+        ])
+        await db_session.commit()
+
+    @pytest.mark.asyncio
+    async def test_export_csv(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test streaming the export as CSV."""
+        await self._create_transactions(db_session, test_user)
+        
+        response = await client.get("/api/transactions/export", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "transactions.csv" in response.headers["content-disposition"]
+        
+        lines = response.text.splitlines()
+        assert lines[0].startswith("id,date,amount,transaction_type")
+        assert len(lines) == 3
+        assert ",2025-01-05,2000.00,income," in lines[1]
+        assert '"Boulangerie, centre"' in lines[2]
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson_with_filters(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test the NDJSON export with the list filters."""
+        await self._create_transactions(db_session, test_user)
+        
+        response = await client.get(
+            "/api/transactions/export", headers=auth_headers,
+            params={"format": "ndjson", "transaction_type": "expense"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 1
+        assert rows[0]["amount"] == "12.50"
+        assert rows[0]["date"] == "2025-01-01"
+        assert rows[0]["payee"] == "Boulangerie, centre"
+        assert rows[0]["is_recurring"] is False
+
+    @pytest.mark.asyncio
+    async def test_export_requires_auth(self, client: AsyncClient):
+        """Test that the export is not public."""
+        response = await client.get("/api/transactions/export")
+        assert response.status_code == 401
+
 
 class TestTransactionStats:
     """Tests pour les statistiques de transactions."""
@@ -545,6 +1159,61 @@ class TestTransactionStats:
         assert data["total_expense"] == 80.0
         assert data["balance"] == 120.0
         assert data["transaction_count"] == 3
+        assert "groups" not in data
+
+    @pytest.mark.asyncio
+    async def test_transaction_summary_grouped(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test getting transaction summary grouped by category and month."""
+        account = BankAccount(
+            user_id=test_user.id, name="Account", account_type="checking",
+            initial_balance=Decimal("1000"), current_balance=Decimal("1000"), currency="EUR"
+        )
+        db_session.add(account)
+        await db_session.commit()
+        await db_session.refresh(account)
+        
+        food = Category(user_id=test_user.id, name="Food")
+        salary = Category(user_id=test_user.id, name="Salary")
+        db_session.add_all([food, salary])
+        await db_session.commit()
+        await db_session.refresh(food)
+        await db_session.refresh(salary)
+        
+        db_session.add_all([
+            Transaction(
+                user_id=test_user.id, bank_account_id=account.id, category_id=food.id,
+                amount=Decimal("50"), transaction_type="expense", date=date(2025, 1, 10)
+            ),
+            Transaction(
+                user_id=test_user.id, bank_account_id=account.id, category_id=food.id,
+                amount=Decimal("20"), transaction_type="expense", date=date(2025, 2, 3)
+            ),
+            Transaction(
+                user_id=test_user.id, bank_account_id=account.id, category_id=salary.id,
+                amount=Decimal("1500"), transaction_type="income", date=date(2025, 1, 31)
+            ),
+        ])
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/transactions/stats/summary",
+            headers=auth_headers,
+            params=[("group_by", "month"), ("group_by", "category_id")]
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_income"] == 1500.0
+        assert data["total_expense"] == 70.0
+        assert data["transaction_count"] == 3
+        
+        groups = {(g["month"], g["category_id"]): g for g in data["groups"]}
+        assert len(groups) == 3
+        assert groups[("2025-01", food.id)]["total_expense"] == 50.0
+        assert groups[("2025-01", salary.id)]["balance"] == 1500.0
+        assert groups[("2025-02", food.id)]["transaction_count"] == 1
 
 
 class TestTransactionIsolation:
@@ -476,3 +476,33 @@ class TestWishListCalculations:
         assert float(data["total_cost"]) == 150.0
         assert float(data["purchased_cost"]) == 20.0
         assert float(data["remaining_cost"]) == 130.0
+
+
+class TestWishListConditionalGet:
+    """Tests ETag / If-None-Match sur la liste des wish lists."""
+
+    @pytest.mark.asyncio
+    async def test_item_changes_etag(
+        self, client: AsyncClient, auth_headers: dict,
+        db_session: AsyncSession, test_user: User
+    ):
+        """Test that adding an item invalidates the wish list ETag."""
+        wish_list = WishList(
+            user_id=test_user.id, name="List", list_type="to_receive", status="active"
+        )
+        db_session.add(wish_list)
+        await db_session.commit()
+        
+        etag = (await client.get("/api/wish-lists", headers=auth_headers)).headers["etag"]
+        response = await client.get("/api/wish-lists", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        
+        response = await client.post(
+            f"/api/wish-lists/{wish_list.id}/items", headers=auth_headers,
+            json={"wish_list_id": wish_list.id, "name": "Item", "price": 10.0}
+        )
+        assert response.status_code == 201
+        
+        response = await client.get("/api/wish-lists", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag